@@ -0,0 +1,31 @@
+import io
+import os
+import glob
+import time
+import contextlib
+from matrix_lang_interpreter.pratt_parser import PrattParser
+from matrix_lang_interpreter.stream_scanner import StreamScanner
+from matrix_lang_interpreter.light_type_checker import LightTypeChecker
+
+
+EXAMPLES = sorted(glob.glob(os.path.join('examples', '*.m')))
+
+def load(text: str):
+    ast = PrattParser().parse(StreamScanner(dense_literals=True).scan(text))
+    typeChecker = LightTypeChecker()
+    if typeChecker.visit(ast) is None:
+        raise ValueError(str(typeChecker.diagnostics))
+    return ast
+
+def load_file(filename: str):
+    with open(filename, 'r') as file:
+        return load(file.read())
+
+def measure(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    return best
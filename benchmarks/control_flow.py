@@ -0,0 +1,60 @@
+import argparse
+from functools import partial
+from benchmarks.common import load, measure
+from matrix_lang_interpreter.engines import ENGINES, run
+
+
+# name: (source, number of break/continue statements executed for a given N)
+PROGRAMS = {
+    'break': ('''
+        for i = 0:N {
+            for j = 0:N {
+                for k = 0:N {
+                    if (k == 1) break;
+                }
+            }
+        }
+    ''', lambda n: n * n),
+    'continue': ('''
+        k = 0;
+        for i = 0:N {
+            for j = 0:N {
+                if (j > 0) continue;
+                k += 1;
+            }
+        }
+    ''', lambda n: n * (n - 1)),
+    'while-break': ('''
+        for i = 0:N {
+            for j = 0:N {
+                while (1 < 2) { break; }
+            }
+        }
+    ''', lambda n: n * n),
+}
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        prog="python3 -m benchmarks.control_flow",
+        description="Measure break/continue throughput in loop heavy programs."
+    )
+    argparser.add_argument("-n", type=int, default=300, help="loop bound")
+    argparser.add_argument("-r", "--repeat", type=int, default=3)
+    argparser.add_argument(
+        "-e", "--engine", dest="engines", action="append", choices=ENGINES,
+        help="engine to measure (default: all)"
+    )
+    args = argparser.parse_args()
+    engines = args.engines or list(ENGINES)
+
+    print(f'{"program":16}' + ''.join(f'{engine:>22}' for engine in engines))
+    for name, (text, iterations) in PROGRAMS.items():
+        ast = load(text.replace('N', str(args.n)))
+        times = [measure(partial(run, ast, engine), args.repeat) for engine in engines]
+        cells = ''.join(f'{iterations(args.n) / t / 1000:16.1f} k/s' for t in times)
+        print(f'{name:16}{cells}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import argparse
+from functools import partial
+from benchmarks.common import EXAMPLES, load_file, measure
+from matrix_lang_interpreter.engines import ENGINES, run
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        prog="python3 -m benchmarks.engines",
+        description="Compare execution engines on the same programs."
+    )
+    argparser.add_argument("filename", nargs="*", default=EXAMPLES)
+    argparser.add_argument("-r", "--repeat", type=int, default=3)
+    argparser.add_argument(
+        "-e", "--engine", dest="engines", action="append", choices=ENGINES,
+        help="engine to measure (default: all); the first one is the baseline"
+    )
+    args = argparser.parse_args()
+    engines = args.engines or list(ENGINES)
+
+    print(f'{"program":28}' + ''.join(f'{engine:>22}' for engine in engines))
+    for filename in args.filename:
+        ast = load_file(filename)
+        times = [measure(partial(run, ast, engine), args.repeat) for engine in engines]
+        cells = ''.join(
+            f'{t * 1000:12.1f} ms' + (f' {times[0] / t:5.1f}x' if i else '       ')
+            for i, t in enumerate(times)
+        )
+        print(f'{filename:28}{cells}')
+
+
+if __name__ == '__main__':
+    main()
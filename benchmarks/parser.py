@@ -0,0 +1,54 @@
+import time
+import argparse
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.pratt_parser import PrattParser
+from matrix_lang_interpreter.stream_scanner import StreamScanner
+
+
+PARSERS = {
+    'lalr': lambda tokens: Parser().parse(iter(tokens)),
+    'pratt': lambda tokens: PrattParser().parse(tokens),
+}
+
+def program(n: int) -> str:
+    lines = []
+    for i in range(n):
+        lines.append(f'x{i % 50} = (a + {i}) * b[{i % 7}, 2] - -c.T @ d / 2.5;')
+        if i % 10 == 0:
+            lines.append(f'if (x{i % 50} <= {i}) {{ print x{i % 50}, "s"; }} else y += 1;')
+    return '\n'.join(lines)
+
+def measure(parser, tokens, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(tokens)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        prog="python3 -m benchmarks.parser",
+        description="Measure the parsers on long generated programs."
+    )
+    argparser.add_argument(
+        "-n", type=int, dest="sizes", action="append",
+        help="number of statements (default: 6000 and 60000)"
+    )
+    argparser.add_argument("-r", "--repeat", type=int, default=3)
+    args = argparser.parse_args()
+    sizes = args.sizes or [6000, 60000]
+
+    print(f'{"statements":12}{"MB":>8}' + ''.join(f'{name:>12}' for name in PARSERS))
+    for n in sizes:
+        text = program(n)
+        # both parsers read the same tokens, scanning is not measured
+        tokens = StreamScanner().scan(text)
+        cells = ''.join(f'{measure(parser, tokens, args.repeat):11.3f}s' for parser in PARSERS.values())
+        print(f'{n:<12}{len(text) / 1e6:8.1f}{cells}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import time
+import argparse
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.light_type_checker import LightTypeChecker
+
+
+CHECKERS = {
+    'writer-maybe': lambda ast: TypeChecker(debug=False).visit(ast),
+    'light': lambda ast: LightTypeChecker().visit(ast),
+}
+
+def program(n: int) -> str:
+    lines = ['x = 1; A = ones(3, 3);']
+    for i in range(n // 2):
+        lines.append(f'y{i % 50} = x * {i} + 2; if (x < {i}) {{ B = A @ A + A; }}')
+    return '\n'.join(lines)
+
+def measure(checker, text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        # the checkers annotate the nodes, so every run gets a fresh tree
+        ast = Parser().parse(Scanner().tokenize(text))
+        start = time.perf_counter()
+        checker(ast)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        prog="python3 -m benchmarks.type_checker",
+        description="Measure the type checkers on long generated programs."
+    )
+    argparser.add_argument(
+        "-n", type=int, dest="sizes", action="append",
+        help="number of statements (default: 10000 and 100000)"
+    )
+    argparser.add_argument("-r", "--repeat", type=int, default=3)
+    args = argparser.parse_args()
+    sizes = args.sizes or [10000, 100000]
+
+    print(f'{"statements":12}' + ''.join(f'{name:>16}' for name in CHECKERS))
+    for n in sizes:
+        text = program(n)
+        cells = ''.join(f'{measure(checker, text, args.repeat):15.3f}s' for checker in CHECKERS.values())
+        print(f'{n:<12}{cells}')
+
+
+if __name__ == '__main__':
+    main()
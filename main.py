@@ -3,9 +3,14 @@ import glob
 import argparse
 from matrix_lang_interpreter.scanner import Scanner
 from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.pratt_parser import PrattParser
+from matrix_lang_interpreter.stream_scanner import StreamScanner
 from matrix_lang_interpreter.print_tree import TreePrinter
-from matrix_lang_interpreter.type_checker import TypeChecker
-from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.light_type_checker import LightTypeChecker
+from matrix_lang_interpreter.optimizer import LEVELS, Optimizer
+from matrix_lang_interpreter.engines import ENGINES, run
+from matrix_lang_interpreter.exceptions import SourceRuntimeError
+from matrix_lang_interpreter.bytecode_compiler import BytecodeCompiler
 
 
 if __name__ == '__main__':
@@ -21,6 +26,30 @@ if __name__ == '__main__':
         "-s", "--show", dest="show", action="store_true", 
         help="show AST tree"
     )
+    argparser.add_argument(
+        "-p", "--parser", dest="parser", choices=["pratt", "lalr"],
+        default="pratt", help="parser (default: pratt)"
+    )
+    argparser.add_argument(
+        "-e", "--engine", dest="engine", choices=ENGINES,
+        default="interpreter", help="execution engine"
+    )
+    argparser.add_argument(
+        "-c", "--compile", dest="compile", action="store_true",
+        help="write bytecode to <filename>.mbc instead of running"
+    )
+    argparser.add_argument(
+        "-O", dest="level", type=int, choices=LEVELS, default=0,
+        help="optimization level (default: 0)"
+    )
+    argparser.add_argument(
+        "--exact", dest="exact", action="store_true",
+        help="keep float reductions vectorized by -O2 in sequential order (bit-exact results)"
+    )
+    argparser.add_argument(
+        "--pass-stats", dest="pass_stats", action="store_true",
+        help="print time spent and nodes removed by every optimization pass"
+    )
     args = argparser.parse_args()
 
     for filename in args.filename:
@@ -32,17 +61,30 @@ if __name__ == '__main__':
 
         print(filename)
 
-        text = file.read()
-        tokens = Scanner().tokenize(text)
-        ast = Parser().parse(tokens)
+        if args.parser == "pratt":
+            ast = PrattParser().parse(StreamScanner(dense_literals=True).scan_file(file))
+        else:
+            ast = Parser().parse(Scanner().tokenize(file.read()))
 
-        if args.show:
+        if args.show and ast is not None:
             ast.printTree()
 
-        typeChecker = TypeChecker(debug=False)
-        if (res := typeChecker.visit(ast)).is_nothing():
-            print(res.log)
+        typeChecker = LightTypeChecker()
+        if typeChecker.visit(ast) is None:
+            print(typeChecker.diagnostics)
             continue
 
-        interpreter = Interpreter()
-        interpreter.visit(ast)
+        optimizer = Optimizer(args.level, args.exact)
+        ast = optimizer.optimize(ast)
+        if args.pass_stats and optimizer.stats:
+            print(optimizer.format_stats())
+
+        if args.compile:
+            with open(os.path.splitext(filename)[0] + ".mbc", "wb") as output:
+                output.write(BytecodeCompiler().compile(ast).dumps())
+            continue
+
+        try:
+            run(ast, args.engine)
+        except SourceRuntimeError as e:
+            print(e)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Callable, Optional
 
 @dataclass
 class Node:
@@ -43,6 +43,12 @@ class ForLoop(Stmt):
     end: 'Expr'
     stmt: Stmt
 
+@dataclass
+class LoopNest(Stmt):
+    program: tuple
+    args: List['Expr']
+    loop: ForLoop
+
 @dataclass
 class Break(Stmt):
     lineno: int = 0
@@ -73,6 +79,17 @@ class BinExpr(Expr):
 class MatMulBinExpr(BinExpr):
     pass
 
+@dataclass
+class MatMulChain(Expr):
+    expr_set: List[Expr]
+
+@dataclass
+class RangeReduce(Expr):
+    op: str
+    program: tuple
+    exact: bool
+    args: List[Expr]
+
 @dataclass
 class UnExpr(Expr):
     op: str
@@ -97,6 +114,13 @@ class Vector(Expr):
         self.expr_set.append(element)
         return self
 
+# a purely numeric vector literal read at once by the StreamScanner; arrays
+# do not compare to a single bool, so nodes are compared by identity
+@dataclass(eq=False)
+class Matrix(Expr):
+    value: 'numpy.ndarray'
+    lineno: int = 0
+
 @dataclass
 class SpecialMatrix(Expr):
     size: Expr
@@ -126,6 +150,14 @@ class Ref(LValue):
     term: 'Term'
     idxs: Vector
 
+# an index of a Ref selecting beg:end, or the whole dimension when both
+# bounds are None
+@dataclass
+class Slice(Expr):
+    beg: Optional[Expr] = None
+    end: Optional[Expr] = None
+    lineno: int = 0
+
 @dataclass
 class Id(LValue):
     id: str
@@ -148,3 +180,25 @@ class FloatNum(Num):
 class String(Term):
     s: str
     lineno: int = 0
+
+# Operators specialized by lowering.py
+
+@dataclass
+class BoundBinExpr(BinExpr):
+    fn: Callable
+
+@dataclass
+class IntDivExpr(BinExpr):
+    pass
+
+@dataclass
+class TrueDivExpr(BinExpr):
+    pass
+
+@dataclass
+class BoundRelationExpr(RelationExpr):
+    fn: Callable
+
+@dataclass
+class NegExpr(UnExpr):
+    pass
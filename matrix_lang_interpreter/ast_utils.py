@@ -0,0 +1,45 @@
+import sys
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from matrix_lang_interpreter import AST
+
+
+# enough for the recursive walkers on programs nested a few thousand deep
+RECURSION_LIMIT = 10000
+
+
+def iter_nodes(node: AST.Node, prune: Optional[Callable[[AST.Node], bool]] = None) -> Iterator[AST.Node]:
+    """Yields the node and all of its descendants in depth-first pre-order.
+
+    The descendants of a node for which ``prune`` is true are skipped.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, AST.Node):
+            yield node
+            if prune is None or not prune(node):
+                stack.extend(reversed(list(vars(node).values())))
+
+def first_lineno(node: AST.Node) -> int:
+    for child in iter_nodes(node):
+        if getattr(child, 'lineno', 0):
+            return child.lineno
+    return 0
+
+@contextmanager
+def deep_recursion(limit: int = RECURSION_LIMIT):
+    """Raises the recursion limit to at least ``limit`` while it is entered.
+
+    The tree-walking engines, the optimizer passes, TypeChecker and
+    print_tree recurse once or more per nesting level; they run their
+    whole walk under it, also when used as a decorator.
+    """
+    previous = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(previous, limit))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(previous)
@@ -0,0 +1,101 @@
+import marshal
+from typing import List, Tuple
+import numpy as np
+
+
+VERSION = 5
+
+OPNAMES = [
+    'MOVE', 'ADD', 'SUB', 'MUL', 'DIV', 'MATMUL',
+    'EQ', 'NE', 'LT', 'LE', 'GT', 'GE',
+    'NEG', 'TRANSPOSE', 'VECTOR', 'ZEROS', 'ONES', 'EYE',
+    'REF', 'SETREF', 'JUMP', 'JUMP_IF_FALSE', 'PRINT', 'RETURN', 'HALT',
+    # superinstructions
+    'JUMP_UNLESS_EQ', 'JUMP_UNLESS_NE', 'JUMP_UNLESS_LT',
+    'JUMP_UNLESS_LE', 'JUMP_UNLESS_GT', 'JUMP_UNLESS_GE',
+    'INC', 'DEC', 'FOR_STEP',
+    'MATMUL_CHAIN', 'RANGE_REDUCE', 'ASSIGN_NEST',
+    'FILL_VECTOR', 'SHARE', 'SLICE',
+]
+
+(
+    MOVE, ADD, SUB, MUL, DIV, MATMUL,
+    EQ, NE, LT, LE, GT, GE,
+    NEG, TRANSPOSE, VECTOR, ZEROS, ONES, EYE,
+    REF, SETREF, JUMP, JUMP_IF_FALSE, PRINT, RETURN, HALT,
+    JUMP_UNLESS_EQ, JUMP_UNLESS_NE, JUMP_UNLESS_LT,
+    JUMP_UNLESS_LE, JUMP_UNLESS_GT, JUMP_UNLESS_GE,
+    INC, DEC, FOR_STEP,
+    MATMUL_CHAIN, RANGE_REDUCE, ASSIGN_NEST,
+    FILL_VECTOR, SHARE, SLICE,
+) = range(len(OPNAMES))
+
+BINARY_OPCODES = {
+    '+': ADD, '-': SUB, '*': MUL, '/': DIV, '@': MATMUL,
+    '==': EQ, '!=': NE, '<': LT, '<=': LE, '>': GT, '>=': GE,
+}
+
+JUMP_UNLESS_OPCODES = {
+    '==': JUMP_UNLESS_EQ, '!=': JUMP_UNLESS_NE, '<': JUMP_UNLESS_LT,
+    '<=': JUMP_UNLESS_LE, '>': JUMP_UNLESS_GT, '>=': JUMP_UNLESS_GE,
+}
+
+
+class Code:
+    """Register-based bytecode of a whole program.
+
+    Registers are laid out as constants, variables and temporaries;
+    constants are loaded into their registers before the program starts,
+    so every instruction operand is a register index.  Instructions are
+    tuples ``(opcode, operand, ...)``.  Marshal does not take NumPy arrays,
+    the arrays of constant literals are dumped apart from the other
+    constants as their dtype, shape and bytes.  They are loaded read-only
+    and shared, like arrays marked by SHARE when a second variable gets
+    them; SETREF copies such an array before writing into it.
+    """
+
+    def __init__(
+        self,
+        instructions: List[Tuple[int, ...]],
+        constants: List[object],
+        nregs: int,
+        linenos: List[int]
+    ):
+        self.instructions = instructions
+        self.constants = constants
+        self.nregs = nregs
+        self.linenos = linenos
+
+    def dumps(self) -> bytes:
+        arrays = tuple(
+            (index, value.dtype.str, value.shape, value.tobytes())
+            for index, value in enumerate(self.constants) if isinstance(value, np.ndarray)
+        )
+        return marshal.dumps((
+            VERSION,
+            tuple(self.instructions),
+            tuple(None if isinstance(value, np.ndarray) else value for value in self.constants),
+            arrays,
+            self.nregs,
+            tuple(self.linenos)
+        ))
+
+    @classmethod
+    def loads(cls, data: bytes) -> 'Code':
+        version, *fields = marshal.loads(data)
+        if version != VERSION:
+            raise ValueError(f'Unsupported bytecode version: {version}')
+        instructions, constants, arrays, nregs, linenos = fields
+        constants = list(constants)
+        for index, dtype, shape, buffer in arrays:
+            constants[index] = np.frombuffer(buffer, dtype).reshape(shape)
+        return cls(list(instructions), constants, nregs, list(linenos))
+
+    def disassemble(self) -> str:
+        lines = []
+        for pc, (op, *operands) in enumerate(self.instructions):
+            lines.append(
+                f'{self.linenos[pc]:4} {pc:5} {OPNAMES[op]:16} ' +
+                ', '.join(map(str, operands))
+            )
+        return '\n'.join(lines)
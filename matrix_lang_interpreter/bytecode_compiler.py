@@ -0,0 +1,395 @@
+import numpy as np
+from typing import List, Dict, Optional, Tuple
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes, first_lineno, deep_recursion
+from matrix_lang_interpreter.lowering import constant_vector, may_alias, vector_shape
+from matrix_lang_interpreter.bytecode import *
+
+
+class Loop:
+    def __init__(self, continue_target: Optional[int] = None):
+        self.continue_target = continue_target
+        self.breaks: List[int] = []
+        self.continues: List[int] = []
+
+
+class BytecodeCompiler:
+    """Compiles a checked AST into register-based bytecode.
+
+    Scopes are flattened the same way as in the transpiler: every
+    declaration gets its own register, and a for loop variable shadowing
+    an outer one keeps the outer registers as aliases which are written
+    together with it.
+    """
+
+    def __init__(self):
+        self.instructions: List[Tuple[int, ...]] = []
+        self.linenos: List[int] = []
+        self.constants: List[object] = []
+        self.constant_registers: Dict[Tuple[type, object], int] = {}
+        self.scopes: List[Dict[str, List[int]]] = []
+        self.loops: List[Loop] = []
+        self.lineno = 0
+        self.next_variable = 0
+        self.temp_base = 0
+        self.next_temp = 0
+        self.nregs = 0
+
+    @deep_recursion()
+    def compile(self, node: AST.AST) -> Code:
+        variables = 0
+        self.constant(1)
+        # indices are evaluated one by one, any other constant vector at
+        # once and never its elements
+        indices = {id(child.idxs) for child in iter_nodes(node) if isinstance(child, AST.Ref)}
+
+        def folded(child: AST.Node) -> bool:
+            return (
+                isinstance(child, AST.Vector) and id(child) not in indices
+                and constant_vector(child) is not None
+            )
+
+        for child in iter_nodes(node, prune=folded):
+            if isinstance(child, (AST.IntNum, AST.FloatNum)):
+                self.constant(child.n)
+            elif isinstance(child, AST.String):
+                self.constant(child.s)
+            elif isinstance(child, AST.Slice) and child.beg is None:
+                self.constant(None)
+            elif isinstance(child, AST.Matrix):
+                self.constant(child.value)
+            elif isinstance(child, AST.Vector) and id(child) not in indices:
+                value = constant_vector(child)
+                shape = vector_shape(child)
+                if value is not None:
+                    self.constant(value)
+                elif shape is not None:
+                    self.constant(shape)
+            elif isinstance(child, AST.RangeReduce):
+                self.constant((child.op, child.program, child.exact))
+            elif isinstance(child, AST.LoopNest):
+                self.constant(child.program)
+            elif isinstance(child, AST.AssignStmt):
+                variables += 1
+            elif isinstance(child, AST.ForLoop):
+                variables += 3
+
+        self.next_variable = len(self.constants)
+        self.temp_base = self.nregs = self.next_variable + variables
+
+        self.scopes.append({})
+        for stmt in node.stmt_set:
+            self.stmt(stmt)
+        self.scopes.pop()
+        self.emit(HALT)
+
+        return Code(self.instructions, self.constants, self.nregs, self.linenos)
+
+    def emit(self, *instruction) -> int:
+        self.instructions.append(instruction)
+        self.linenos.append(self.lineno)
+        return len(self.instructions) - 1
+
+    def patch(self, pc: int, target: int):
+        *instruction, _ = self.instructions[pc]
+        self.instructions[pc] = (*instruction, target)
+
+    def here(self) -> int:
+        return len(self.instructions)
+
+    def constant(self, value) -> int:
+        # 1 == 1.0 and 0.0 == -0.0, so floats and tuples of numbers are told
+        # apart by their repr; arrays are not hashable, every constant literal
+        # gets its own register
+        if isinstance(value, np.ndarray):
+            key = (type(value), id(value))
+        else:
+            key = (type(value), repr(value) if isinstance(value, (tuple, float)) else value)
+        if key not in self.constant_registers:
+            self.constant_registers[key] = len(self.constants)
+            self.constants.append(value)
+        return self.constant_registers[key]
+
+    def variable(self) -> int:
+        self.next_variable += 1
+        return self.next_variable - 1
+
+    def temps(self, n: int = 1) -> int:
+        first = self.next_temp
+        self.next_temp += n
+        self.nregs = max(self.nregs, self.next_temp)
+        return first
+
+    def lookup(self, name: str) -> Optional[List[int]]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def declare(self, name: str) -> List[int]:
+        registers = self.lookup(name)
+        if registers is None:
+            registers = self.scopes[-1][name] = [self.variable()]
+        return registers
+
+    def stmt(self, node: AST.Stmt):
+        self.next_temp = self.temp_base
+        self.lineno = first_lineno(node)
+        getattr(self, 'stmt_' + node.__class__.__name__)(node)
+
+    def body(self, node: AST.Stmt):
+        self.scopes.append({})
+        self.stmt(node)
+        self.scopes.pop()
+
+    def jump_unless(self, cond: AST.Expr) -> int:
+        if isinstance(cond, AST.RelationExpr):
+            left = self.expr(cond.left)
+            right = self.expr(cond.right)
+            return self.emit(JUMP_UNLESS_OPCODES[cond.op], left, right, None)
+        return self.emit(JUMP_IF_FALSE, self.expr(cond), None)
+
+    def stmt_Block(self, node: AST.Block):
+        self.scopes.append({})
+        for stmt in node.stmt_set:
+            self.stmt(stmt)
+        self.scopes.pop()
+
+    def stmt_AssignStmt(self, node: AST.AssignStmt):
+        if isinstance(node.lvalue, AST.Ref):
+            value = self.expr(node.expr)
+            vec = self.lookup(node.lvalue.term.id)[0]
+            first = self.exprs(node.lvalue.idxs.expr_set)
+            self.emit(SETREF, vec, first, len(node.lvalue.idxs.expr_set), value)
+            # SETREF copies a shared array into the variable only
+            for alias in self.lookup(node.lvalue.term.id)[1:]:
+                self.emit(MOVE, alias, vec)
+            return
+
+        target, *aliases = self.declare(node.lvalue.id)
+        expr = node.expr
+        if (
+            isinstance(expr, AST.BinExpr) and expr.op in ('+', '-')
+            and isinstance(expr.left, AST.Id) and expr.left.id == node.lvalue.id
+            and isinstance(expr.right, (AST.IntNum, AST.FloatNum))
+        ):
+            self.emit(INC if expr.op == '+' else DEC, target, self.expr(expr.right))
+        else:
+            self.expr(expr, target)
+            if may_alias(expr):
+                self.emit(SHARE, target)
+        for alias in aliases:
+            self.emit(MOVE, alias, target)
+
+    def stmt_IfStmt(self, node: AST.IfStmt):
+        skip = self.jump_unless(node.cond)
+        self.body(node.stmt)
+        self.patch(skip, self.here())
+
+    def stmt_IfElseStmt(self, node: AST.IfElseStmt):
+        skip = self.jump_unless(node.cond)
+        self.body(node.stmt)
+        end = self.emit(JUMP, None)
+        self.patch(skip, self.here())
+        self.body(node.elseStmt)
+        self.patch(end, self.here())
+
+    def stmt_WhileLoop(self, node: AST.WhileLoop):
+        loop = Loop(self.here())
+        exit = self.jump_unless(node.cond)
+
+        self.loops.append(loop)
+        self.body(node.stmt)
+        self.loops.pop()
+
+        self.emit(JUMP, loop.continue_target)
+        for pc in [exit, *loop.breaks]:
+            self.patch(pc, self.here())
+
+    def stmt_ForLoop(self, node: AST.ForLoop):
+        name = node.id.id
+        outer = self.lookup(name)
+        end = self.variable()
+        var = self.variable()
+        # an inner loop over the same name stores its counter in the variable
+        reassigned = any(
+            isinstance(child, AST.AssignStmt) and isinstance(child.lvalue, AST.Id)
+            and child.lvalue.id == name
+            or isinstance(child, AST.ForLoop) and child.id.id == name
+            for child in iter_nodes(node.stmt)
+        )
+        top = self.variable() if reassigned or outer is not None else var
+
+        self.expr(node.beg, top)
+        self.expr(node.end, end)
+        exit = self.emit(JUMP_UNLESS_LT, top, end, None)
+        start = self.here()
+        if top != var:
+            self.emit(MOVE, var, top)
+
+        loop = Loop()
+        self.loops.append(loop)
+        self.scopes.append({name: [var, *(outer or [])]})
+        self.body(node.stmt)
+        self.scopes.pop()
+        self.loops.pop()
+
+        self.lineno = node.id.lineno
+        loop.continue_target = self.here()
+        if outer is None:
+            self.emit(FOR_STEP, top, end, start)
+        else:
+            self.emit(INC, top, self.constant(1))
+            for alias in outer:
+                self.emit(MOVE, alias, top)
+            self.emit(JUMP_UNLESS_GE, top, end, start)
+
+        for pc in loop.continues:
+            self.patch(pc, loop.continue_target)
+        for pc in [exit, *loop.breaks]:
+            self.patch(pc, self.here())
+
+    def stmt_LoopNest(self, node: AST.LoopNest):
+        first = self.exprs(node.args)
+        done = self.emit(ASSIGN_NEST, self.constant(node.program), first, len(node.args), None)
+        self.stmt(node.loop)
+        self.patch(done, self.here())
+
+    def stmt_Break(self, node: AST.Break):
+        self.loops[-1].breaks.append(self.emit(JUMP, None))
+
+    def stmt_Continue(self, node: AST.Continue):
+        loop = self.loops[-1]
+        if loop.continue_target is not None:
+            self.emit(JUMP, loop.continue_target)
+        else:
+            loop.continues.append(self.emit(JUMP, None))
+
+    def stmt_Print(self, node: AST.Print):
+        for expr in node.expr_set:
+            self.emit(PRINT, self.expr(expr))
+
+    def stmt_Return(self, node: AST.Return):
+        first = self.exprs(node.expr_set)
+        self.emit(RETURN, first, len(node.expr_set))
+
+    def exprs(self, exprs: List[AST.Expr]) -> int:
+        first = self.temps(len(exprs))
+        for i, expr in enumerate(exprs):
+            self.expr(expr, first + i)
+        return first
+
+    def expr(self, node: AST.Expr, target: Optional[int] = None) -> int:
+        """Compiles the expression and returns the register holding its value."""
+        return getattr(self, 'expr_' + node.__class__.__name__)(node, target)
+
+    def value(self, register: int, target: Optional[int]) -> int:
+        if target is None or target == register:
+            return register
+        self.emit(MOVE, target, register)
+        return target
+
+    def result(self, target: Optional[int]) -> int:
+        return self.temps() if target is None else target
+
+    def expr_BinExpr(self, node: AST.BinExpr, target: Optional[int]) -> int:
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+        target = self.result(target)
+        self.emit(BINARY_OPCODES[node.op], target, left, right)
+        return target
+
+    expr_MatMulBinExpr = expr_BinExpr
+    expr_BoundBinExpr = expr_BinExpr
+    expr_IntDivExpr = expr_BinExpr
+    expr_TrueDivExpr = expr_BinExpr
+    expr_RelationExpr = expr_BinExpr
+    expr_BoundRelationExpr = expr_BinExpr
+
+    def expr_MatMulChain(self, node: AST.MatMulChain, target: Optional[int]) -> int:
+        first = self.exprs(node.expr_set)
+        target = self.result(target)
+        self.emit(MATMUL_CHAIN, target, first, len(node.expr_set))
+        return target
+
+    def expr_RangeReduce(self, node: AST.RangeReduce, target: Optional[int]) -> int:
+        spec = self.constant((node.op, node.program, node.exact))
+        first = self.exprs(node.args)
+        target = self.result(target)
+        self.emit(RANGE_REDUCE, target, spec, first, len(node.args))
+        return target
+
+    def expr_UnExpr(self, node: AST.UnExpr, target: Optional[int]) -> int:
+        if node.op == '+':
+            return self.expr(node.child, target)
+        child = self.expr(node.child)
+        target = self.result(target)
+        self.emit(NEG, target, child)
+        return target
+
+    expr_NegExpr = expr_UnExpr
+
+    def expr_MatTransExpr(self, node: AST.MatTransExpr, target: Optional[int]) -> int:
+        child = self.expr(node.child)
+        target = self.result(target)
+        self.emit(TRANSPOSE, target, child)
+        return target
+
+    def expr_Vector(self, node: AST.Vector, target: Optional[int]) -> int:
+        value = constant_vector(node)
+        if value is not None:
+            return self.value(self.constant(value), target)
+        first = self.exprs(node.expr_set)
+        shape = vector_shape(node)
+        target = self.result(target)
+        if shape is not None:
+            self.emit(FILL_VECTOR, target, first, len(node.expr_set), self.constant(shape))
+        else:
+            self.emit(VECTOR, target, first, len(node.expr_set))
+        return target
+
+    def expr_Matrix(self, node: AST.Matrix, target: Optional[int]) -> int:
+        return self.value(self.constant(node.value), target)
+
+    def special_matrix(self, opcode: int, node: AST.SpecialMatrix, target: Optional[int]) -> int:
+        size = self.expr(node.size)
+        target = self.result(target)
+        self.emit(opcode, target, size)
+        return target
+
+    def expr_Zeros(self, node: AST.Zeros, target: Optional[int]) -> int:
+        return self.special_matrix(ZEROS, node, target)
+
+    def expr_Ones(self, node: AST.Ones, target: Optional[int]) -> int:
+        return self.special_matrix(ONES, node, target)
+
+    def expr_Eye(self, node: AST.Eye, target: Optional[int]) -> int:
+        return self.special_matrix(EYE, node, target)
+
+    def expr_Ref(self, node: AST.Ref, target: Optional[int]) -> int:
+        term = self.expr(node.term)
+        first = self.exprs(node.idxs.expr_set)
+        target = self.result(target)
+        self.emit(REF, target, term, first, len(node.idxs.expr_set))
+        return target
+
+    def expr_Slice(self, node: AST.Slice, target: Optional[int]) -> int:
+        if node.beg is None and node.end is None:
+            beg = end = self.constant(None)
+        else:
+            beg = self.expr(node.beg)
+            end = self.expr(node.end)
+        target = self.result(target)
+        self.emit(SLICE, target, beg, end)
+        return target
+
+    def expr_Id(self, node: AST.Id, target: Optional[int]) -> int:
+        return self.value(self.lookup(node.id)[0], target)
+
+    def expr_IntNum(self, node: AST.IntNum, target: Optional[int]) -> int:
+        return self.value(self.constant(node.n), target)
+
+    expr_FloatNum = expr_IntNum
+
+    def expr_String(self, node: AST.String, target: Optional[int]) -> int:
+        return self.value(self.constant(node.s), target)
@@ -0,0 +1,380 @@
+import operator
+import numpy as np
+from typing import List, Optional
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import deep_recursion
+from matrix_lang_interpreter.memory import Frame, allocate_frames
+from matrix_lang_interpreter.resolver import Resolver
+from matrix_lang_interpreter.lowering import constant_vector, may_alias, vector_shape
+from matrix_lang_interpreter.signals import BREAK, CONTINUE
+from matrix_lang_interpreter.exceptions import *
+from matrix_lang_interpreter.dispatcher import *
+from matrix_lang_interpreter.operations import *
+
+
+class Compiler:
+    """Closure-compiling execution engine.
+
+    The AST is walked once and every node is turned into a Python closure
+    with its children already bound, so running the program is a chain of
+    direct calls without any per-node type dispatch.
+    """
+
+    def __init__(self, frames: Optional[List[Frame]] = None):
+        # the interpreter passes its own frames to compile hot loops
+        self.frames: List[Frame] = [] if frames is None else frames
+
+    @deep_recursion()
+    def run(self, node: AST.AST):
+        self.compile(node)()
+
+    def load(self, node: AST.Id):
+        depth, slot = node.slot
+        if depth == 0:
+            values = self.frames[0].values
+            return lambda: values[slot]
+        frames = self.frames
+        return lambda: frames[depth].values[slot]
+
+    def store(self, node: AST.Id):
+        depth, slot = node.slot
+        frames = self.frames
+
+        if node.aliases:
+            slots = [node.slot, *node.aliases]
+
+            def store(value):
+                for depth, slot in slots:
+                    frames[depth].values[slot] = value
+
+        elif depth == 0:
+            values = frames[0].values
+
+            def store(value):
+                values[slot] = value
+
+        else:
+            def store(value):
+                frames[depth].values[slot] = value
+
+        return store
+
+    def indices(self, node: AST.Vector):
+        # the index tuple is built directly, without a vector of the indices
+        idxs = [self.compile(idx) for idx in node.expr_set]
+        if len(idxs) == 1:
+            [idx] = idxs
+            return lambda: (idx(),)
+        if len(idxs) == 2:
+            i, j = idxs
+            return lambda: (i(), j())
+        return lambda: tuple([idx() for idx in idxs])
+
+    @on('node')
+    def compile(self, node):
+        pass
+
+    @when(AST.AST)
+    def compile(self, node: AST.AST):
+        Resolver().resolve(node)
+        allocate_frames(node)
+        self.frames[:] = [Frame(node.frame_size)]
+        stmts = [self.compile(stmt) for stmt in node.stmt_set]
+
+        def run():
+            try:
+                for stmt in stmts:
+                    stmt()
+            except ReturnValueException as e:
+                list(map(print, e.values))
+
+        return run
+
+    def compile_scope(self, node: AST.Node, body):
+        if not node.frame_size:
+            return body
+
+        frames = self.frames
+        frame = node.frame
+
+        def run():
+            frames.append(frame)
+            signal = body()
+            frames.pop()
+            frame.clear()
+            return signal
+
+        return run
+
+    @when(AST.Block)
+    def compile(self, node: AST.Block):
+        stmts = [self.compile(stmt) for stmt in node.stmt_set]
+
+        def run():
+            for stmt in stmts:
+                if signal := stmt():
+                    return signal
+
+        return self.compile_scope(node, run)
+
+    @when(AST.AssignStmt)
+    def compile(self, node: AST.AssignStmt):
+        expr = self.compile(node.expr)
+
+        if isinstance(node.lvalue, AST.Id):
+            store = self.store(node.lvalue)
+            if may_alias(node.expr):
+                return lambda: store(share(expr()))
+            return lambda: store(expr())
+
+        load = self.load(node.lvalue.term)
+        store = self.store(node.lvalue.term)
+        idxs = self.indices(node.lvalue.idxs)
+
+        def run():
+            value = expr()
+            vec = load()
+            if shared(vec):
+                vec = vec.copy()
+                store(vec)
+            vec[idxs()] = value
+
+        return run
+
+    @when(AST.IfStmt)
+    def compile(self, node: AST.IfStmt):
+        cond = self.compile(node.cond)
+        stmt = self.compile(node.stmt)
+
+        def run():
+            if cond():
+                return stmt()
+
+        return self.compile_scope(node, run)
+
+    @when(AST.IfElseStmt)
+    def compile(self, node: AST.IfElseStmt):
+        cond = self.compile(node.cond)
+        stmt = self.compile(node.stmt)
+        elseStmt = self.compile(node.elseStmt)
+
+        def run():
+            if cond():
+                return stmt()
+            return elseStmt()
+
+        return self.compile_scope(node, run)
+
+    @when(AST.WhileLoop)
+    def compile(self, node: AST.WhileLoop):
+        cond = self.compile(node.cond)
+        stmt = self.compile(node.stmt)
+
+        def run():
+            while cond():
+                if stmt() == BREAK:
+                    break
+
+        return self.compile_scope(node, run)
+
+    @when(AST.ForLoop)
+    def compile(self, node: AST.ForLoop):
+        beg = self.compile(node.beg)
+        end = self.compile(node.end)
+        stmt = self.compile(node.stmt)
+        store = self.store(node.id)
+        slot = node.id.slot[1]
+        frame = node.frame
+        values = frame.values
+        frames = self.frames
+        aliases = node.id.aliases
+
+        def run():
+            b = beg()
+            e = end()
+
+            values[slot] = b
+            frames.append(frame)
+
+            if aliases or type(b) is not int or type(e) is not int:
+                while (i := values[slot]) < e:
+                    if stmt() == BREAK:
+                        break
+                    store(i + 1)
+            else:
+                for i in range(b, e):
+                    values[slot] = i
+                    if stmt() == BREAK:
+                        break
+
+            frames.pop()
+            frame.clear()
+
+        return run
+
+    @when(AST.LoopNest)
+    def compile(self, node: AST.LoopNest):
+        program = node.program
+        args = [self.compile(arg) for arg in node.args]
+        loop = self.compile(node.loop)
+
+        def run():
+            if not assign_nest(program, [arg() for arg in args]):
+                return loop()
+
+        return run
+
+    @when(AST.Break)
+    def compile(self, node: AST.Break):
+        return lambda: BREAK
+
+    @when(AST.Continue)
+    def compile(self, node: AST.Continue):
+        return lambda: CONTINUE
+
+    @when(AST.Print)
+    def compile(self, node: AST.Print):
+        exprs = [self.compile(expr) for expr in node.expr_set]
+
+        def run():
+            for expr in exprs:
+                print(expr())
+
+        return run
+
+    @when(AST.Return)
+    def compile(self, node: AST.Return):
+        exprs = [self.compile(expr) for expr in node.expr_set]
+
+        def run():
+            raise ReturnValueException([expr() for expr in exprs])
+
+        return run
+
+    @when(AST.BinExpr)
+    def compile(self, node: AST.BinExpr):
+        return self.compile_binary(BINARY_OPERATIONS[node.op], node.left, node.right)
+
+    @when(AST.BoundBinExpr)
+    def compile(self, node: AST.BoundBinExpr):
+        return self.compile_binary(node.fn, node.left, node.right)
+
+    @when(AST.IntDivExpr)
+    def compile(self, node: AST.IntDivExpr):
+        return self.compile_binary(operator.floordiv, node.left, node.right)
+
+    @when(AST.TrueDivExpr)
+    def compile(self, node: AST.TrueDivExpr):
+        return self.compile_binary(operator.truediv, node.left, node.right)
+
+    @when(AST.MatMulBinExpr)
+    def compile(self, node: AST.MatMulBinExpr):
+        return self.compile_binary(np.matmul, node.left, node.right)
+
+    @when(AST.MatMulChain)
+    def compile(self, node: AST.MatMulChain):
+        exprs = [self.compile(expr) for expr in node.expr_set]
+        return lambda: matmul_chain([expr() for expr in exprs])
+
+    @when(AST.RangeReduce)
+    def compile(self, node: AST.RangeReduce):
+        op, program, exact = node.op, node.program, node.exact
+        args = [self.compile(arg) for arg in node.args]
+        return lambda: reduce_range(op, program, exact, [arg() for arg in args])
+
+    @when(AST.RelationExpr)
+    def compile(self, node: AST.RelationExpr):
+        return self.compile_binary(RELATION_OPERATIONS[node.op], node.left, node.right)
+
+    @when(AST.BoundRelationExpr)
+    def compile(self, node: AST.BoundRelationExpr):
+        return self.compile_binary(node.fn, node.left, node.right)
+
+    def compile_binary(self, operation, left: AST.Expr, right: AST.Expr):
+        left = self.compile(left)
+        right = self.compile(right)
+        return lambda: operation(left(), right())
+
+    @when(AST.UnExpr)
+    def compile(self, node: AST.UnExpr):
+        operation = UNARY_OPERATIONS[node.op]
+        child = self.compile(node.child)
+        return lambda: operation(child())
+
+    @when(AST.NegExpr)
+    def compile(self, node: AST.NegExpr):
+        child = self.compile(node.child)
+        return lambda: -child()
+
+    @when(AST.MatTransExpr)
+    def compile(self, node: AST.MatTransExpr):
+        child = self.compile(node.child)
+        return lambda: child().T
+
+    @when(AST.Vector)
+    def compile(self, node: AST.Vector):
+        value = constant_vector(node)
+        if value is not None:
+            return lambda: value
+        exprs = [self.compile(expr) for expr in node.expr_set]
+        shape = vector_shape(node)
+        if shape is not None:
+            return lambda: fill_vector([expr() for expr in exprs], shape)
+        return lambda: build_vector([expr() for expr in exprs])
+
+    @when(AST.Matrix)
+    def compile(self, node: AST.Matrix):
+        value = node.value
+        return lambda: value
+
+    @when(AST.Zeros)
+    def compile(self, node: AST.Zeros):
+        size = self.compile(node.size)
+        return lambda: np.zeros(size())
+
+    @when(AST.Ones)
+    def compile(self, node: AST.Ones):
+        size = self.compile(node.size)
+        return lambda: np.ones(size())
+
+    @when(AST.Eye)
+    def compile(self, node: AST.Eye):
+        size = self.compile(node.size)
+        return lambda: np.eye(size(), dtype=int)
+
+    @when(AST.Ref)
+    def compile(self, node: AST.Ref):
+        term = self.compile(node.term)
+        idxs = self.indices(node.idxs)
+        return lambda: term()[idxs()]
+
+    @when(AST.Slice)
+    def compile(self, node: AST.Slice):
+        if node.beg is None and node.end is None:
+            whole = slice(None)
+            return lambda: whole
+        beg = self.compile(node.beg)
+        end = self.compile(node.end)
+        return lambda: slice(beg(), end())
+
+    @when(AST.Id)
+    def compile(self, node: AST.Id):
+        return self.load(node)
+
+    @when(AST.IntNum)
+    def compile(self, node: AST.IntNum):
+        n = node.n
+        return lambda: n
+
+    @when(AST.FloatNum)
+    def compile(self, node: AST.FloatNum):
+        n = node.n
+        return lambda: n
+
+    @when(AST.String)
+    def compile(self, node: AST.String):
+        s = node.s
+        return lambda: s
+
+
+Compiler.compile.dispatcher.freeze()
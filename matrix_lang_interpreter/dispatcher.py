@@ -5,7 +5,7 @@ __all__ = ['on', 'when']
 
 def on(param_name):
     def f(fn):
-        return Dispatcher(param_name, fn)
+        return Dispatcher(param_name, fn).function()
 
     return f
 
@@ -16,36 +16,78 @@ def when(param_type):
         dispatcher = frame.f_locals[func_name]
         if not isinstance(dispatcher, Dispatcher):
             dispatcher = dispatcher.dispatcher
-        dispatcher.add_target(param_type, fn)
+        dispatcher.register(param_type, fn)
+        return dispatcher.function()
 
-        def ff(*args, **kw):
-            return dispatcher(*args, **kw)
+    return f
 
-        ff.dispatcher = dispatcher
-        return ff
 
-    return f
+class DispatchTable(dict):
+    """Targets by concrete class, filled in on first use of each class."""
+
+    def __init__(self, dispatcher: 'Dispatcher'):
+        super().__init__()
+        self.dispatcher = dispatcher
+
+    def __missing__(self, typ):
+        target = self[typ] = self.dispatcher.resolve(typ)
+        return target
 
 
 class Dispatcher:
+    """Calls the target registered for the class of one parameter.
+
+    A class without a target of its own uses the target of its nearest
+    base class in the MRO; the result is cached per class, so after the
+    first call dispatch costs a single dict lookup.  ``freeze`` stops
+    further registration and returns the table, which hot code may
+    index directly: ``table[node.__class__](self, node)``.
+
+    ``on`` and ``when`` return ``function()``; the dispatcher itself is
+    reachable through its ``dispatcher`` attribute.
+    """
+
     def __init__(self, param_name, fn):
         self.param_index = self.__argspec(fn).args.index(param_name)
         self.param_name = param_name
+        self.name = fn.__name__
         self.targets = {}
+        self.table = DispatchTable(self)
+        self.frozen = False
 
     def __call__(self, *args, **kw):
-        typ = args[self.param_index].__class__
-        d = self.targets.get(typ)
-        if d is not None:
-            return d(*args, **kw)
-        else:
-            issub = issubclass
-            t = self.targets
-            ks = iter(t)
-            return [t[k](*args, **kw) for k in ks if issub(typ, k)]
+        return self.table[args[self.param_index].__class__](*args, **kw)
+
+    def function(self):
+        """A plain function dispatching like ``self``, so that it binds
+        as a method without another call frame."""
+        table, index = self.table, self.param_index
+
+        def dispatch(*args, **kw):
+            return table[args[index].__class__](*args, **kw)
+
+        dispatch.__name__ = self.name
+        dispatch.dispatcher = self
+        return dispatch
 
-    def add_target(self, typ, target):
+    def register(self, typ, target):
+        if self.frozen:
+            raise RuntimeError(f'{self.name}: cannot register {typ.__name__} after freeze()')
         self.targets[typ] = target
+        self.table.clear()
+
+    add_target = register
+
+    def resolve(self, typ):
+        for base in typ.__mro__:
+            target = self.targets.get(base)
+            if target is not None:
+                return target
+        raise TypeError(f'{self.name}: no target for {typ.__name__}')
+
+    def freeze(self) -> DispatchTable:
+        self.frozen = True
+        return self.table
 
     @staticmethod
     def __argspec(fn):
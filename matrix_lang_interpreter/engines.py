@@ -0,0 +1,19 @@
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.compiler import Compiler
+from matrix_lang_interpreter.transpiler import CodeCache, compile_program
+from matrix_lang_interpreter.bytecode_compiler import BytecodeCompiler
+from matrix_lang_interpreter.vm import VM
+from matrix_lang_interpreter.stack_interpreter import StackInterpreter
+
+
+ENGINES = {
+    'interpreter': lambda ast: Interpreter().visit(ast),
+    'compiler': lambda ast: Compiler().run(ast),
+    'python': lambda ast: compile_program(ast, CodeCache()).run(),
+    'vm': lambda ast: VM(BytecodeCompiler().compile(ast)).run(),
+    'stack': lambda ast: StackInterpreter().run(ast),
+}
+
+def run(ast: AST.AST, engine: str = 'interpreter'):
+    ENGINES[engine](ast)
@@ -2,8 +2,10 @@ class ReturnValueException(Exception):
     def __init__(self, values):
         self.values = values
 
-class BreakException(Exception):
-    pass
-
-class ContinueException(Exception):
-    pass
+class SourceRuntimeError(Exception):
+    def __init__(self, lineno, error):
+        super().__init__(
+            f'Line {lineno:3}: Runtime: {error.__class__.__name__}: {error}'
+        )
+        self.lineno = lineno
+        self.error = error
@@ -1,113 +1,184 @@
-import sys
-import operator
 import numpy as np
+from functools import partial
+from typing import List, Optional, Callable
 from matrix_lang_interpreter import AST
-from matrix_lang_interpreter.memory import *
+from matrix_lang_interpreter.ast_utils import iter_nodes, deep_recursion
+from matrix_lang_interpreter.compiler import Compiler
+from matrix_lang_interpreter.memory import Frame, allocate_frames
+from matrix_lang_interpreter.resolver import Resolver
+from matrix_lang_interpreter.lowering import Lowering, may_alias, vector_shape
+from matrix_lang_interpreter.signals import BREAK, CONTINUE
 from matrix_lang_interpreter.exceptions import  *
 from matrix_lang_interpreter.dispatcher import *
+from matrix_lang_interpreter.operations import *
 
-
-sys.setrecursionlimit(10000)
+# iterations after which a loop runs its body compiled
+TIER_THRESHOLD = 100
 
 
 class Interpreter:
-    def __init__(self):
-        self.memory_stack = MemoryStack(Memory())
+    """Tree-walking interpreter with a second tier for hot loops.
+
+    Every loop counts the iterations of all its runs.  Once the count
+    reaches ``threshold`` its body (and condition) are compiled to
+    closures by the Compiler, which shares the interpreter's frames, and
+    the loop carries on with them from the next iteration.  A threshold
+    of None interprets everything.
+    """
+
+    def __init__(self, threshold: Optional[int] = TIER_THRESHOLD):
+        self.frames: List[Frame] = []
+        self.threshold = threshold
+        self.compiler = Compiler(self.frames)
+
+    def load(self, node: AST.Id):
+        depth, slot = node.slot
+        return self.frames[depth].values[slot]
+
+    def store(self, node: AST.Id, value):
+        depth, slot = node.slot
+        self.frames[depth].values[slot] = value
+        for depth, slot in node.aliases:
+            self.frames[depth].values[slot] = value
 
     @on('node')
     def visit(self, node):
         pass
 
     @when(AST.AST)
+    @deep_recursion()
     def visit(self, node: AST.AST):
+        Lowering().run(node)
+        Resolver().resolve(node)
+        allocate_frames(node)
+        self.frames = [Frame(node.frame_size)]
+        self.compiler = Compiler(self.frames)
+        for child in iter_nodes(node):
+            if isinstance(child, (AST.WhileLoop, AST.ForLoop)):
+                child.iterations = 0
+                child.compiled = None
         try:
             for stmt in node.stmt_set:
                 self.visit(stmt)
         except ReturnValueException as e:
             list(map(print, e.values))
 
+    def enter(self, node: AST.Node):
+        if node.frame_size:
+            self.frames.append(node.frame)
+
+    def leave(self, node: AST.Node):
+        if node.frame_size:
+            self.frames.pop().clear()
+
     @when(AST.Block)
     def visit(self, node: AST.Block):
-        self.memory_stack.push(Memory())
+        self.enter(node)
+        signal = None
         for stmt in node.stmt_set:
-            self.visit(stmt)
-        self.memory_stack.pop()
+            if signal := self.visit(stmt):
+                break
+        self.leave(node)
+        return signal
 
     @when(AST.AssignStmt)
     def visit(self, node: AST.AssignStmt):
         expr = self.visit(node.expr)
         if isinstance(node.lvalue, AST.Id):
-            id = node.lvalue.id
-            if self.memory_stack.has_key(id):
-                self.memory_stack.set(id, expr)
-            else:
-                self.memory_stack.insert(id, expr)
+            self.store(node.lvalue, share(expr) if may_alias(node.expr) else expr)
         elif isinstance(node.lvalue, AST.Ref):
-            id = node.lvalue.term.id
-            vec = self.memory_stack.get(id)
-
-            idxs = self.visit(node.lvalue.idxs)
-            vec[tuple(idxs)] = expr
+            vec = self.load(node.lvalue.term)
+            if shared(vec):
+                vec = vec.copy()
+                self.store(node.lvalue.term, vec)
 
-            self.memory_stack.set(id, vec)
+            idxs = tuple(map(self.visit, node.lvalue.idxs.expr_set))
+            vec[idxs] = expr
 
     @when(AST.IfStmt)
     def visit(self, node: AST.IfStmt):
-        self.memory_stack.push(Memory())
+        self.enter(node)
+        signal = None
         if self.visit(node.cond):
-            self.visit(node.stmt)
-        self.memory_stack.pop()
+            signal = self.visit(node.stmt)
+        self.leave(node)
+        return signal
 
     @when(AST.IfElseStmt)
     def visit(self, node: AST.IfElseStmt):
-        self.memory_stack.push(Memory())
+        self.enter(node)
         if self.visit(node.cond):
-            self.visit(node.stmt)
+            signal = self.visit(node.stmt)
         else:
-            self.visit(node.elseStmt)
-        self.memory_stack.pop()
+            signal = self.visit(node.elseStmt)
+        self.leave(node)
+        return signal
+
+    def tier(self, node: AST.Node, *children: AST.Node) -> List[Callable]:
+        """Callables running ``children`` of a loop, compiled ones when the
+        loop is hot."""
+        if node.compiled is None and node.iterations == self.threshold:
+            node.compiled = list(map(self.compiler.compile, children))
+        return node.compiled or [partial(self.visit, child) for child in children]
 
     @when(AST.WhileLoop)
     def visit(self, node: AST.WhileLoop):
-        self.memory_stack.push(Memory())
+        self.enter(node)
 
-        while self.visit(node.cond):
-            try:
-                self.visit(node.stmt)
-            except BreakException:
+        cond, stmt = self.tier(node, node.cond, node.stmt)
+        while cond():
+            if stmt() == BREAK:
                 break
-            except ContinueException:
-                continue
+            node.iterations += 1
+            if node.iterations == self.threshold:
+                cond, stmt = self.tier(node, node.cond, node.stmt)
 
-        self.memory_stack.pop()
+        self.leave(node)
 
     @when(AST.ForLoop)
     def visit(self, node: AST.ForLoop):
         beg = self.visit(node.beg)
         end = self.visit(node.end)
 
-        self.memory_stack.push(Memory())
-        self.memory_stack.insert(node.id.id, beg)
+        values = node.frame.values
+        slot = node.id.slot[1]
+        values[slot] = beg
+        self.frames.append(node.frame)
+
+        # the increment uses the value read at the top of the iteration, so
+        # assignments to the variable in the body never change the sequence
+        stmt, = self.tier(node, node.stmt)
+        if node.id.aliases or type(beg) is not int or type(end) is not int:
+            while (i := values[slot]) < end:
+                if stmt() == BREAK:
+                    break
+                self.store(node.id, i + 1)
+                node.iterations += 1
+                if node.iterations == self.threshold:
+                    stmt, = self.tier(node, node.stmt)
+        else:
+            for i in range(beg, end):
+                values[slot] = i
+                if stmt() == BREAK:
+                    break
+                node.iterations += 1
+                if node.iterations == self.threshold:
+                    stmt, = self.tier(node, node.stmt)
 
-        while (i := self.visit(node.id)) < end:
-            try:
-                self.visit(node.stmt)
-                self.memory_stack.set(node.id.id, i + 1)
-            except BreakException:
-                break
-            except ContinueException:
-                self.memory_stack.set(node.id.id, i + 1)
-                continue
+        self.frames.pop().clear()
 
-        self.memory_stack.pop()
+    @when(AST.LoopNest)
+    def visit(self, node: AST.LoopNest):
+        if not assign_nest(node.program, list(map(self.visit, node.args))):
+            return self.visit(node.loop)
 
     @when(AST.Break)
     def visit(self, node: AST.Break):
-        raise BreakException()
+        return BREAK
 
     @when(AST.Continue)
     def visit(self, node: AST.Continue):
-        raise ContinueException()
+        return CONTINUE
 
     @when(AST.Print)
     def visit(self, node: AST.Print):
@@ -120,27 +191,21 @@ class Interpreter:
 
     @when(AST.BinExpr)
     def visit(self, node: AST.BinExpr):
-        isint = lambda x, y: (
-            (
-                isinstance(x, int) and isinstance(y, int)
-            ) or (
-                isinstance(x, np.ndarray) and x.dtype == int
-                and
-                isinstance(y, np.ndarray) and y.dtype == int
-            )
-        )
-
-        operations = {
-            '+': operator.add,
-            '-': operator.sub,
-            '*': operator.mul,
-            '/': lambda x, y: (
-                operator.floordiv(x, y) if isint(x, y)
-                else operator.truediv(x, y))
-        }
         left = self.visit(node.left)
         right = self.visit(node.right)
-        return operations[node.op](left, right)
+        return BINARY_OPERATIONS[node.op](left, right)
+
+    @when(AST.BoundBinExpr)
+    def visit(self, node: AST.BoundBinExpr):
+        return node.fn(self.visit(node.left), self.visit(node.right))
+
+    @when(AST.IntDivExpr)
+    def visit(self, node: AST.IntDivExpr):
+        return self.visit(node.left) // self.visit(node.right)
+
+    @when(AST.TrueDivExpr)
+    def visit(self, node: AST.TrueDivExpr):
+        return self.visit(node.left) / self.visit(node.right)
 
     @when(AST.MatMulBinExpr)
     def visit(self, node: AST.MatMulBinExpr):
@@ -148,14 +213,22 @@ class Interpreter:
         right = self.visit(node.right)
         return np.matmul(left, right)
 
+    @when(AST.MatMulChain)
+    def visit(self, node: AST.MatMulChain):
+        return matmul_chain(list(map(self.visit, node.expr_set)))
+
+    @when(AST.RangeReduce)
+    def visit(self, node: AST.RangeReduce):
+        return reduce_range(node.op, node.program, node.exact, list(map(self.visit, node.args)))
+
     @when(AST.UnExpr)
     def visit(self, node: AST.UnExpr):
-        operations = {
-            '+': lambda x: x,
-            '-': operator.neg
-        }
         child = self.visit(node.child)
-        return operations[node.op](child)
+        return UNARY_OPERATIONS[node.op](child)
+
+    @when(AST.NegExpr)
+    def visit(self, node: AST.NegExpr):
+        return -self.visit(node.child)
 
     @when(AST.MatTransExpr)
     def visit(self, node: AST.MatTransExpr):
@@ -164,29 +237,25 @@ class Interpreter:
 
     @when(AST.RelationExpr)
     def visit(self, node: AST.RelationExpr):
-        operations = {
-            '==': operator.eq,
-            '!=': operator.ne,
-            '<':  operator.lt,
-            '<=': operator.le,
-            '>':  operator.gt,
-            '>=': operator.ge
-        }
         left = self.visit(node.left)
         right = self.visit(node.right)
-        return operations[node.op](left, right)
+        return RELATION_OPERATIONS[node.op](left, right)
+
+    @when(AST.BoundRelationExpr)
+    def visit(self, node: AST.BoundRelationExpr):
+        return node.fn(self.visit(node.left), self.visit(node.right))
 
     @when(AST.Vector)
     def visit(self, node: AST.Vector):
         elements = list(map(self.visit, node.expr_set))
+        shape = vector_shape(node)
+        if shape is not None:
+            return fill_vector(elements, shape)
+        return build_vector(elements)
 
-        if len(elements) == 0:
-            return np.array([], dtype=int)
-
-        if isinstance(elements[0], np.ndarray):
-            return np.vstack(elements)
-
-        return np.hstack(elements)
+    @when(AST.Matrix)
+    def visit(self, node: AST.Matrix):
+        return node.value
 
     @when(AST.Zeros)
     def visit(self, node: AST.Zeros):
@@ -206,12 +275,18 @@ class Interpreter:
     @when(AST.Ref)
     def visit(self, node: AST.Ref):
         term = self.visit(node.term)
-        idxs = self.visit(node.idxs)
-        return term[tuple(idxs)]
+        idxs = tuple(map(self.visit, node.idxs.expr_set))
+        return term[idxs]
+
+    @when(AST.Slice)
+    def visit(self, node: AST.Slice):
+        if node.beg is None and node.end is None:
+            return slice(None)
+        return slice(self.visit(node.beg), self.visit(node.end))
 
     @when(AST.Id)
     def visit(self, node: AST.Id):
-        return self.memory_stack.get(node.id)
+        return self.load(node)
 
     @when(AST.IntNum)
     def visit(self, node: AST.IntNum):
@@ -224,3 +299,6 @@ class Interpreter:
     @when(AST.String)
     def visit(self, node: AST.String):
         return node.s
+
+
+Interpreter.visit.dispatcher.freeze()
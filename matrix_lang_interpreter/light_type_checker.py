@@ -0,0 +1,431 @@
+from types import GeneratorType
+from typing import Optional, Tuple
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.symbol_table import SymbolTable
+from matrix_lang_interpreter.type_checker import NodeVisitor, Types
+
+
+class Type:
+    __slots__ = ('type', 'size', 'lineno')
+
+    def __init__(self, type: Optional[str], size: Optional[Tuple[int, ...]], lineno: int = 0):
+        self.type = type
+        self.size = size
+        self.lineno = lineno
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.type!r}, {self.size!r}, {self.lineno})'
+
+class Variable(Type):
+    __slots__ = ('name',)
+
+    def __init__(self, type: Optional[str], size: Optional[Tuple[int, ...]], lineno: int = 0, name: str = ''):
+        super().__init__(type, size, lineno)
+        self.name = name
+
+class Diagnostics(list):
+    """Messages of a check in the order they were reported."""
+
+    def __str__(self):
+        return '\n'.join(self)
+
+
+class LightTypeChecker(NodeVisitor):
+    """TypeChecker reporting to a single Diagnostics list.
+
+    Results are ``Type`` records, or None for a subtree which failed to
+    check, instead of WriterMaybe values whose logs are concatenated on
+    every bind.  It reports the same errors in the same order as
+    ``TypeChecker(debug=False)`` and annotates the same nodes, but keeps
+    no debug trace.
+
+    It visits the tree without recursion: a ``visit_X`` method either
+    returns its result or is a generator which yields the children it
+    needs visited and receives their results, so nesting depth is bounded
+    by memory and not by the Python stack.
+    """
+
+    def __init__(self):
+        self.diagnostics = Diagnostics()
+        self.symbolTable = SymbolTable(None)
+        self.assignmentState = False
+        self.loopState = False
+
+    def visit(self, node) -> Optional[Type]:
+        stack = []
+        while True:
+            method = 'visit_' + node.__class__.__name__
+            result = getattr(self, method, self.generic_visit)(node)
+            if isinstance(result, GeneratorType):
+                stack.append((node, result))
+                result = None
+            else:
+                result = self.annotate(node, result)
+
+            while stack:
+                node, visitor = stack[-1]
+                try:
+                    node = visitor.send(result)
+                    break
+                except StopIteration as stop:
+                    stack.pop()
+                    result = self.annotate(node, stop.value)
+            else:
+                return result
+
+    @staticmethod
+    def annotate(node, result: Optional[Type]) -> Optional[Type]:
+        if result is not None and isinstance(node, AST.Expr):
+            node.type, node.shape = result.type, result.size
+        return result
+
+    def error(self, lineno: int, message: str) -> None:
+        self.diagnostics.append(f'Line {lineno:3}: TypeChecker: {message}')
+
+    def generic_visit(self, node):
+        self.diagnostics.append('TypeChecker: Encountered problem(s)')
+
+    def visit_all(self, nodes: list, default: Type) -> Optional[Type]:
+        # only the first result is kept, the rest are dropped as they come
+        first = default if not nodes else None
+        failed = False
+        for node in nodes:
+            result = (yield node)
+            if result is None:
+                failed = True
+            elif first is None:
+                first = result
+        return None if failed else first
+
+    def visit_AST(self, node: AST.AST) -> Optional[Type]:
+        return self.visit_all(node.stmt_set, Type(None, None))
+
+    def visit_Block(self, node: AST.Block) -> Optional[Type]:
+        self.symbolTable.pushScope()
+        result = yield from self.visit_all(node.stmt_set, Type(None, None))
+        self.symbolTable.popScope()
+        return result
+
+    def visit_AssignStmt(self, node: AST.AssignStmt) -> Optional[Type]:
+        expr = (yield node.expr)
+        if expr is None:
+            return None
+        self.assignmentState = True
+        lvalue = (yield node.lvalue)
+        self.assignmentState = False
+        if lvalue is None:
+            return None
+
+        lineno = expr.lineno or lvalue.lineno
+        if not isinstance(lvalue, Variable):
+            return self.error(lineno, 'Assignment: lvalue is not VariableSymbol - not implemented')
+        lvalue.type = expr.type
+        lvalue.size = expr.size
+        if isinstance(node.lvalue, AST.Id):
+            node.lvalue.type, node.lvalue.shape = expr.type, expr.size
+        return Type(None, None, lineno)
+
+    def check_cond(self, cond: Optional[Type]) -> Optional[Type]:
+        if cond is not None and cond.type != 'bool':
+            return self.error(cond.lineno, 'condition is not bool')
+        return cond
+
+    def visit_IfStmt(self, node: AST.IfStmt) -> Optional[Type]:
+        cond = self.check_cond((yield node.cond))
+
+        self.symbolTable.pushScope()
+        stmt = (yield node.stmt)
+        self.symbolTable.popScope()
+
+        if cond is None or stmt is None:
+            return None
+        return Type(None, None, cond.lineno or stmt.lineno)
+
+    def visit_IfElseStmt(self, node: AST.IfElseStmt) -> Optional[Type]:
+        cond = self.check_cond((yield node.cond))
+
+        self.symbolTable.pushScope()
+        stmt = (yield node.stmt)
+        self.symbolTable.popScope()
+
+        self.symbolTable.pushScope()
+        elseStmt = (yield node.elseStmt)
+        self.symbolTable.popScope()
+
+        if cond is None or stmt is None or elseStmt is None:
+            return None
+        return Type(None, None, cond.lineno or stmt.lineno or elseStmt.lineno)
+
+    def visit_WhileLoop(self, node: AST.WhileLoop) -> Optional[Type]:
+        cond = self.check_cond((yield node.cond))
+
+        self.symbolTable.pushScope()
+        prev_state = self.loopState
+        self.loopState = True
+
+        stmt = (yield node.stmt)
+
+        self.loopState = prev_state
+        self.symbolTable.popScope()
+
+        if cond is None or stmt is None:
+            return None
+        return Type(None, None, cond.lineno or stmt.lineno)
+
+    def check_range(self, bound: Optional[Type], name: str) -> Optional[Type]:
+        if bound is not None and (bound.type != 'int' or bound.size != ()):
+            return self.error(bound.lineno, f'ForLoop: {name} variable is not int')
+        return bound
+
+    def visit_ForLoop(self, node: AST.ForLoop) -> Optional[Type]:
+        self.symbolTable.pushScope()
+        self.assignmentState = True
+        id = (yield node.id)
+        self.assignmentState = False
+        if id is not None:
+            if isinstance(id, Variable):
+                id.type = 'int'
+                id.size = ()
+                node.id.type, node.id.shape = 'int', ()
+            else:
+                id = self.error(id.lineno, 'ForLoop: problem with variable')
+
+        beg = self.check_range((yield node.beg), 'beg')
+        end = self.check_range((yield node.end), 'end')
+
+        prev_state = self.loopState
+        self.loopState = True
+
+        stmt = (yield node.stmt)
+
+        self.loopState = prev_state
+        self.symbolTable.popScope()
+
+        if id is None or beg is None or end is None or stmt is None:
+            return None
+        return Type(None, None, beg.lineno or end.lineno or id.lineno or stmt.lineno)
+
+    def visit_Break(self, node: AST.Break) -> Optional[Type]:
+        if self.loopState:
+            return Type(None, None, node.lineno)
+        return self.error(node.lineno, 'break outside of a loop')
+
+    def visit_Continue(self, node: AST.Continue) -> Optional[Type]:
+        if self.loopState:
+            return Type(None, None, node.lineno)
+        return self.error(node.lineno, 'continue outside of a loop')
+
+    def visit_Print(self, node: AST.Print) -> Optional[Type]:
+        return self.visit_all(node.expr_set, Type(None, None))
+
+    def visit_Return(self, node: AST.Return) -> Optional[Type]:
+        return self.visit_all(node.expr_set, Type(None, None))
+
+    def visit_BinExpr(self, node: AST.BinExpr) -> Optional[Type]:
+        op = node.op
+        s1 = (yield node.left)
+        s2 = (yield node.right)
+        if s1 is None or s2 is None:
+            return None
+
+        lineno = s1.lineno or s2.lineno
+        if op not in Types.ttype:
+            return self.error(lineno, f'BinExpr: no such operator as {op}')
+        if s1.type not in Types.ttype[op] or s2.type not in Types.ttype[op][s1.type]:
+            return self.error(lineno, f'BinExpr: wrong operator {op} for {s1.type} and {s2.type}')
+        if not Types.same_size(s1.size, s2.size):
+            return self.error(lineno, f'BinExpr: incompatible sizes: {s1.size} and {s2.size}')
+        return Type(Types.ttype[op][s1.type][s2.type], Types.join(s1.size, s2.size), lineno)
+
+    def visit_MatMulBinExpr(self, node: AST.MatMulBinExpr) -> Optional[Type]:
+        op = node.op
+        s1 = (yield node.left)
+        s2 = (yield node.right)
+        if s1 is None or s2 is None:
+            return None
+
+        lineno = s1.lineno or s2.lineno
+        if s1.type not in Types.ttype[op] or s2.type not in Types.ttype[op][s1.type]:
+            return self.error(lineno, f'BinExpr: wrong operator {op} for {s1.type} and {s2.type}')
+        if len(s1.size) == 0 or len(s1.size) > 2 or len(s2.size) == 0 or len(s2.size) > 2:
+            return self.error(
+                lineno,
+                f'MatMulBinExpr: can multiply only vectors and matrices: {s1.size} and {s2.size}'
+            )
+        if not Types.same_dim(s1.size[-1], s2.size[0]):
+            return self.error(lineno, f'MatMulBinExpr: incompatible sizes: {s1.size} and {s2.size}')
+
+        if len(s1.size) == 1 and len(s2.size) == 1:
+            size = ()
+        elif len(s1.size) == 2 and len(s2.size) == 1:
+            size = (s1.size[0],)
+        elif len(s1.size) == 1 and len(s2.size) == 2:
+            size = (s2.size[1],)
+        else:
+            size = (s1.size[0], s2.size[1])
+        return Type(Types.ttype[op][s1.type][s2.type], size, lineno)
+
+    def visit_RelationExpr(self, node: AST.RelationExpr) -> Optional[Type]:
+        op = node.op
+        s1 = (yield node.left)
+        s2 = (yield node.right)
+        if s1 is None or s2 is None:
+            return None
+
+        lineno = s1.lineno or s2.lineno
+        if s1.type not in Types.ttype[op] or s2.type not in Types.ttype[op][s1.type]:
+            return self.error(lineno, f'RelationExpr: wrong operator {op} for {s1.type} and {s2.type}')
+        if not Types.same_size(s1.size, s2.size):
+            return self.error(lineno, f'RelationExpr: incompatible sizes: {s1.size} and {s2.size}')
+        return Type('bool', (), lineno)
+
+    def visit_MatTransExpr(self, node: AST.MatTransExpr) -> Optional[Type]:
+        symbol = (yield node.child)
+        if symbol is None:
+            return None
+
+        if len(symbol.size) == 0:
+            return self.error(symbol.lineno, 'MatTransExpr: can\'t transpose a scalar')
+        if len(symbol.size) > 2:
+            return self.error(symbol.lineno, 'MatTransExpr: can\'t transpose not a matrix')
+        if len(symbol.size) == 1:
+            size = symbol.size
+        else:
+            size = (symbol.size[1], symbol.size[0])
+        return Type(symbol.type, size, symbol.lineno)
+
+    def visit_UnExpr(self, node: AST.UnExpr) -> Optional[Type]:
+        op = node.op
+        symbol = (yield node.child)
+        if symbol is None:
+            return None
+
+        if op not in Types.ttype:
+            return self.error(symbol.lineno, f'UnExpr: no such operator as {op}')
+        if symbol.type not in Types.ttype[op]:
+            return self.error(symbol.lineno, f'UnExpr: wrong operator {op} for {symbol.type}')
+        return symbol
+
+    def visit_Vector(self, node: AST.Vector) -> Optional[Type]:
+        # elements are compared as they are visited, so a mismatch is reported
+        # before the errors of the elements after it
+        first = None
+        failed = False
+        for expr in node.expr_set:
+            symbol = (yield expr)
+            if failed:
+                continue
+            if symbol is None:
+                failed = True
+            elif first is None:
+                first = symbol
+            else:
+                lineno = first.lineno or symbol.lineno
+                if first.type != symbol.type:
+                    self.error(lineno, f'Vector: wrong type of elems: {first.type}, {symbol.type}')
+                    failed = True
+                elif not Types.same_size(first.size, symbol.size):
+                    self.error(lineno, f'Vector: wrong size of elems: {first.size}, {symbol.size}')
+                    failed = True
+                else:
+                    first = Type(first.type, Types.join(first.size, symbol.size), lineno)
+        if failed:
+            return None
+        if first is None:
+            first = Type('int', ())
+        return Type(first.type, (len(node.expr_set), *first.size), first.lineno)
+
+    def visit_Matrix(self, node: AST.Matrix) -> Optional[Type]:
+        # the shape of a dense literal is the shape of its array
+        return Type('int' if node.value.dtype.kind == 'i' else 'float', node.value.shape, node.lineno)
+
+    def check_shape(self, node: AST.SpecialMatrix, name: str) -> Optional[Type]:
+        size = (yield node.size)
+        if size is None:
+            return None
+        if len(size.size) != 1 or size.size[0] == 0 or size.type != 'int':
+            return self.error(
+                size.lineno, f'{name}: wrong type of shape parameter: ({size.type}, {size.size})'
+            )
+        return Type('int', tuple([expr.n for expr in node.size.expr_set]), size.lineno)
+
+    def visit_Zeros(self, node: AST.Zeros) -> Optional[Type]:
+        return self.check_shape(node, 'Zeros')
+
+    def visit_Ones(self, node: AST.Ones) -> Optional[Type]:
+        return self.check_shape(node, 'ones')
+
+    def visit_Eye(self, node: AST.Eye) -> Optional[Type]:
+        size = (yield node.size)
+        if size is None:
+            return None
+        if len(size.size) != 0 or size.type != 'int':
+            return self.error(
+                size.lineno, f'eye: wrong type of shape parameter: ({size.type}, {size.size})'
+            )
+        return Type('int', (node.size.n, node.size.n), size.lineno)
+
+    def visit_Ref(self, node: AST.Ref) -> Optional[Type]:
+        idxs_symbol = (yield node.idxs)
+        if idxs_symbol is not None and (len(idxs_symbol.size) != 1 or idxs_symbol.type != 'int'):
+            idxs_symbol = self.error(
+                idxs_symbol.lineno,
+                f'ref: wrong type of ref parameter: ({idxs_symbol.type}, {idxs_symbol.size})'
+            )
+
+        term = (yield node.term)
+        if idxs_symbol is None or term is None:
+            return None
+
+        lineno = idxs_symbol.lineno or term.lineno
+        # only literal indices can be checked against the size
+        idxs = tuple([getattr(expr, 'n', None) for expr in node.idxs.expr_set])
+        if len(idxs) == 0:
+            return self.error(lineno, 'ref: no index given')
+        if len(idxs) > len(term.size):
+            return self.error(
+                lineno, f'ref: accessing dim {len(idxs)} larger than dim {len(term.size)}'
+            )
+        for i in range(len(idxs)):
+            if idxs[i] is not None and term.size[i] is not None and idxs[i] >= term.size[i]:
+                return self.error(
+                    lineno,
+                    f'ref: accessing element outside of the vector: {idxs[i]} >= {term.size[i]}'
+                )
+        return Variable(term.type, Types.ref_size(node.idxs.expr_set, term.size), lineno)
+
+    def check_bound(self, bound: Optional[Type]) -> Optional[Type]:
+        if bound is not None and (bound.type != 'int' or bound.size != ()):
+            return self.error(bound.lineno, f'slice: wrong type of bound: ({bound.type}, {bound.size})')
+        return bound
+
+    def visit_Slice(self, node: AST.Slice) -> Optional[Type]:
+        # a slice checks as an int index, Types.ref_size gives its length
+        if node.beg is None and node.end is None:
+            return Type('int', (), node.lineno)
+        beg = self.check_bound((yield node.beg))
+        end = self.check_bound((yield node.end))
+        if beg is None or end is None:
+            return None
+        return Type('int', (), beg.lineno or end.lineno)
+
+    def visit_Id(self, node: AST.Id) -> Optional[Type]:
+        lineno = node.lineno
+        symbol = self.symbolTable.get(node.id)
+        if symbol is not None:
+            symbol.lineno = lineno
+            return symbol
+        if self.assignmentState:
+            symbol = Variable(None, None, lineno, node.id)
+            self.symbolTable.put(node.id, symbol)
+            return symbol
+        return self.error(lineno, f'no such symbol as {node.id}')
+
+    def visit_IntNum(self, node: AST.IntNum) -> Optional[Type]:
+        return Type('int', (), node.lineno)
+
+    def visit_FloatNum(self, node: AST.FloatNum) -> Optional[Type]:
+        return Type('float', (), node.lineno)
+
+    def visit_String(self, node: AST.String) -> Optional[Type]:
+        return Type('string', (), node.lineno)
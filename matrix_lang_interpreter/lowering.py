@@ -0,0 +1,127 @@
+from typing import Dict, Optional, Tuple
+import numpy as np
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import first_lineno
+from matrix_lang_interpreter.optimizer import Pass, scalar_type, python_scalars
+from matrix_lang_interpreter.operations import (
+    BINARY_OPERATIONS, RELATION_OPERATIONS, UNARY_OPERATIONS, build_vector
+)
+
+
+def constant_element(node: AST.Expr):
+    """Value of a vector element known at compile time, None otherwise."""
+    if isinstance(node, (AST.IntNum, AST.FloatNum)):
+        return node.n
+    if isinstance(node, AST.String):
+        return node.s
+    if isinstance(node, AST.Matrix):
+        return node.value
+    if isinstance(node, AST.UnExpr) and isinstance(node.child, (AST.IntNum, AST.FloatNum)):
+        return UNARY_OPERATIONS[node.op](node.child.n)
+    if isinstance(node, AST.Vector):
+        return constant_vector(node)
+    return None
+
+def constant_vector(node: AST.Vector) -> Optional[np.ndarray]:
+    """Value of a vector literal of constants only, None otherwise.
+
+    It is built once per node and made read-only: the engines share it
+    between evaluations and copy it when the program writes into it.
+    """
+    try:
+        return node.constant
+    except AttributeError:
+        pass
+    node.constant = None
+    elements = [constant_element(expr) for expr in node.expr_set]
+    if all(element is not None for element in elements):
+        try:
+            value = build_vector(elements)
+        except ValueError:
+            # ragged, left to fail at runtime
+            return None
+        value.flags.writeable = False
+        node.constant = value
+    return node.constant
+
+def may_alias(node: AST.Expr) -> bool:
+    """Whether the expression may evaluate to an array a variable holds, or
+    to a view of one, instead of a new array."""
+    while isinstance(node, AST.MatTransExpr) or isinstance(node, AST.UnExpr) and node.op == '+':
+        node = node.child
+    return isinstance(node, (AST.Id, AST.Ref))
+
+def vector_shape(node: AST.Vector) -> Optional[Tuple[int, ...]]:
+    """Shape the type checker inferred for a vector of numbers or of rows
+    of numbers, which fill_vector builds, None for any other vector."""
+    shape = getattr(node, 'shape', None)
+    if getattr(node, 'type', None) not in ('int', 'float') or not shape or len(shape) > 2:
+        return None
+    if None in shape:
+        # the length of a slice with computed bounds
+        return None
+    return shape
+
+
+class Lowering(Pass):
+    """Replaces operators by nodes specialized for their operands.
+
+    The operator function is bound ahead of time, so evaluation does not
+    look it up.  Division is the one operator whose semantics depend on
+    the operands: it floor-divides Python ints and int matrices, which
+    the type checker cannot tell apart from numpy scalars or float
+    matrices.  It is specialized only when both operands are known
+    Python numbers and is left to ``divide`` otherwise.
+
+    Vector literals of constants become Matrix nodes of their shared value.
+    """
+
+    name = 'lowering'
+
+    def __init__(self):
+        self.scalars: Dict[str, str] = {}
+
+    def run(self, node: AST.AST) -> AST.AST:
+        self.scalars = python_scalars(node)
+        return self.visit(node)
+
+    def visit_BinExpr(self, node: AST.BinExpr) -> AST.Expr:
+        self.generic_visit(node)
+        if node.op == '/':
+            left = scalar_type(node.left, self.scalars)
+            right = scalar_type(node.right, self.scalars)
+            if left == right == 'int':
+                return AST.IntDivExpr(node.op, node.left, node.right)
+            if left and right:
+                return AST.TrueDivExpr(node.op, node.left, node.right)
+        return AST.BoundBinExpr(node.op, node.left, node.right, BINARY_OPERATIONS[node.op])
+
+    def visit_RelationExpr(self, node: AST.RelationExpr) -> AST.Expr:
+        self.generic_visit(node)
+        return AST.BoundRelationExpr(node.op, node.left, node.right, RELATION_OPERATIONS[node.op])
+
+    def visit_UnExpr(self, node: AST.UnExpr) -> AST.Expr:
+        self.generic_visit(node)
+        if node.op == '+':
+            return node.child
+        return AST.NegExpr(node.op, node.child)
+
+    def visit_Ref(self, node: AST.Ref) -> AST.Expr:
+        # indices and sizes are lists of operands the engines read one by
+        # one, not vector values
+        node.term = self.visit(node.term)
+        self.generic_visit(node.idxs)
+        return node
+
+    def visit_Zeros(self, node: AST.SpecialMatrix) -> AST.Expr:
+        self.generic_visit(node.size)
+        return node
+
+    visit_Ones = visit_Zeros
+
+    def visit_Vector(self, node: AST.Vector) -> AST.Expr:
+        self.generic_visit(node)
+        value = constant_vector(node)
+        if value is None:
+            return node
+        return AST.Matrix(value, first_lineno(node))
@@ -0,0 +1,111 @@
+import os
+import hashlib
+import importlib
+from types import SimpleNamespace
+import sly
+from sly.yacc import Production, YaccError, _collect_grammar_rules
+
+
+# changes whenever the layout of the generated module changes
+TABLES_VERSION = 1
+TABLES_MODULE = 'matrix_lang_interpreter.parsetab'
+TABLES_FILE = os.path.join(os.path.dirname(__file__), 'parsetab.py')
+
+
+def grammar_rules(definitions: list) -> list:
+    """(function, file, line, name, symbols) of every rule, in SLY's order."""
+    return [
+        rule
+        for _, value in definitions if callable(value) and hasattr(value, 'rules')
+        for rule in _collect_grammar_rules(value)
+    ]
+
+def grammar_signature(cls, rules: list) -> str:
+    spec = (
+        TABLES_VERSION, sly.__version__, sorted(cls.tokens), cls.precedence,
+        getattr(cls, 'start', None), [(name, syms) for _, _, _, name, syms in rules]
+    )
+    return hashlib.sha256(repr(spec).encode()).hexdigest()
+
+def load_tables(signature: str):
+    try:
+        tables = importlib.import_module(TABLES_MODULE)
+    except ImportError:
+        return None
+    return tables if getattr(tables, 'SIGNATURE', None) == signature else None
+
+def install_tables(cls, rules: list, tables):
+    (name, syms), *productions = tables.PRODUCTIONS
+    cls._grammar = SimpleNamespace(Productions=[
+        Production(0, name, syms),
+        *(
+            Production(number, name, syms, func=rule[0])
+            for number, ((name, syms), rule) in enumerate(zip(productions, rules), 1)
+        ),
+    ])
+    cls._lrtable = SimpleNamespace(
+        lr_action=tables.ACTION, lr_goto=tables.GOTO, defaulted_states=tables.DEFAULTED_STATES
+    )
+
+def build_tables(cls, definitions: list):
+    # the steps of SlyParser._build, which returns early for a class
+    # defining its own _build
+    if not cls._Parser__validate_specification():
+        raise YaccError('Invalid parser specification')
+    cls._Parser__build_grammar([
+        (name, value) for name, value in definitions if callable(value) and hasattr(value, 'rules')
+    ])
+    if not cls._Parser__build_lrtables():
+        raise YaccError('Can\'t build parsing tables')
+
+    if cls.debugfile:
+        with open(cls.debugfile, 'w') as f:
+            f.write(str(cls._grammar))
+            f.write('\n')
+            f.write(str(cls._lrtable))
+
+def format_tables(cls, signature: str) -> str:
+    lines = [
+        '# Generated by matrix_lang_interpreter.lr_tables from the grammar of the',
+        '# Parser, do not edit.  It is rebuilt when the signature does not match.',
+        '',
+        f'SIGNATURE = {signature!r}',
+        '',
+        'PRODUCTIONS = [',
+        *(f'    ({p.name!r}, {tuple(p.prod)!r}),' for p in cls._grammar.Productions),
+        ']',
+    ]
+    for name, table in [
+        ('ACTION', cls._lrtable.lr_action),
+        ('GOTO', cls._lrtable.lr_goto),
+        ('DEFAULTED_STATES', cls._lrtable.defaulted_states),
+    ]:
+        lines += ['', f'{name} = {{', *(f'    {k!r}: {v!r},' for k, v in sorted(table.items())), '}']
+    return '\n'.join(lines) + '\n'
+
+def write_tables(cls, signature: str, filename: str = TABLES_FILE):
+    try:
+        with open(filename + '.tmp', 'w') as file:
+            file.write(format_tables(cls, signature))
+        os.replace(filename + '.tmp', filename)
+    except OSError:
+        # an installed package may be read-only, the tables are rebuilt
+        # on every import then
+        pass
+
+def build(cls, definitions: list):
+    """Gives the parser class the tables of its grammar.
+
+    They are loaded from the generated ``parsetab`` module when its
+    signature (a hash of the tokens, precedence and rules, and of the SLY
+    version) matches the grammar.  Otherwise SLY builds them and the
+    module is written again.
+    """
+    rules = grammar_rules(definitions)
+    signature = grammar_signature(cls, rules)
+    tables = None if cls.debugfile else load_tables(signature)
+    if tables is not None:
+        install_tables(cls, rules, tables)
+    else:
+        build_tables(cls, definitions)
+        write_tables(cls, signature)
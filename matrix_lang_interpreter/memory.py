@@ -1,48 +1,29 @@
-from typing import List, Optional, Dict
-from dataclasses import dataclass
+from typing import List
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes
 
 
-class Memory:
-    def __init__(self):
-        self.mem: Dict[str, any] = {}
+class Frame:
+    """Variables of one scope, stored in the slots computed by the Resolver."""
 
-    def has_key(self, key: str) -> bool:
-        return key in self.mem
+    __slots__ = ('values', 'empty')
 
-    def get(self, key: str) -> any:
-        return self.mem[key]
+    def __init__(self, size: int):
+        self.values: List[any] = [None] * size
+        self.empty = (None,) * size
 
-    def put(self, key: str, value: any):
-        self.mem[key] = value
+    def clear(self):
+        self.values[:] = self.empty
 
-class MemoryStack:
-    def __init__(self, memory: Optional[Memory] = None):
-        self.memories: List[Memory] = []
-        if memory:
-            self.memories.append(memory)
 
-    def has_key(self, key: str) -> bool:
-        for memory in reversed(self.memories):
-            if memory.has_key(key):
-                return True
-        return False
+def allocate_frames(node: AST.AST):
+    """Gives every resolved scope declaring variables its own frame.
 
-    def get(self, key: str) -> any:
-        for memory in reversed(self.memories):
-            if memory.has_key(key):
-                return memory.get(key)
-
-    def insert(self, key: str, value: any):
-        memory = self.memories[-1]
-        memory.put(key, value)
-
-    def set(self, key: str, value: any):
-        for memory in reversed(self.memories):
-            if memory.has_key(key):
-                memory.put(key, value)
-
-    def push(self, memory: Memory):
-        self.memories.append(memory)
-
-    def pop(self) -> Memory:
-        return self.memories.pop()
+    The language has no functions, so a scope is never entered again
+    before it is left and one frame per scope suffices; it is pushed on
+    entry and cleared on exit instead of being allocated every time.
+    Scopes of size 0 get no frame and are not pushed at all.
+    """
+    for child in iter_nodes(node):
+        if getattr(child, 'frame_size', 0):
+            child.frame = Frame(child.frame_size)
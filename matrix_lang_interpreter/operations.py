@@ -0,0 +1,424 @@
+import operator
+import functools
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+
+def isint(x, y) -> bool:
+    return (
+        isinstance(x, int) and isinstance(y, int)
+    ) or (
+        isinstance(x, np.ndarray) and x.dtype == int
+        and
+        isinstance(y, np.ndarray) and y.dtype == int
+    )
+
+def divide(x, y):
+    if isint(x, y):
+        return operator.floordiv(x, y)
+    return operator.truediv(x, y)
+
+def identity(x):
+    return x
+
+def chain_dims(shapes: Sequence[Tuple[int, ...]]) -> Optional[List[int]]:
+    """Dimensions of a chain of matrix products, matrix i being
+    ``dims[i] x dims[i + 1]``.
+
+    The first and the last operand may be vectors, taken as a row and
+    a column.  Returns None when the chain cannot be reassociated.
+    """
+    if any(len(shape) != 2 for shape in shapes[1:-1]):
+        return None
+    if any(len(shape) not in (1, 2) for shape in (shapes[0], shapes[-1])):
+        return None
+    if any(a[-1] != b[0] for a, b in zip(shapes, shapes[1:])):
+        return None
+    first, last = shapes[0], shapes[-1]
+    return [
+        1 if len(first) == 1 else first[0],
+        *(shape[-1] for shape in shapes[:-1]),
+        1 if len(last) == 1 else last[1],
+    ]
+
+@functools.lru_cache(maxsize=256)
+def matmul_order(dims: Tuple[int, ...]) -> Tuple[int, Tuple[Tuple[int, ...], ...]]:
+    """Cheapest parenthesization of a matrix chain (dynamic programming).
+
+    Returns the number of scalar multiplications and ``split``, where the
+    product of matrices i..j is best computed as (i..k) @ (k+1..j) for
+    ``k = split[i][j]``.
+    """
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            cost[i][j] = None
+            for k in range(i, j):
+                c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if cost[i][j] is None or c < cost[i][j]:
+                    cost[i][j], split[i][j] = c, k
+    return cost[0][n - 1], tuple(map(tuple, split))
+
+def left_to_right_cost(dims: Sequence[int]) -> int:
+    return sum(dims[0] * dims[k] * dims[k + 1] for k in range(1, len(dims) - 1))
+
+def associate(operands: list, split, combine, i: int = 0, j: Optional[int] = None):
+    """Combines ``operands[i..j]`` in the order given by ``split``."""
+    j = len(operands) - 1 if j is None else j
+    if i == j:
+        return operands[i]
+    k = split[i][j]
+    return combine(
+        associate(operands, split, combine, i, k),
+        associate(operands, split, combine, k + 1, j)
+    )
+
+def matmul_chain(operands: list):
+    """``operands[0] @ operands[1] @ ...`` in the cheapest order for the
+    actual shapes, left to right unless another order is strictly cheaper."""
+    dims = chain_dims([np.shape(operand) for operand in operands])
+    if dims is not None:
+        cost, split = matmul_order(tuple(dims))
+        if cost < left_to_right_cost(dims):
+            return associate(operands, split, np.matmul)
+    return functools.reduce(np.matmul, operands)
+
+def build_vector(elements):
+    if len(elements) == 0:
+        return np.array([], dtype=int)
+
+    if isinstance(elements[0], np.ndarray):
+        return np.vstack(elements)
+
+    return np.hstack(elements)
+
+def fill_vector(elements: list, shape: Tuple[int, ...]):
+    """build_vector of numbers or of rows of numbers, written into a single
+    array of the shape the type checker inferred instead of stacked.
+
+    The inferred sizes are static, elements which turn out to have
+    another shape are stacked by build_vector, which reports them.
+    """
+    if len(elements) != shape[0]:
+        return build_vector(elements)
+    if len(shape) == 1:
+        if any(isinstance(element, np.ndarray) for element in elements):
+            return build_vector(elements)
+        dtypes = set(map(type, elements))
+    else:
+        if not all(isinstance(element, np.ndarray) and element.shape == shape[1:] for element in elements):
+            return build_vector(elements)
+        dtypes = {element.dtype for element in elements}
+    dtype = np.result_type(*dtypes)
+    if dtype.kind not in 'biuf':
+        return build_vector(elements)
+    out = np.empty(shape, dtype)
+    try:
+        if len(shape) == 1:
+            out[:] = elements
+        else:
+            for i, element in enumerate(elements):
+                out[i] = element
+    except OverflowError:
+        # Python ints beyond int64, which stacking keeps as objects
+        return build_vector(elements)
+    return out
+
+def shared(value) -> bool:
+    """Whether the value is a read-only array, which more than one name may
+    hold (or every evaluation of a constant literal), so that a write has
+    to copy it first."""
+    return isinstance(value, np.ndarray) and not value.flags.writeable
+
+def share(value):
+    """Marks an array which another name gets read-only, together with the
+    arrays it is a view of, and returns it.
+
+    Arrays are assigned by reference and copied only by the first element
+    assignment through one of the names, which gives them value semantics
+    without copying on every assignment.  A name which is the last holder
+    of a shared array copies it once more.
+    """
+    array = value
+    while isinstance(array, np.ndarray):
+        array.flags.writeable = False
+        array = array.base
+    return value
+
+
+BINARY_OPERATIONS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': divide,
+    '@': np.matmul,
+}
+
+UNARY_OPERATIONS = {
+    '+': identity,
+    '-': operator.neg,
+}
+
+RELATION_OPERATIONS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<':  operator.lt,
+    '<=': operator.le,
+    '>':  operator.gt,
+    '>=': operator.ge,
+}
+
+TERM_OPERATIONS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '//': operator.floordiv,
+}
+
+# iterations evaluated at once by reduce_range, bounds its memory use
+REDUCTION_BLOCK = 1 << 16
+
+# int64 results are trusted only below this magnitude
+INT_LIMIT = 2 ** 62
+
+
+class Unvectorizable(Exception):
+    """Raised when numpy would not compute what the scalar loop does."""
+
+
+def is_int(x) -> bool:
+    return type(x) is int or (isinstance(x, np.ndarray) and x.dtype.kind == 'i')
+
+def evaluate_term(program: tuple, k, args: list):
+    """Value of a term program of a vectorized loop at iteration ``k``.
+
+    ``k`` is either an int or an array of iterations.  A program is a
+    nested tuple: ``('const', value)``, ``('arg', index)`` for a loop
+    invariant value, ``('affine', start, step, offset)`` for the value
+    ``args[start] + step * (k + offset)`` of an induction variable,
+    ``('neg', program)`` and ``(op, left, right)`` for an operator of
+    TERM_OPERATIONS.
+    """
+    kind = program[0]
+    if kind == 'const':
+        return program[1]
+    if kind == 'arg':
+        return args[program[1]]
+    if kind == 'affine':
+        _, start, step, offset = program
+        step = evaluate_term(step, 0, args)
+        if isinstance(k, np.ndarray) and abs(args[start]) + abs(step) * (k[-1] + offset) >= INT_LIMIT:
+            raise Unvectorizable()
+        return args[start] + step * (k + offset)
+    if kind == 'neg':
+        return -evaluate_term(program[1], k, args)
+
+    left = evaluate_term(program[1], k, args)
+    right = evaluate_term(program[2], k, args)
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        if kind in ('/', '//') and np.any(right == 0):
+            raise Unvectorizable()
+        if kind in ('+', '-', '*') and is_int(left) and is_int(right):
+            estimate = TERM_OPERATIONS[kind](np.asarray(left, float), np.asarray(right, float))
+            if np.max(np.abs(estimate)) >= INT_LIMIT:
+                raise Unvectorizable()
+    return TERM_OPERATIONS[kind](left, right)
+
+def combine(op: str, acc, terms: np.ndarray, exact: bool):
+    if is_int(acc) and is_int(terms):
+        magnitude = np.abs(terms.astype(float))
+        if op == '+' and abs(acc) + magnitude.sum() < INT_LIMIT:
+            return acc + int(terms.sum())
+        if op == '*' and abs(acc) * magnitude.prod() < INT_LIMIT:
+            return acc * int(terms.prod())
+        raise Unvectorizable()
+
+    terms = terms.astype(float)
+    ufunc = np.add if op == '+' else np.multiply
+    if exact:
+        # accumulate is a sequential scan, the same order as the loop
+        return ufunc.accumulate(np.concatenate(([acc], terms)))[-1].item()
+    return (ufunc(acc, ufunc.reduce(terms))).item()
+
+def reduce_scalar(op: str, program: tuple, args: list, acc, first: int, count: int):
+    for k in range(first, count):
+        term = evaluate_term(program, k, args)
+        acc = acc + term if op == '+' else acc * term
+    return acc
+
+def reduce_range(op: str, program: tuple, exact: bool, args: list):
+    """Value of ``acc`` after ``for i = beg:end { acc = acc op term; }``.
+
+    ``args`` starts with ``beg``, ``end`` and the initial ``acc``.  Terms
+    are computed with numpy, REDUCTION_BLOCK iterations at a time, and
+    summed pairwise unless ``exact`` asks for the sequential order of the
+    loop.  Iterations numpy cannot reproduce (int64 overflow, division by
+    zero) are run one by one with Python numbers.
+    """
+    beg, end, acc = args[:3]
+    count = end - beg
+    if count <= 0:
+        return acc
+    if program[0] in ('const', 'arg') and op == '+' and is_int(acc):
+        term = evaluate_term(program, 0, args)
+        if is_int(term):
+            return acc + term * count
+    if any(is_int(arg) and abs(arg) >= INT_LIMIT for arg in args):
+        return reduce_scalar(op, program, args, acc, 0, count)
+
+    for first in range(0, count, REDUCTION_BLOCK):
+        k = np.arange(first, min(first + REDUCTION_BLOCK, count))
+        try:
+            terms = np.broadcast_to(evaluate_term(program, k, args), k.shape)
+            acc = combine(op, acc, terms, exact)
+        except Unvectorizable:
+            break
+    else:
+        return acc
+    # outside the handler, so errors of the loop are not chained to Unvectorizable
+    return reduce_scalar(op, program, args, acc, first, count)
+
+def nest_region(array: np.ndarray, index: tuple, ranges: list, args: list) -> Optional[tuple]:
+    """Slices of ``array`` holding the elements an index of a loop nest
+    reaches, and the loop axis of every sliced dimension, or None when
+    an element indexing would not be the same as slicing."""
+    if not isinstance(array, np.ndarray) or array.dtype.kind not in 'biuf' or array.ndim != len(index):
+        return None
+    slices, axes = [], []
+    for entry, size in zip(index, array.shape):
+        offset = evaluate_term(entry[-1], 0, args)
+        if not is_int(offset) and not isinstance(offset, np.integer):
+            return None
+        if entry[0] == 'axis':
+            beg, end = ranges[entry[1]]
+            # a negative index would wrap around, a slice would not
+            if beg + offset < 0 or end + offset > size:
+                return None
+            slices.append(slice(beg + offset, end + offset))
+            axes.append(entry[1])
+        else:
+            if not -size <= offset < size:
+                return None
+            slices.append(int(offset))
+    return tuple(slices), axes
+
+def int_magnitude(program: tuple, ranges: list, args: list) -> Optional[int]:
+    """Bound of the magnitude of a value program computed with Python ints,
+    None for values numpy computes anyway."""
+    kind = program[0]
+    if kind in ('const', 'arg'):
+        value = program[1] if kind == 'const' else args[program[1]]
+        return abs(value) if type(value) is int else None
+    if kind == 'axis':
+        beg, end = ranges[program[1]]
+        return max(abs(beg), abs(end))
+    if kind == 'ref':
+        return None
+    if kind == 'neg':
+        return int_magnitude(program[1], ranges, args)
+
+    left = int_magnitude(program[1], ranges, args)
+    right = int_magnitude(program[2], ranges, args)
+    if left is None or right is None:
+        return None
+    magnitude = left * right if kind == '*' else left + right
+    if magnitude >= INT_LIMIT:
+        raise Unvectorizable()
+    return magnitude
+
+def evaluate_nest(program: tuple, grids: list, regions: dict, args: list):
+    """Value of a value program of a loop nest for all iterations at once,
+    broadcastable to the shape of the iteration space."""
+    kind = program[0]
+    if kind == 'const':
+        return program[1]
+    if kind == 'arg':
+        return args[program[1]]
+    if kind == 'axis':
+        return grids[program[1]]
+    if kind == 'ref':
+        slices, axes = regions[program]
+        shape = [1] * len(grids)
+        for axis in axes:
+            shape[axis] = grids[axis].size
+        return args[program[1]][slices].transpose(np.argsort(axes)).reshape(shape)
+    if kind == 'neg':
+        return -evaluate_nest(program[1], grids, regions, args)
+    left = evaluate_nest(program[1], grids, regions, args)
+    right = evaluate_nest(program[2], grids, regions, args)
+    return TERM_OPERATIONS[kind](left, right)
+
+def nest_refs(program: tuple):
+    if program[0] == 'ref':
+        yield program
+    elif program[0] not in ('const', 'arg', 'axis'):
+        for child in program[1:]:
+            yield from nest_refs(child)
+
+def assign_nest(program: tuple, args: list) -> bool:
+    """Runs a nest of for loops assigning matrix elements as whole-array
+    numpy assignments.
+
+    ``program`` is ``(depth, writes)``, the loops' bounds are the first
+    ``2 * depth`` args.  Every write ``(array, index, value)`` stands for
+    ``args[array][index] = value`` in the innermost loop.  An index has an
+    entry per dimension, either ``('axis', axis, offset)`` for the loop
+    variable of the axis plus an offset or ``('at', offset)``; offsets are
+    term programs of evaluate_term.  Value programs are term programs
+    which also have ``('axis', axis)`` and ``('ref', array, index)``.
+
+    The iterations must be independent; this is checked ahead of time,
+    except for what only the values tell.  When a write or read would
+    not index the same elements as the loops, the arrays share memory,
+    Python ints would outgrow int64 or a written array is a shared
+    constant, nothing is written and False is returned, so that the
+    caller runs the loops instead.
+    """
+    depth, writes = program
+    ranges = [(args[2 * axis], args[2 * axis + 1]) for axis in range(depth)]
+    if not all(type(beg) is int and type(end) is int for beg, end in ranges):
+        return False
+    if any(end <= beg for beg, end in ranges):
+        return True
+
+    refs = [(array, index) for array, index, _ in writes]
+    refs += [(ref[1], ref[2]) for _, _, value in writes for ref in nest_refs(value)]
+    regions = {}
+    for array, index in refs:
+        region = nest_region(args[array], index, ranges, args)
+        if region is None:
+            return False
+        regions['ref', array, index] = region
+
+    written = {array for array, _, _ in writes}
+    if any(shared(args[array]) for array in written):
+        # the loops copy it on their first write
+        return False
+    arrays = {array for array, _ in refs}
+    if any(
+        np.may_share_memory(args[array], args[other])
+        for array in written for other in arrays if other != array
+    ):
+        return False
+
+    try:
+        for _, _, value in writes:
+            int_magnitude(value, ranges, args)
+    except Unvectorizable:
+        return False
+
+    grids = np.meshgrid(*[np.arange(beg, end) for beg, end in ranges], indexing='ij', sparse=True)
+    shape = tuple(end - beg for beg, end in ranges)
+    for array, index, value in writes:
+        slices, axes = regions['ref', array, index]
+        values = np.broadcast_to(evaluate_nest(value, grids, regions, args), shape)
+        target = args[array]
+        if target.dtype.kind in 'iu' and values.dtype.kind == 'f' and not np.isfinite(values).all():
+            # numpy would store garbage, the loop fails on the first of them
+            target[slices][(0,) * len(axes)] = values[~np.isfinite(values)][0].item()
+        target[slices] = values.transpose(axes)
+    return True
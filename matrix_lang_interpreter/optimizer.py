@@ -0,0 +1,987 @@
+import copy
+import math
+import time
+from collections import defaultdict
+from functools import partial
+from typing import List, Dict, Set, Optional, Tuple
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes, first_lineno, deep_recursion
+from matrix_lang_interpreter.operations import (
+    BINARY_OPERATIONS, UNARY_OPERATIONS, RELATION_OPERATIONS,
+    chain_dims, matmul_order, associate
+)
+
+
+def constant(value, lineno: int) -> Optional[AST.Num]:
+    if type(value) is int:
+        return AST.IntNum(value, lineno)
+    if type(value) is float:
+        return AST.FloatNum(value, lineno)
+    return None
+
+def is_constant(node: AST.Node) -> bool:
+    return isinstance(node, (AST.IntNum, AST.FloatNum))
+
+def same_constant(a: AST.Num, b: AST.Num) -> bool:
+    return type(a) is type(b) and repr(a.n) == repr(b.n)
+
+def terminates(stmt: AST.Stmt) -> bool:
+    """Whether control never reaches the statement following ``stmt``."""
+    if isinstance(stmt, (AST.Break, AST.Continue, AST.Return)):
+        return True
+    if isinstance(stmt, AST.Block):
+        return bool(stmt.stmt_set) and terminates(stmt.stmt_set[-1])
+    if isinstance(stmt, AST.IfElseStmt):
+        return terminates(stmt.stmt) and terminates(stmt.elseStmt)
+    return False
+
+def assigned_names(node: AST.Node) -> Set[str]:
+    return {
+        child.lvalue.id if isinstance(child.lvalue, AST.Id) else child.lvalue.term.id
+        for child in iter_nodes(node)
+        if isinstance(child, AST.AssignStmt)
+    } | {
+        child.id.id for child in iter_nodes(node) if isinstance(child, AST.ForLoop)
+    }
+
+def scalar_type(node: AST.Expr, scalars: Dict[str, str]) -> Optional[str]:
+    """'int' or 'float' when the expression always evaluates to a Python number."""
+    if isinstance(node, AST.IntNum):
+        return 'int'
+    if isinstance(node, AST.FloatNum):
+        return 'float'
+    if isinstance(node, AST.Id):
+        return scalars.get(node.id)
+    if isinstance(node, AST.UnExpr):
+        return scalar_type(node.child, scalars)
+    if isinstance(node, AST.BinExpr) and not isinstance(node, AST.MatMulBinExpr):
+        left = scalar_type(node.left, scalars)
+        right = scalar_type(node.right, scalars)
+        if left and right:
+            return 'int' if left == right == 'int' else 'float'
+    return None
+
+def python_scalars(node: AST.Node) -> Dict[str, str]:
+    """Variables only ever holding Python numbers, with their types.
+
+    Candidates are the names the type checker typed as a single scalar
+    type; a candidate is kept only while every value assigned to it is
+    a Python number of that type.
+    """
+    definitions: Dict[str, List[Optional[AST.Expr]]] = defaultdict(list)
+    types: Dict[str, set] = defaultdict(set)
+    for child in iter_nodes(node):
+        if isinstance(child, AST.AssignStmt) and isinstance(child.lvalue, AST.Id):
+            lvalue = child.lvalue
+            definitions[lvalue.id].append(child.expr)
+            types[lvalue.id].add((getattr(lvalue, 'type', None), getattr(lvalue, 'shape', None)))
+        elif isinstance(child, AST.AssignStmt):
+            definitions[child.lvalue.term.id].append(None)
+        elif isinstance(child, AST.ForLoop):
+            definitions[child.id.id].append(child.beg)
+            types[child.id.id].add(('int', ()))
+
+    scalars = {}
+    for name, pairs in types.items():
+        if len(pairs) == 1:
+            [(type, shape)] = pairs
+            if type in ('int', 'float') and shape == ():
+                scalars[name] = type
+
+    changed = True
+    while changed:
+        changed = False
+        for name in list(scalars):
+            if any(
+                expr is None or scalar_type(expr, scalars) != scalars[name]
+                for expr in definitions[name]
+            ):
+                del scalars[name]
+                changed = True
+    return scalars
+
+
+class Pass:
+    """Rewrites the AST in place.
+
+    ``visit_X`` methods return the replacement of the node; a statement
+    visitor returning None removes the statement.
+    """
+
+    name = ''
+
+    def run(self, node: AST.AST) -> AST.AST:
+        return self.visit(node)
+
+    def visit(self, node):
+        method = 'visit_' + node.__class__.__name__
+        visitor = getattr(self, method, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        for field, value in vars(node).items():
+            if isinstance(value, list):
+                setattr(node, field, self.visit_list(value))
+            elif isinstance(value, AST.Node):
+                new = self.visit(value)
+                setattr(node, field, AST.Block([]) if new is None else new)
+        return node
+
+    def visit_list(self, nodes: list) -> list:
+        result = []
+        for node in nodes:
+            if isinstance(node, AST.Node):
+                node = self.visit(node)
+            if node is not None:
+                result.append(node)
+        return result
+
+
+class ConstantFolding(Pass):
+    """Evaluates arithmetic on numeric literals and prunes if/while
+    statements whose condition is known."""
+
+    name = 'constant-folding'
+
+    def truth(self, cond: AST.Expr) -> Optional[bool]:
+        if (
+            isinstance(cond, AST.RelationExpr)
+            and is_constant(cond.left) and is_constant(cond.right)
+        ):
+            return bool(RELATION_OPERATIONS[cond.op](cond.left.n, cond.right.n))
+        return None
+
+    def visit_BinExpr(self, node: AST.BinExpr) -> AST.Expr:
+        self.generic_visit(node)
+        if is_constant(node.left) and is_constant(node.right):
+            try:
+                value = BINARY_OPERATIONS[node.op](node.left.n, node.right.n)
+            except ArithmeticError:
+                return node
+            return constant(value, first_lineno(node)) or node
+        return node
+
+    def visit_MatMulBinExpr(self, node: AST.MatMulBinExpr) -> AST.Expr:
+        return self.generic_visit(node)
+
+    def visit_UnExpr(self, node: AST.UnExpr) -> AST.Expr:
+        self.generic_visit(node)
+        if node.op == '+':
+            return node.child
+        if is_constant(node.child):
+            value = UNARY_OPERATIONS[node.op](node.child.n)
+            return constant(value, first_lineno(node)) or node
+        return node
+
+    def visit_IfStmt(self, node: AST.IfStmt) -> Optional[AST.Stmt]:
+        node.cond = self.visit(node.cond)
+        truth = self.truth(node.cond)
+        if truth is None:
+            return self.generic_visit(node)
+        if truth:
+            return self.visit(AST.Block([node.stmt]))
+        if isinstance(node, AST.IfElseStmt):
+            return self.visit(AST.Block([node.elseStmt]))
+        return None
+
+    visit_IfElseStmt = visit_IfStmt
+
+    def visit_WhileLoop(self, node: AST.WhileLoop) -> Optional[AST.Stmt]:
+        node.cond = self.visit(node.cond)
+        if self.truth(node.cond) is False:
+            return None
+        return self.generic_visit(node)
+
+
+class ConstantPropagation(ConstantFolding):
+    """Replaces reads of variables holding a known number with the number,
+    folding the expressions as it goes.
+
+    Knowledge is tracked by name along the structured control flow: both
+    branches of an if have to agree on a value, and variables assigned
+    anywhere in a loop are unknown inside and after it.
+    """
+
+    name = 'constant-propagation'
+
+    def __init__(self):
+        self.env: Dict[str, AST.Num] = {}
+        self.scopes: List[Set[str]] = []
+
+    def run(self, node: AST.AST) -> AST.AST:
+        self.env = {}
+        self.scopes = [set()]
+        return self.generic_visit(node)
+
+    def declare(self, name: str):
+        if not any(name in scope for scope in self.scopes):
+            self.scopes[-1].add(name)
+
+    def kill(self, names: Set[str]):
+        for name in names:
+            self.env.pop(name, None)
+
+    def scoped(self, stmt: AST.Stmt, *declared: str) -> AST.Stmt:
+        self.scopes.append(set(declared))
+        stmt = self.visit(stmt)
+        self.kill(self.scopes.pop())
+        return AST.Block([]) if stmt is None else stmt
+
+    def meet(self, a: Dict[str, AST.Num], b: Dict[str, AST.Num]) -> Dict[str, AST.Num]:
+        return {
+            name: value for name, value in a.items()
+            if name in b and same_constant(value, b[name])
+        }
+
+    def visit_Block(self, node: AST.Block) -> AST.Stmt:
+        self.scopes.append(set())
+        node.stmt_set = self.visit_list(node.stmt_set)
+        self.kill(self.scopes.pop())
+        return node
+
+    def visit_AssignStmt(self, node: AST.AssignStmt) -> AST.Stmt:
+        node.expr = self.visit(node.expr)
+        if isinstance(node.lvalue, AST.Ref):
+            node.lvalue.idxs = self.visit(node.lvalue.idxs)
+            self.kill({node.lvalue.term.id})
+            return node
+
+        name = node.lvalue.id
+        self.declare(name)
+        if is_constant(node.expr):
+            self.env[name] = node.expr
+        else:
+            self.env.pop(name, None)
+        return node
+
+    def visit_IfStmt(self, node: AST.IfStmt) -> Optional[AST.Stmt]:
+        node.cond = self.visit(node.cond)
+        truth = self.truth(node.cond)
+        if truth is not None:
+            if truth:
+                return self.visit(AST.Block([node.stmt]))
+            if isinstance(node, AST.IfElseStmt):
+                return self.visit(AST.Block([node.elseStmt]))
+            return None
+
+        before = dict(self.env)
+        node.stmt = self.scoped(node.stmt)
+        if isinstance(node, AST.IfElseStmt):
+            after, self.env = self.env, before
+            node.elseStmt = self.scoped(node.elseStmt)
+            self.env = self.meet(after, self.env)
+        else:
+            self.env = self.meet(before, self.env)
+        return node
+
+    visit_IfElseStmt = visit_IfStmt
+
+    def visit_WhileLoop(self, node: AST.WhileLoop) -> Optional[AST.Stmt]:
+        self.kill(assigned_names(node.stmt))
+        node.cond = self.visit(node.cond)
+        if self.truth(node.cond) is False:
+            return None
+
+        before = dict(self.env)
+        node.stmt = self.scoped(node.stmt)
+        self.env = before
+        return node
+
+    def visit_ForLoop(self, node: AST.ForLoop) -> AST.Stmt:
+        node.beg = self.visit(node.beg)
+        node.end = self.visit(node.end)
+        self.kill(assigned_names(node))
+
+        before = dict(self.env)
+        node.stmt = self.scoped(node.stmt, node.id.id)
+        self.env = before
+        return node
+
+    def visit_Id(self, node: AST.Id) -> AST.Expr:
+        if node.id in self.env:
+            value = copy.copy(self.env[node.id])
+            value.lineno = node.lineno
+            return value
+        return node
+
+
+class UnreachableCode(Pass):
+    """Drops statements following a break, continue or return."""
+
+    name = 'unreachable-code'
+
+    def visit_list(self, nodes: list) -> list:
+        result = super().visit_list(nodes)
+        for i, node in enumerate(result):
+            if isinstance(node, AST.Stmt) and terminates(node):
+                return result[:i + 1]
+        return result
+
+
+class DeadCodeElimination(Pass):
+    """Drops assignments to variables which are never read.
+
+    Only assignments whose value cannot fail to evaluate are dropped, so
+    removing them never hides a runtime error.
+    """
+
+    name = 'dead-code-elimination'
+
+    def __init__(self):
+        self.read: Set[str] = set()
+
+    def run(self, node: AST.AST) -> AST.AST:
+        while True:
+            self.read = self.read_names(node)
+            size = sum(1 for _ in iter_nodes(node))
+            self.visit(node)
+            if sum(1 for _ in iter_nodes(node)) == size:
+                return node
+
+    @staticmethod
+    def read_names(node: AST.Node) -> Set[str]:
+        # ``x += e`` uses one Id as both the lvalue and the left operand
+        operands = {
+            id(operand) for child in iter_nodes(node)
+            if isinstance(child, AST.AssignStmt)
+            for operand in iter_nodes(child.expr)
+        }
+        written = {
+            id(child.lvalue) for child in iter_nodes(node)
+            if isinstance(child, AST.AssignStmt)
+        } | {
+            id(child.id) for child in iter_nodes(node)
+            if isinstance(child, AST.ForLoop)
+        }
+        written -= operands
+        return {
+            child.id for child in iter_nodes(node)
+            if isinstance(child, AST.Id) and id(child) not in written
+        }
+
+    @staticmethod
+    def pure(expr: AST.Expr) -> bool:
+        if isinstance(expr, AST.Vector):
+            return all(isinstance(child, AST.Num) for child in expr.expr_set)
+        return isinstance(expr, (AST.Num, AST.String, AST.Id, AST.Matrix))
+
+    def visit_AssignStmt(self, node: AST.AssignStmt) -> Optional[AST.Stmt]:
+        if (
+            isinstance(node.lvalue, AST.Id)
+            and node.lvalue.id not in self.read
+            and self.pure(node.expr)
+        ):
+            return None
+        return node
+
+
+class MatrixChainOrder(Pass):
+    """Reassociates chains of ``@`` to need the fewest scalar multiplications.
+
+    Shapes are the ones annotated by the type checker.  They are trusted
+    only for operands reading variables which are always assigned values
+    of a single shape; a chain with an operand of untrusted shape becomes
+    a ``MatMulChain`` choosing the order at runtime instead.
+    """
+
+    name = 'matrix-chain-order'
+
+    def __init__(self):
+        self.trusted: Set[str] = set()
+
+    def run(self, node: AST.AST) -> AST.AST:
+        shapes: Dict[str, set] = {}
+        for child in iter_nodes(node):
+            if isinstance(child, AST.AssignStmt) and isinstance(child.lvalue, AST.Id):
+                shapes.setdefault(child.lvalue.id, set()).add(getattr(child.lvalue, 'shape', None))
+            elif isinstance(child, AST.ForLoop):
+                shapes.setdefault(child.id.id, set()).add(())
+        self.trusted = {
+            name for name, assigned in shapes.items()
+            if len(assigned) == 1 and None not in assigned
+        }
+        return self.visit(node)
+
+    def shape(self, node: AST.Expr) -> Optional[Tuple[int, ...]]:
+        if any(
+            isinstance(child, AST.Id) and child.id not in self.trusted
+            for child in iter_nodes(node)
+        ):
+            return None
+        shape = getattr(node, 'shape', None)
+        # slices with computed bounds leave dims unknown
+        return None if shape is None or None in shape else shape
+
+    def cost(self, node: AST.Expr) -> int:
+        if not isinstance(node, AST.MatMulBinExpr):
+            return 0
+        a, b, c = chain_dims([node.left.shape, node.right.shape])
+        return self.cost(node.left) + self.cost(node.right) + a * b * c
+
+    def visit_operands(self, node: AST.Expr) -> AST.Expr:
+        if isinstance(node, AST.MatMulBinExpr):
+            node.left = self.visit_operands(node.left)
+            node.right = self.visit_operands(node.right)
+            return node
+        return self.visit(node)
+
+    @staticmethod
+    def operands(node: AST.Expr) -> List[AST.Expr]:
+        if isinstance(node, AST.MatMulBinExpr):
+            return MatrixChainOrder.operands(node.left) + MatrixChainOrder.operands(node.right)
+        return [node]
+
+    def visit_MatMulBinExpr(self, node: AST.MatMulBinExpr) -> AST.Expr:
+        node = self.visit_operands(node)
+        operands = self.operands(node)
+        if len(operands) < 3:
+            return node
+
+        shapes = [self.shape(operand) for operand in operands]
+        if None in shapes:
+            return AST.MatMulChain(operands)
+
+        dims = chain_dims(shapes)
+        if dims is None:
+            return node
+        cost, split = matmul_order(tuple(dims))
+        if cost < self.cost(node):
+            return associate(operands, split, partial(AST.MatMulBinExpr, '@'))
+        return node
+
+
+class LoopInvariantCodeMotion(Pass):
+    """Computes matrix expressions which do not change inside a loop once,
+    before the loop.
+
+    An expression is invariant when none of the variables it reads is
+    assigned anywhere in the loop.  Only expressions evaluated on every
+    iteration are hoisted: those in statements preceding any break,
+    continue or return, descending into blocks, into ifs and for loops
+    whose condition or bounds are invariant too.  Such conditions guard
+    the hoisted computation, together with the loop's own entry
+    condition, so nothing is computed for a loop which does not run.
+
+    The loop is wrapped in a block declaring the temporaries::
+
+        { $licm1 = 0; if (beg < end) $licm1 = expr; for i = beg:end ... }
+
+    Loops containing an indexed assignment are left alone, as arrays may
+    be mutated through another name.  When the program mutates arrays
+    anywhere, an expression whose value would be stored in a variable is
+    not hoisted either, so that iterations keep getting distinct arrays.
+    """
+
+    name = 'loop-invariant-code-motion'
+
+    PREFIX = '$licm'
+
+    def __init__(self):
+        self.counter = 0
+        self.mutates = False
+        self.assigned: Set[str] = set()
+        self.guards: List[AST.Expr] = []
+        self.hoisted: List[Tuple[str, AST.Expr, List[AST.Expr]]] = []
+
+    def run(self, node: AST.AST) -> AST.AST:
+        self.counter = 0
+        self.mutates = any(
+            isinstance(child, AST.AssignStmt) and isinstance(child.lvalue, AST.Ref)
+            for child in iter_nodes(node)
+        )
+        return self.visit(node)
+
+    def visit_WhileLoop(self, node: AST.WhileLoop) -> AST.Stmt:
+        self.generic_visit(node)
+        return self.hoist(node, node.stmt, copy.deepcopy(node.cond))
+
+    def visit_ForLoop(self, node: AST.ForLoop) -> AST.Stmt:
+        self.generic_visit(node)
+        guard = AST.RelationExpr('<', copy.deepcopy(node.beg), copy.deepcopy(node.end))
+        return self.hoist(node, node.stmt, guard)
+
+    def hoist(self, loop: AST.Stmt, body: AST.Stmt, guard: AST.Expr) -> AST.Stmt:
+        if any(
+            isinstance(child, AST.AssignStmt) and isinstance(child.lvalue, AST.Ref)
+            for child in iter_nodes(body)
+        ):
+            return loop
+
+        self.assigned = assigned_names(loop)
+        self.guards = []
+        self.hoisted = []
+        self.stmt(body)
+        if not self.hoisted:
+            return loop
+
+        stmts = []
+        for name, expr, guards in self.hoisted:
+            stmts.append(AST.AssignStmt(AST.Id(name), AST.IntNum(0)))
+            stmt = AST.AssignStmt(AST.Id(name), expr)
+            for cond in reversed([guard, *guards]):
+                stmt = AST.IfStmt(cond, stmt)
+            stmts.append(stmt)
+        return AST.Block([*stmts, loop])
+
+    def invariant(self, node: AST.Node) -> bool:
+        return not any(
+            isinstance(child, AST.Id) and child.id in self.assigned
+            for child in iter_nodes(node)
+        )
+
+    def expensive(self, node: AST.Expr) -> bool:
+        if isinstance(node, (
+            AST.MatMulBinExpr, AST.MatMulChain, AST.MatTransExpr, AST.Vector, AST.SpecialMatrix
+        )):
+            return True
+        if isinstance(node, AST.Ref):
+            return self.expensive(node.term) or any(map(self.expensive, node.idxs.expr_set))
+        return any(
+            self.expensive(value) for value in vars(node).values()
+            if isinstance(value, AST.Expr)
+        )
+
+    def stmts(self, stmts: List[AST.Stmt]):
+        for stmt in stmts:
+            self.stmt(stmt)
+            if any(
+                isinstance(child, (AST.Break, AST.Continue, AST.Return))
+                for child in iter_nodes(stmt)
+            ):
+                return
+
+    def stmt(self, node: AST.Stmt):
+        if isinstance(node, AST.Block):
+            self.stmts(node.stmt_set)
+        elif isinstance(node, AST.AssignStmt):
+            escapes = not node.lvalue.id.startswith(self.PREFIX)
+            node.expr = self.expr(node.expr, escapes)
+        elif isinstance(node, (AST.Print, AST.Return)):
+            node.expr_set = [self.expr(expr) for expr in node.expr_set]
+        elif isinstance(node, AST.IfStmt):
+            node.cond = self.expr(node.cond)
+            if self.invariant(node.cond):
+                self.guarded(copy.deepcopy(node.cond), node.stmt)
+        elif isinstance(node, AST.WhileLoop):
+            node.cond = self.expr(node.cond)
+        elif isinstance(node, AST.ForLoop):
+            node.beg = self.expr(node.beg)
+            node.end = self.expr(node.end)
+            if self.invariant(node.beg) and self.invariant(node.end):
+                guard = AST.RelationExpr('<', copy.deepcopy(node.beg), copy.deepcopy(node.end))
+                self.guarded(guard, node.stmt)
+
+    def guarded(self, guard: AST.Expr, stmt: AST.Stmt):
+        self.guards.append(guard)
+        self.stmt(stmt)
+        self.guards.pop()
+
+    def expr(self, node: AST.Expr, escapes: bool = False) -> AST.Expr:
+        """Replaces the largest hoistable subexpressions with temporaries.
+
+        ``escapes`` tells whether the value of ``node`` may end up stored
+        in a variable, either itself or through a view.
+        """
+        if self.invariant(node):
+            if not self.expensive(node):
+                return node
+            if not escapes or not self.mutates:
+                self.counter += 1
+                name = f'{self.PREFIX}{self.counter}'
+                self.hoisted.append((name, node, list(self.guards)))
+                return AST.Id(name, first_lineno(node))
+
+        if isinstance(node, AST.Ref):
+            node.term = self.expr(node.term, escapes)
+            node.idxs.expr_set = [self.expr(expr) for expr in node.idxs.expr_set]
+        elif isinstance(node, (AST.Zeros, AST.Ones)):
+            node.size.expr_set = [self.expr(expr) for expr in node.size.expr_set]
+        elif isinstance(node, AST.MatTransExpr):
+            node.child = self.expr(node.child, escapes)
+        elif isinstance(node, AST.UnExpr):
+            node.child = self.expr(node.child, escapes and node.op == '+')
+        elif isinstance(node, (AST.Vector, AST.MatMulChain)):
+            node.expr_set = [self.expr(expr) for expr in node.expr_set]
+        else:
+            for field, value in vars(node).items():
+                if isinstance(value, AST.Expr):
+                    setattr(node, field, self.expr(value))
+        return node
+
+
+class ReductionVectorizer(Pass):
+    """Replaces for loops accumulating numbers by numpy reductions.
+
+    A loop qualifies when its bounds are ints and its body is nothing but
+    assignments of Python numbers (see python_scalars), each variable
+    assigned once, of two kinds:
+
+    - induction variables ``n = n + c`` or ``n = n - c``, with ``c`` an
+      invariant int, so that n is affine in the iteration number,
+    - reductions ``s = s + term``, ``s = s - term`` or ``s = s * term``,
+      where ``term`` is arithmetic on numbers, invariant variables, the
+      loop variable and induction variables, and ``s`` is read nowhere
+      else in the loop.
+
+    Each of these variables then gets its final value from a RangeReduce
+    evaluated by ``reduce_range``, reductions first::
+
+        for i = a:b { s += 4.0 / n; n += 4; }
+        =>  { s = REDUCE(+, 4.0 / (n + 4 * k), a, b, s, ...); n = REDUCE(+, 4, a, b, n); }
+
+    Float sums are pairwise unless ``exact`` is set.  The loop variable
+    must not shadow another variable, its final value would be visible.
+    """
+
+    name = 'reduction-vectorizer'
+
+    def __init__(self, exact: bool = False):
+        self.exact = exact
+        self.scalars: Dict[str, str] = {}
+        self.assigned: Set[str] = set()
+        self.loops: List[str] = []
+        self.var = ''
+        self.inductions: Dict[str, Tuple[int, AST.Expr]] = {}
+        self.reductions: Set[str] = set()
+
+    def run(self, node: AST.AST) -> AST.AST:
+        self.scalars = python_scalars(node)
+        self.assigned = {
+            child.lvalue.id for child in iter_nodes(node)
+            if isinstance(child, AST.AssignStmt) and isinstance(child.lvalue, AST.Id)
+        }
+        self.loops = []
+        return self.visit(node)
+
+    def visit_ForLoop(self, node: AST.ForLoop) -> AST.Stmt:
+        self.loops.append(node.id.id)
+        self.generic_visit(node)
+        self.loops.pop()
+        return self.vectorize(node) or node
+
+    def vectorize(self, node: AST.ForLoop) -> Optional[AST.Stmt]:
+        var = node.id.id
+        if var in self.assigned or var in self.loops:
+            return None
+        if scalar_type(node.beg, self.scalars) != 'int' or scalar_type(node.end, self.scalars) != 'int':
+            return None
+
+        stmts = node.stmt.stmt_set if isinstance(node.stmt, AST.Block) else [node.stmt]
+        updates = [self.update(stmt) for stmt in stmts]
+        if not updates or None in updates:
+            return None
+        names = [name for name, _, _ in updates]
+        body = set(names)
+        if len(body) != len(names) or var in body or any(
+            isinstance(child, AST.Id) and child.id in body
+            for child in iter_nodes([node.beg, node.end])
+        ):
+            return None
+
+        self.var = var
+        self.inductions = {
+            name: (position, term if op == '+' else AST.UnExpr('-', term))
+            for position, (name, op, term) in enumerate(updates)
+            if op in ('+', '-') and self.scalars[name] == 'int' and (
+                isinstance(term, AST.IntNum)
+                or isinstance(term, AST.Id) and term.id not in body | {var}
+                and self.scalars.get(term.id) == 'int'
+            )
+        }
+        self.reductions = body - set(self.inductions)
+
+        result = []
+        for position, (name, op, term) in enumerate(updates):
+            if name in self.inductions:
+                continue
+            args = [copy.deepcopy(node.beg), copy.deepcopy(node.end), AST.Id(name, first_lineno(term))]
+            program = self.program(term, position, args)
+            if program is None:
+                return None
+            if op == '-':
+                op, program = '+', ('neg', program)
+            result.append(AST.AssignStmt(AST.Id(name), AST.RangeReduce(op, program, self.exact, args)))
+
+        for name, (position, step) in self.inductions.items():
+            args = [copy.deepcopy(node.beg), copy.deepcopy(node.end), AST.Id(name, first_lineno(step))]
+            program = self.program(step, position, args)
+            result.append(AST.AssignStmt(AST.Id(name), AST.RangeReduce('+', program, self.exact, args)))
+        return AST.Block(result)
+
+    def update(self, stmt: AST.Stmt) -> Optional[Tuple[str, str, AST.Expr]]:
+        """``(s, op, term)`` of an assignment ``s = s op term``."""
+        if not isinstance(stmt, AST.AssignStmt) or not isinstance(stmt.lvalue, AST.Id):
+            return None
+        name, expr = stmt.lvalue.id, stmt.expr
+        if name not in self.scalars or type(expr) is not AST.BinExpr or expr.op not in ('+', '-', '*'):
+            return None
+        if isinstance(expr.left, AST.Id) and expr.left.id == name:
+            return name, expr.op, expr.right
+        if expr.op != '-' and isinstance(expr.right, AST.Id) and expr.right.id == name:
+            return name, expr.op, expr.left
+        return None
+
+    @staticmethod
+    def argument(args: List[AST.Expr], node: AST.Id) -> int:
+        for index, arg in enumerate(args[3:], 3):
+            if isinstance(arg, AST.Id) and arg.id == node.id:
+                return index
+        args.append(AST.Id(node.id, node.lineno))
+        return len(args) - 1
+
+    def program(self, node: AST.Expr, position: int, args: List[AST.Expr]) -> Optional[tuple]:
+        """The term as a program of ``evaluate_term`` of the statement at
+        ``position`` in the body, or None when it cannot be vectorized."""
+        if isinstance(node, (AST.IntNum, AST.FloatNum)):
+            return ('const', node.n) if math.isfinite(node.n) else None
+        if isinstance(node, AST.Id):
+            if node.id == self.var:
+                return ('affine', 0, ('const', 1), 0)
+            if node.id in self.inductions:
+                updated, step = self.inductions[node.id]
+                step = self.program(step, position, args)
+                return ('affine', self.argument(args, node), step, int(updated < position))
+            if node.id in self.reductions or node.id not in self.scalars:
+                return None
+            return ('arg', self.argument(args, node))
+        if type(node) is AST.UnExpr:
+            child = self.program(node.child, position, args)
+            return child if node.op == '+' or child is None else ('neg', child)
+        if type(node) is AST.BinExpr:
+            left = self.program(node.left, position, args)
+            right = self.program(node.right, position, args)
+            if left is None or right is None:
+                return None
+            op = node.op
+            if op == '/' and scalar_type(node.left, self.scalars) == scalar_type(node.right, self.scalars) == 'int':
+                op = '//'
+            return (op, left, right)
+        return None
+
+
+class LoopNestVectorizer(Pass):
+    """Replaces nests of for loops filling matrices element by element by
+    whole-array assignments.
+
+    A nest qualifies when its loops are perfectly nested, have int bounds
+    not depending on each other and the innermost body is nothing but
+    assignments to elements ``A[e1, ..., en] = value``.  Every index is a
+    loop variable plus an invariant int, or an invariant int, and the
+    values are arithmetic (``+``, ``-``, ``*``) on numbers, invariant
+    variables, loop variables and elements indexed the same way::
+
+        for i = 0:n for j = 0:m D[i, j] = i * m + j;
+        =>  NEST(D[0:n, 0:m] = ii * m + jj)
+
+    where ``ii``, ``jj`` are open grids of the iteration space.
+
+    Iterations must be independent: every variable of the nest is used
+    exactly once in the indices of each write, so no element is written
+    twice, and a written matrix is only read at the element the same
+    iteration writes.  Anything else is a possible loop-carried
+    dependence and leaves the nest alone.  The original nest is kept in
+    the LoopNest and runs when ``assign_nest`` finds at runtime that the
+    values do not allow vectorizing.
+    """
+
+    name = 'loop-nest-vectorizer'
+
+    def __init__(self):
+        self.scalars: Dict[str, str] = {}
+        self.assigned: Set[str] = set()
+        self.loops: List[str] = []
+        self.nest: List[str] = []
+        self.args: List[AST.Expr] = []
+
+    def run(self, node: AST.AST) -> AST.AST:
+        self.scalars = python_scalars(node)
+        self.assigned = {
+            child.lvalue.id for child in iter_nodes(node)
+            if isinstance(child, AST.AssignStmt) and isinstance(child.lvalue, AST.Id)
+        }
+        self.loops = []
+        return self.visit(node)
+
+    def visit_ForLoop(self, node: AST.ForLoop) -> AST.Stmt:
+        vectorized = self.vectorize(node)
+        if vectorized is not None:
+            return vectorized
+        self.loops.append(node.id.id)
+        self.generic_visit(node)
+        self.loops.pop()
+        return node
+
+    def vectorize(self, node: AST.ForLoop) -> Optional[AST.Stmt]:
+        loops, stmt = [], node
+        while isinstance(stmt, AST.ForLoop):
+            loops.append(stmt)
+            stmt = stmt.stmt
+            if isinstance(stmt, AST.Block) and len(stmt.stmt_set) == 1:
+                stmt = stmt.stmt_set[0]
+        body = stmt.stmt_set if isinstance(stmt, AST.Block) else [stmt]
+
+        names = [loop.id.id for loop in loops]
+        if len(set(names)) != len(names) or any(
+            name in self.assigned or name in self.loops for name in names
+        ):
+            return None
+        for loop in loops:
+            if scalar_type(loop.beg, self.scalars) != 'int' or scalar_type(loop.end, self.scalars) != 'int':
+                return None
+            if any(
+                isinstance(child, AST.Id) and child.id in names
+                for child in iter_nodes([loop.beg, loop.end])
+            ):
+                return None
+        if not body or not all(
+            isinstance(stmt, AST.AssignStmt) and isinstance(stmt.lvalue, AST.Ref)
+            and isinstance(stmt.lvalue.term, AST.Id)
+            for stmt in body
+        ):
+            return None
+
+        self.nest = names
+        self.args = [copy.deepcopy(bound) for loop in loops for bound in (loop.beg, loop.end)]
+        writes = []
+        for stmt in body:
+            array = self.argument(stmt.lvalue.term)
+            index = self.index(stmt.lvalue)
+            value = self.value(stmt.expr)
+            if index is None or value is None:
+                return None
+            # each iteration writes an element of its own
+            if sorted(entry[1] for entry in index if entry[0] == 'axis') != list(range(len(names))):
+                return None
+            writes.append((array, index, value))
+
+        indices = defaultdict(set)
+        for array, index, _ in writes:
+            indices[array].add(index)
+        refs = [ref for _, _, value in writes for ref in self.refs(value)]
+        if any(len(index) > 1 for index in indices.values()) or any(
+            array in indices and index not in indices[array] for array, index in refs
+        ):
+            return None
+
+        program = (len(names), tuple(writes))
+        return AST.LoopNest(program, self.args, node)
+
+    def argument(self, node: AST.Id) -> int:
+        for index, arg in enumerate(self.args[2 * len(self.nest):], 2 * len(self.nest)):
+            if arg.id == node.id:
+                return index
+        self.args.append(AST.Id(node.id, node.lineno))
+        return len(self.args) - 1
+
+    @classmethod
+    def refs(cls, program: tuple):
+        if program[0] == 'ref':
+            yield program[1], program[2]
+        elif program[0] not in ('const', 'arg', 'axis'):
+            for child in program[1:]:
+                yield from cls.refs(child)
+
+    def index(self, node: AST.Ref) -> Optional[tuple]:
+        index = []
+        for expr in node.idxs.expr_set:
+            if scalar_type(expr, self.scalars) != 'int':
+                return None
+            entry = self.affine(expr)
+            if entry is None:
+                return None
+            axis, offset = entry
+            index.append(('at', offset) if axis is None else ('axis', axis, offset))
+        axes = [entry[1] for entry in index if entry[0] == 'axis']
+        return tuple(index) if len(set(axes)) == len(axes) else None
+
+    def affine(self, node: AST.Expr) -> Optional[Tuple[Optional[int], tuple]]:
+        """``(axis, offset)`` of an index which is the loop variable of the
+        axis plus an invariant offset, or an invariant with axis None."""
+        if isinstance(node, AST.IntNum):
+            return None, ('const', node.n)
+        if isinstance(node, AST.Id):
+            if node.id in self.nest:
+                return self.nest.index(node.id), ('const', 0)
+            return None, ('arg', self.argument(node))
+        if type(node) is AST.UnExpr:
+            child = self.affine(node.child)
+            if child is None or node.op == '+':
+                return child
+            axis, offset = child
+            return None if axis is not None else (None, ('neg', offset))
+        if type(node) is AST.BinExpr and node.op in ('+', '-', '*'):
+            left, right = self.affine(node.left), self.affine(node.right)
+            if left is None or right is None:
+                return None
+            (left_axis, left_offset), (right_axis, right_offset) = left, right
+            if left_axis is None and right_axis is None:
+                return None, (node.op, left_offset, right_offset)
+            if node.op == '*' or left_axis is not None and right_axis is not None:
+                return None
+            if left_axis is not None:
+                return left_axis, (node.op, left_offset, right_offset)
+            if node.op == '+':
+                return right_axis, ('+', left_offset, right_offset)
+        return None
+
+    def value(self, node: AST.Expr) -> Optional[tuple]:
+        if isinstance(node, (AST.IntNum, AST.FloatNum)):
+            return ('const', node.n) if math.isfinite(node.n) else None
+        if isinstance(node, AST.Id):
+            if node.id in self.nest:
+                return ('axis', self.nest.index(node.id))
+            return ('arg', self.argument(node)) if node.id in self.scalars else None
+        if isinstance(node, AST.Ref) and isinstance(node.term, AST.Id):
+            index = self.index(node)
+            return None if index is None else ('ref', self.argument(node.term), index)
+        if type(node) is AST.UnExpr:
+            child = self.value(node.child)
+            return child if node.op == '+' or child is None else ('neg', child)
+        if type(node) is AST.BinExpr and node.op in ('+', '-', '*'):
+            left, right = self.value(node.left), self.value(node.right)
+            return None if left is None or right is None else (node.op, left, right)
+        return None
+
+
+LEVELS = {
+    0: [],
+    1: [ConstantFolding, UnreachableCode],
+    2: [
+        ConstantPropagation, UnreachableCode, MatrixChainOrder,
+        LoopInvariantCodeMotion, ReductionVectorizer, LoopNestVectorizer,
+        ConstantFolding, DeadCodeElimination,
+    ],
+}
+
+
+class Optimizer:
+    """Runs the passes of an optimization level over a checked AST.
+
+    ``stats`` collects ``(pass name, seconds, nodes removed)`` of every
+    pass run so far.  ``exact`` keeps vectorized float reductions in the
+    order of the original loop, so their results are bit for bit the same.
+    """
+
+    def __init__(self, level: int = 1, exact: bool = False):
+        self.passes: List[Pass] = [
+            cls(exact) if cls is ReductionVectorizer else cls() for cls in LEVELS[level]
+        ]
+        self.stats: List[Tuple[str, float, int]] = []
+
+    @deep_recursion()
+    def optimize(self, node: AST.AST) -> AST.AST:
+        for optimization in self.passes:
+            size = sum(1 for _ in iter_nodes(node))
+            start = time.perf_counter()
+            node = optimization.run(node)
+            elapsed = time.perf_counter() - start
+            self.stats.append(
+                (optimization.name, elapsed, size - sum(1 for _ in iter_nodes(node)))
+            )
+        return node
+
+    def format_stats(self) -> str:
+        return '\n'.join(
+            f'{name:28}{elapsed * 1000:9.3f} ms{removed:6} nodes removed'
+            for name, elapsed, removed in self.stats
+        )
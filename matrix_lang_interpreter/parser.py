@@ -1,12 +1,18 @@
 from sly import Parser as SlyParser
 from matrix_lang_interpreter import AST
 from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter import lr_tables
 
 
 class Parser(SlyParser):
     # debugfile = 'parser.out'
     tokens = Scanner.tokens
 
+    @classmethod
+    def _build(cls, definitions):
+        # the LALR tables are loaded from parsetab unless the grammar changed
+        lr_tables.build(cls, definitions)
+
     precedence = (
         ('nonassoc', IFX),
         ('nonassoc', ELSE),
@@ -137,9 +143,33 @@ class Parser(SlyParser):
     def term(self, p):
         return p.lvalue
 
-    @_('term "[" vector "]"')
+    @_('term "[" indices "]"')
     def lvalue(self, p):
-        return AST.Ref(p.term, p.vector)
+        return AST.Ref(p.term, p.indices)
+
+    @_('indices "," subscript')
+    def indices(self, p):
+        return p.indices.append(p.subscript)
+
+    @_('subscript')
+    def indices(self, p):
+        return AST.Vector([p.subscript])
+
+    @_('')
+    def indices(self, p):
+        return AST.Vector([])
+
+    @_('expr')
+    def subscript(self, p):
+        return p.expr
+
+    @_('expr ":" expr')
+    def subscript(self, p):
+        return AST.Slice(p.expr0, p.expr1)
+
+    @_('":"')
+    def subscript(self, p):
+        return AST.Slice(lineno=p.lineno)
 
     @_('ID')
     def lvalue(self, p):
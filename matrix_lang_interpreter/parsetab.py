@@ -0,0 +1,305 @@
+# Generated by matrix_lang_interpreter.lr_tables from the grammar of the
+# Parser, do not edit.  It is rebuilt when the signature does not match.
+
+SIGNATURE = '25d31c86738941bd80c3478b7f334d34ee5bfbca9ebfdb43205c734ce9a23f08'
+
+PRODUCTIONS = [
+    ("S'", ('program',)),
+    ('program', ('stmt_set',)),
+    ('stmt_set', ('stmt_set', 'stmt')),
+    ('stmt_set', ('stmt',)),
+    ('stmt', ('RETURN', 'vector', ';')),
+    ('stmt', ('PRINT', 'vector', ';')),
+    ('stmt', ('CONTINUE', ';')),
+    ('stmt', ('BREAK', ';')),
+    ('stmt', ('lvalue', 'DIVASSIGN', 'expr', ';')),
+    ('stmt', ('lvalue', 'MULASSIGN', 'expr', ';')),
+    ('stmt', ('lvalue', 'SUBASSIGN', 'expr', ';')),
+    ('stmt', ('lvalue', 'ADDASSIGN', 'expr', ';')),
+    ('stmt', ('lvalue', '=', 'expr', ';')),
+    ('stmt', ('FOR', 'ID', '=', 'expr', ':', 'expr', 'stmt')),
+    ('stmt', ('WHILE', '(', 'expr', ')', 'stmt')),
+    ('stmt', ('IF', '(', 'expr', ')', 'stmt')),
+    ('stmt', ('IF', '(', 'expr', ')', 'stmt', 'ELSE', 'stmt')),
+    ('stmt', ('{', 'stmt_set', '}')),
+    ('expr', ('[', 'vector', ']')),
+    ('expr', ('term',)),
+    ('expr', ('expr', 'NEQ', 'expr')),
+    ('expr', ('expr', 'EQU', 'expr')),
+    ('expr', ('expr', 'GEQ', 'expr')),
+    ('expr', ('expr', 'LEQ', 'expr')),
+    ('expr', ('expr', '>', 'expr')),
+    ('expr', ('expr', '<', 'expr')),
+    ('expr', ('(', 'expr', ')')),
+    ('expr', ('expr', 'TRANSPOSE')),
+    ('expr', ('-', 'expr')),
+    ('expr', ('+', 'expr')),
+    ('expr', ('expr', '@', 'expr')),
+    ('expr', ('expr', '/', 'expr')),
+    ('expr', ('expr', '*', 'expr')),
+    ('expr', ('expr', '-', 'expr')),
+    ('expr', ('expr', '+', 'expr')),
+    ('vector', ()),
+    ('vector', ('expr',)),
+    ('vector', ('vector', ',', 'expr')),
+    ('term', ('STRING',)),
+    ('term', ('FLOATNUM',)),
+    ('term', ('INTNUM',)),
+    ('term', ('EYE', '(', 'expr', ')')),
+    ('term', ('ONES', '(', 'vector', ')')),
+    ('term', ('ZEROS', '(', 'vector', ')')),
+    ('term', ('lvalue',)),
+    ('lvalue', ('ID',)),
+    ('lvalue', ('term', '[', 'indices', ']')),
+    ('indices', ()),
+    ('indices', ('subscript',)),
+    ('indices', ('indices', ',', 'subscript')),
+    ('subscript', (':',)),
+    ('subscript', ('expr', ':', 'expr')),
+    ('subscript', ('expr',)),
+]
+
+ACTION = {
+    0: {'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    1: {'$end': 0},
+    2: {'$end': -1, 'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    3: {'RETURN': -3, 'PRINT': -3, 'CONTINUE': -3, 'BREAK': -3, 'FOR': -3, 'WHILE': -3, 'IF': -3, '{': -3, 'ID': -3, 'STRING': -3, 'FLOATNUM': -3, 'INTNUM': -3, 'EYE': -3, 'ONES': -3, 'ZEROS': -3, '$end': -3, '}': -3},
+    4: {';': -35, ',': -35, '[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    5: {';': -35, ',': -35, '[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    6: {';': 31},
+    7: {';': 32},
+    8: {'DIVASSIGN': 33, 'MULASSIGN': 34, 'SUBASSIGN': 35, 'ADDASSIGN': 36, '=': 37, '[': -44},
+    9: {'ID': 38},
+    10: {'DIVASSIGN': -45, 'MULASSIGN': -45, 'SUBASSIGN': -45, 'ADDASSIGN': -45, '=': -45, '[': -45, 'NEQ': -45, 'EQU': -45, 'GEQ': -45, 'LEQ': -45, '>': -45, '<': -45, 'TRANSPOSE': -45, '@': -45, '/': -45, '*': -45, '-': -45, '+': -45, ';': -45, ',': -45, ']': -45, ')': -45, ':': -45, 'RETURN': -45, 'PRINT': -45, 'CONTINUE': -45, 'BREAK': -45, 'FOR': -45, 'WHILE': -45, 'IF': -45, '{': -45, 'ID': -45, 'STRING': -45, 'FLOATNUM': -45, 'INTNUM': -45, 'EYE': -45, 'ONES': -45, 'ZEROS': -45},
+    11: {'(': 39},
+    12: {'(': 40},
+    13: {'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    14: {'[': 42},
+    15: {'[': -38, 'NEQ': -38, 'EQU': -38, 'GEQ': -38, 'LEQ': -38, '>': -38, '<': -38, 'TRANSPOSE': -38, '@': -38, '/': -38, '*': -38, '-': -38, '+': -38, ';': -38, ',': -38, ']': -38, ')': -38, ':': -38, 'RETURN': -38, 'PRINT': -38, 'CONTINUE': -38, 'BREAK': -38, 'FOR': -38, 'WHILE': -38, 'IF': -38, '{': -38, 'ID': -38, 'STRING': -38, 'FLOATNUM': -38, 'INTNUM': -38, 'EYE': -38, 'ONES': -38, 'ZEROS': -38},
+    16: {'[': -39, 'NEQ': -39, 'EQU': -39, 'GEQ': -39, 'LEQ': -39, '>': -39, '<': -39, 'TRANSPOSE': -39, '@': -39, '/': -39, '*': -39, '-': -39, '+': -39, ';': -39, ',': -39, ']': -39, ')': -39, ':': -39, 'RETURN': -39, 'PRINT': -39, 'CONTINUE': -39, 'BREAK': -39, 'FOR': -39, 'WHILE': -39, 'IF': -39, '{': -39, 'ID': -39, 'STRING': -39, 'FLOATNUM': -39, 'INTNUM': -39, 'EYE': -39, 'ONES': -39, 'ZEROS': -39},
+    17: {'[': -40, 'NEQ': -40, 'EQU': -40, 'GEQ': -40, 'LEQ': -40, '>': -40, '<': -40, 'TRANSPOSE': -40, '@': -40, '/': -40, '*': -40, '-': -40, '+': -40, ';': -40, ',': -40, ']': -40, ')': -40, ':': -40, 'RETURN': -40, 'PRINT': -40, 'CONTINUE': -40, 'BREAK': -40, 'FOR': -40, 'WHILE': -40, 'IF': -40, '{': -40, 'ID': -40, 'STRING': -40, 'FLOATNUM': -40, 'INTNUM': -40, 'EYE': -40, 'ONES': -40, 'ZEROS': -40},
+    18: {'(': 43},
+    19: {'(': 44},
+    20: {'(': 45},
+    21: {'RETURN': -2, 'PRINT': -2, 'CONTINUE': -2, 'BREAK': -2, 'FOR': -2, 'WHILE': -2, 'IF': -2, '{': -2, 'ID': -2, 'STRING': -2, 'FLOATNUM': -2, 'INTNUM': -2, 'EYE': -2, 'ONES': -2, 'ZEROS': -2, '$end': -2, '}': -2},
+    22: {';': 46, ',': 47},
+    23: {';': -36, ',': -36, ']': -36, ')': -36, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    24: {']': -35, ',': -35, '[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    25: {'NEQ': -19, 'EQU': -19, 'GEQ': -19, 'LEQ': -19, '>': -19, '<': -19, 'TRANSPOSE': -19, '@': -19, '/': -19, '*': -19, '-': -19, '+': -19, ';': -19, ',': -19, ']': -19, ')': -19, ':': -19, 'RETURN': -19, 'PRINT': -19, 'CONTINUE': -19, 'BREAK': -19, 'FOR': -19, 'WHILE': -19, 'IF': -19, '{': -19, 'ID': -19, 'STRING': -19, 'FLOATNUM': -19, 'INTNUM': -19, 'EYE': -19, 'ONES': -19, 'ZEROS': -19, '[': 42},
+    26: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    27: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    28: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    29: {'[': -44, 'NEQ': -44, 'EQU': -44, 'GEQ': -44, 'LEQ': -44, '>': -44, '<': -44, 'TRANSPOSE': -44, '@': -44, '/': -44, '*': -44, '-': -44, '+': -44, ';': -44, ',': -44, ']': -44, ')': -44, ':': -44, 'RETURN': -44, 'PRINT': -44, 'CONTINUE': -44, 'BREAK': -44, 'FOR': -44, 'WHILE': -44, 'IF': -44, '{': -44, 'ID': -44, 'STRING': -44, 'FLOATNUM': -44, 'INTNUM': -44, 'EYE': -44, 'ONES': -44, 'ZEROS': -44},
+    30: {';': 64, ',': 47},
+    31: {'RETURN': -6, 'PRINT': -6, 'CONTINUE': -6, 'BREAK': -6, 'FOR': -6, 'WHILE': -6, 'IF': -6, '{': -6, 'ID': -6, 'STRING': -6, 'FLOATNUM': -6, 'INTNUM': -6, 'EYE': -6, 'ONES': -6, 'ZEROS': -6, '$end': -6, '}': -6, 'ELSE': -6},
+    32: {'RETURN': -7, 'PRINT': -7, 'CONTINUE': -7, 'BREAK': -7, 'FOR': -7, 'WHILE': -7, 'IF': -7, '{': -7, 'ID': -7, 'STRING': -7, 'FLOATNUM': -7, 'INTNUM': -7, 'EYE': -7, 'ONES': -7, 'ZEROS': -7, '$end': -7, '}': -7, 'ELSE': -7},
+    33: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    34: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    35: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    36: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    37: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    38: {'=': 70},
+    39: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    40: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    41: {'}': 73, 'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    42: {']': -47, ',': -47, ':': 76, '[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    43: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    44: {')': -35, ',': -35, '[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    45: {')': -35, ',': -35, '[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    46: {'RETURN': -4, 'PRINT': -4, 'CONTINUE': -4, 'BREAK': -4, 'FOR': -4, 'WHILE': -4, 'IF': -4, '{': -4, 'ID': -4, 'STRING': -4, 'FLOATNUM': -4, 'INTNUM': -4, 'EYE': -4, 'ONES': -4, 'ZEROS': -4, '$end': -4, '}': -4, 'ELSE': -4},
+    47: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    48: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    49: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    50: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    51: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    52: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    53: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    54: {'NEQ': -27, 'EQU': -27, 'GEQ': -27, 'LEQ': -27, '>': -27, '<': -27, 'TRANSPOSE': -27, '@': -27, '/': -27, '*': -27, '-': -27, '+': -27, ';': -27, ',': -27, ']': -27, ')': -27, ':': -27, 'RETURN': -27, 'PRINT': -27, 'CONTINUE': -27, 'BREAK': -27, 'FOR': -27, 'WHILE': -27, 'IF': -27, '{': -27, 'ID': -27, 'STRING': -27, 'FLOATNUM': -27, 'INTNUM': -27, 'EYE': -27, 'ONES': -27, 'ZEROS': -27},
+    55: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    56: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    57: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    58: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    59: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    60: {']': 93, ',': 47},
+    61: {')': 94, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    62: {'NEQ': -28, 'EQU': -28, 'GEQ': -28, 'LEQ': -28, '>': -28, '<': -28, 'TRANSPOSE': 54, '@': -28, '/': -28, '*': -28, '-': -28, '+': -28, ';': -28, ',': -28, ']': -28, ')': -28, ':': -28, 'RETURN': -28, 'PRINT': -28, 'CONTINUE': -28, 'BREAK': -28, 'FOR': -28, 'WHILE': -28, 'IF': -28, '{': -28, 'ID': -28, 'STRING': -28, 'FLOATNUM': -28, 'INTNUM': -28, 'EYE': -28, 'ONES': -28, 'ZEROS': -28},
+    63: {'NEQ': -29, 'EQU': -29, 'GEQ': -29, 'LEQ': -29, '>': -29, '<': -29, 'TRANSPOSE': 54, '@': -29, '/': -29, '*': -29, '-': -29, '+': -29, ';': -29, ',': -29, ']': -29, ')': -29, ':': -29, 'RETURN': -29, 'PRINT': -29, 'CONTINUE': -29, 'BREAK': -29, 'FOR': -29, 'WHILE': -29, 'IF': -29, '{': -29, 'ID': -29, 'STRING': -29, 'FLOATNUM': -29, 'INTNUM': -29, 'EYE': -29, 'ONES': -29, 'ZEROS': -29},
+    64: {'RETURN': -5, 'PRINT': -5, 'CONTINUE': -5, 'BREAK': -5, 'FOR': -5, 'WHILE': -5, 'IF': -5, '{': -5, 'ID': -5, 'STRING': -5, 'FLOATNUM': -5, 'INTNUM': -5, 'EYE': -5, 'ONES': -5, 'ZEROS': -5, '$end': -5, '}': -5, 'ELSE': -5},
+    65: {';': 95, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    66: {';': 96, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    67: {';': 97, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    68: {';': 98, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    69: {';': 99, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    70: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    71: {')': 101, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    72: {')': 102, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    73: {'RETURN': -17, 'PRINT': -17, 'CONTINUE': -17, 'BREAK': -17, 'FOR': -17, 'WHILE': -17, 'IF': -17, '{': -17, 'ID': -17, 'STRING': -17, 'FLOATNUM': -17, 'INTNUM': -17, 'EYE': -17, 'ONES': -17, 'ZEROS': -17, '$end': -17, '}': -17, 'ELSE': -17},
+    74: {']': 103, ',': 104},
+    75: {']': -48, ',': -48},
+    76: {']': -50, ',': -50},
+    77: {':': 105, ']': -52, ',': -52, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    78: {')': 106, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    79: {')': 107, ',': 47},
+    80: {')': 108, ',': 47},
+    81: {';': -37, ',': -37, ']': -37, ')': -37, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    82: {'NEQ': None, 'EQU': None, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59, ';': -20, ',': -20, ']': -20, ')': -20, ':': -20, 'RETURN': -20, 'PRINT': -20, 'CONTINUE': -20, 'BREAK': -20, 'FOR': -20, 'WHILE': -20, 'IF': -20, '{': -20, 'ID': -20, 'STRING': -20, 'FLOATNUM': -20, 'INTNUM': -20, 'EYE': -20, 'ONES': -20, 'ZEROS': -20},
+    83: {'NEQ': None, 'EQU': None, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59, ';': -21, ',': -21, ']': -21, ')': -21, ':': -21, 'RETURN': -21, 'PRINT': -21, 'CONTINUE': -21, 'BREAK': -21, 'FOR': -21, 'WHILE': -21, 'IF': -21, '{': -21, 'ID': -21, 'STRING': -21, 'FLOATNUM': -21, 'INTNUM': -21, 'EYE': -21, 'ONES': -21, 'ZEROS': -21},
+    84: {'NEQ': -22, 'EQU': -22, 'GEQ': None, 'LEQ': None, '>': None, '<': None, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59, ';': -22, ',': -22, ']': -22, ')': -22, ':': -22, 'RETURN': -22, 'PRINT': -22, 'CONTINUE': -22, 'BREAK': -22, 'FOR': -22, 'WHILE': -22, 'IF': -22, '{': -22, 'ID': -22, 'STRING': -22, 'FLOATNUM': -22, 'INTNUM': -22, 'EYE': -22, 'ONES': -22, 'ZEROS': -22},
+    85: {'NEQ': -23, 'EQU': -23, 'GEQ': None, 'LEQ': None, '>': None, '<': None, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59, ';': -23, ',': -23, ']': -23, ')': -23, ':': -23, 'RETURN': -23, 'PRINT': -23, 'CONTINUE': -23, 'BREAK': -23, 'FOR': -23, 'WHILE': -23, 'IF': -23, '{': -23, 'ID': -23, 'STRING': -23, 'FLOATNUM': -23, 'INTNUM': -23, 'EYE': -23, 'ONES': -23, 'ZEROS': -23},
+    86: {'NEQ': -24, 'EQU': -24, 'GEQ': None, 'LEQ': None, '>': None, '<': None, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59, ';': -24, ',': -24, ']': -24, ')': -24, ':': -24, 'RETURN': -24, 'PRINT': -24, 'CONTINUE': -24, 'BREAK': -24, 'FOR': -24, 'WHILE': -24, 'IF': -24, '{': -24, 'ID': -24, 'STRING': -24, 'FLOATNUM': -24, 'INTNUM': -24, 'EYE': -24, 'ONES': -24, 'ZEROS': -24},
+    87: {'NEQ': -25, 'EQU': -25, 'GEQ': None, 'LEQ': None, '>': None, '<': None, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59, ';': -25, ',': -25, ']': -25, ')': -25, ':': -25, 'RETURN': -25, 'PRINT': -25, 'CONTINUE': -25, 'BREAK': -25, 'FOR': -25, 'WHILE': -25, 'IF': -25, '{': -25, 'ID': -25, 'STRING': -25, 'FLOATNUM': -25, 'INTNUM': -25, 'EYE': -25, 'ONES': -25, 'ZEROS': -25},
+    88: {'NEQ': -30, 'EQU': -30, 'GEQ': -30, 'LEQ': -30, '>': -30, '<': -30, 'TRANSPOSE': 54, '@': -30, '/': -30, '*': -30, '-': -30, '+': -30, ';': -30, ',': -30, ']': -30, ')': -30, ':': -30, 'RETURN': -30, 'PRINT': -30, 'CONTINUE': -30, 'BREAK': -30, 'FOR': -30, 'WHILE': -30, 'IF': -30, '{': -30, 'ID': -30, 'STRING': -30, 'FLOATNUM': -30, 'INTNUM': -30, 'EYE': -30, 'ONES': -30, 'ZEROS': -30},
+    89: {'NEQ': -31, 'EQU': -31, 'GEQ': -31, 'LEQ': -31, '>': -31, '<': -31, 'TRANSPOSE': 54, '@': -31, '/': -31, '*': -31, '-': -31, '+': -31, ';': -31, ',': -31, ']': -31, ')': -31, ':': -31, 'RETURN': -31, 'PRINT': -31, 'CONTINUE': -31, 'BREAK': -31, 'FOR': -31, 'WHILE': -31, 'IF': -31, '{': -31, 'ID': -31, 'STRING': -31, 'FLOATNUM': -31, 'INTNUM': -31, 'EYE': -31, 'ONES': -31, 'ZEROS': -31},
+    90: {'NEQ': -32, 'EQU': -32, 'GEQ': -32, 'LEQ': -32, '>': -32, '<': -32, 'TRANSPOSE': 54, '@': -32, '/': -32, '*': -32, '-': -32, '+': -32, ';': -32, ',': -32, ']': -32, ')': -32, ':': -32, 'RETURN': -32, 'PRINT': -32, 'CONTINUE': -32, 'BREAK': -32, 'FOR': -32, 'WHILE': -32, 'IF': -32, '{': -32, 'ID': -32, 'STRING': -32, 'FLOATNUM': -32, 'INTNUM': -32, 'EYE': -32, 'ONES': -32, 'ZEROS': -32},
+    91: {'NEQ': -33, 'EQU': -33, 'GEQ': -33, 'LEQ': -33, '>': -33, '<': -33, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': -33, '+': -33, ';': -33, ',': -33, ']': -33, ')': -33, ':': -33, 'RETURN': -33, 'PRINT': -33, 'CONTINUE': -33, 'BREAK': -33, 'FOR': -33, 'WHILE': -33, 'IF': -33, '{': -33, 'ID': -33, 'STRING': -33, 'FLOATNUM': -33, 'INTNUM': -33, 'EYE': -33, 'ONES': -33, 'ZEROS': -33},
+    92: {'NEQ': -34, 'EQU': -34, 'GEQ': -34, 'LEQ': -34, '>': -34, '<': -34, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': -34, '+': -34, ';': -34, ',': -34, ']': -34, ')': -34, ':': -34, 'RETURN': -34, 'PRINT': -34, 'CONTINUE': -34, 'BREAK': -34, 'FOR': -34, 'WHILE': -34, 'IF': -34, '{': -34, 'ID': -34, 'STRING': -34, 'FLOATNUM': -34, 'INTNUM': -34, 'EYE': -34, 'ONES': -34, 'ZEROS': -34},
+    93: {'NEQ': -18, 'EQU': -18, 'GEQ': -18, 'LEQ': -18, '>': -18, '<': -18, 'TRANSPOSE': -18, '@': -18, '/': -18, '*': -18, '-': -18, '+': -18, ';': -18, ',': -18, ']': -18, ')': -18, ':': -18, 'RETURN': -18, 'PRINT': -18, 'CONTINUE': -18, 'BREAK': -18, 'FOR': -18, 'WHILE': -18, 'IF': -18, '{': -18, 'ID': -18, 'STRING': -18, 'FLOATNUM': -18, 'INTNUM': -18, 'EYE': -18, 'ONES': -18, 'ZEROS': -18},
+    94: {'NEQ': -26, 'EQU': -26, 'GEQ': -26, 'LEQ': -26, '>': -26, '<': -26, 'TRANSPOSE': -26, '@': -26, '/': -26, '*': -26, '-': -26, '+': -26, ';': -26, ',': -26, ']': -26, ')': -26, ':': -26, 'RETURN': -26, 'PRINT': -26, 'CONTINUE': -26, 'BREAK': -26, 'FOR': -26, 'WHILE': -26, 'IF': -26, '{': -26, 'ID': -26, 'STRING': -26, 'FLOATNUM': -26, 'INTNUM': -26, 'EYE': -26, 'ONES': -26, 'ZEROS': -26},
+    95: {'RETURN': -8, 'PRINT': -8, 'CONTINUE': -8, 'BREAK': -8, 'FOR': -8, 'WHILE': -8, 'IF': -8, '{': -8, 'ID': -8, 'STRING': -8, 'FLOATNUM': -8, 'INTNUM': -8, 'EYE': -8, 'ONES': -8, 'ZEROS': -8, '$end': -8, '}': -8, 'ELSE': -8},
+    96: {'RETURN': -9, 'PRINT': -9, 'CONTINUE': -9, 'BREAK': -9, 'FOR': -9, 'WHILE': -9, 'IF': -9, '{': -9, 'ID': -9, 'STRING': -9, 'FLOATNUM': -9, 'INTNUM': -9, 'EYE': -9, 'ONES': -9, 'ZEROS': -9, '$end': -9, '}': -9, 'ELSE': -9},
+    97: {'RETURN': -10, 'PRINT': -10, 'CONTINUE': -10, 'BREAK': -10, 'FOR': -10, 'WHILE': -10, 'IF': -10, '{': -10, 'ID': -10, 'STRING': -10, 'FLOATNUM': -10, 'INTNUM': -10, 'EYE': -10, 'ONES': -10, 'ZEROS': -10, '$end': -10, '}': -10, 'ELSE': -10},
+    98: {'RETURN': -11, 'PRINT': -11, 'CONTINUE': -11, 'BREAK': -11, 'FOR': -11, 'WHILE': -11, 'IF': -11, '{': -11, 'ID': -11, 'STRING': -11, 'FLOATNUM': -11, 'INTNUM': -11, 'EYE': -11, 'ONES': -11, 'ZEROS': -11, '$end': -11, '}': -11, 'ELSE': -11},
+    99: {'RETURN': -12, 'PRINT': -12, 'CONTINUE': -12, 'BREAK': -12, 'FOR': -12, 'WHILE': -12, 'IF': -12, '{': -12, 'ID': -12, 'STRING': -12, 'FLOATNUM': -12, 'INTNUM': -12, 'EYE': -12, 'ONES': -12, 'ZEROS': -12, '$end': -12, '}': -12, 'ELSE': -12},
+    100: {':': 109, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    101: {'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    102: {'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    103: {'DIVASSIGN': -46, 'MULASSIGN': -46, 'SUBASSIGN': -46, 'ADDASSIGN': -46, '=': -46, '[': -46, 'NEQ': -46, 'EQU': -46, 'GEQ': -46, 'LEQ': -46, '>': -46, '<': -46, 'TRANSPOSE': -46, '@': -46, '/': -46, '*': -46, '-': -46, '+': -46, ';': -46, ',': -46, ']': -46, ')': -46, ':': -46, 'RETURN': -46, 'PRINT': -46, 'CONTINUE': -46, 'BREAK': -46, 'FOR': -46, 'WHILE': -46, 'IF': -46, '{': -46, 'ID': -46, 'STRING': -46, 'FLOATNUM': -46, 'INTNUM': -46, 'EYE': -46, 'ONES': -46, 'ZEROS': -46},
+    104: {':': 76, '[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    105: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    106: {'[': -41, 'NEQ': -41, 'EQU': -41, 'GEQ': -41, 'LEQ': -41, '>': -41, '<': -41, 'TRANSPOSE': -41, '@': -41, '/': -41, '*': -41, '-': -41, '+': -41, ';': -41, ',': -41, ']': -41, ')': -41, ':': -41, 'RETURN': -41, 'PRINT': -41, 'CONTINUE': -41, 'BREAK': -41, 'FOR': -41, 'WHILE': -41, 'IF': -41, '{': -41, 'ID': -41, 'STRING': -41, 'FLOATNUM': -41, 'INTNUM': -41, 'EYE': -41, 'ONES': -41, 'ZEROS': -41},
+    107: {'[': -42, 'NEQ': -42, 'EQU': -42, 'GEQ': -42, 'LEQ': -42, '>': -42, '<': -42, 'TRANSPOSE': -42, '@': -42, '/': -42, '*': -42, '-': -42, '+': -42, ';': -42, ',': -42, ']': -42, ')': -42, ':': -42, 'RETURN': -42, 'PRINT': -42, 'CONTINUE': -42, 'BREAK': -42, 'FOR': -42, 'WHILE': -42, 'IF': -42, '{': -42, 'ID': -42, 'STRING': -42, 'FLOATNUM': -42, 'INTNUM': -42, 'EYE': -42, 'ONES': -42, 'ZEROS': -42},
+    108: {'[': -43, 'NEQ': -43, 'EQU': -43, 'GEQ': -43, 'LEQ': -43, '>': -43, '<': -43, 'TRANSPOSE': -43, '@': -43, '/': -43, '*': -43, '-': -43, '+': -43, ';': -43, ',': -43, ']': -43, ')': -43, ':': -43, 'RETURN': -43, 'PRINT': -43, 'CONTINUE': -43, 'BREAK': -43, 'FOR': -43, 'WHILE': -43, 'IF': -43, '{': -43, 'ID': -43, 'STRING': -43, 'FLOATNUM': -43, 'INTNUM': -43, 'EYE': -43, 'ONES': -43, 'ZEROS': -43},
+    109: {'[': 24, '(': 26, '-': 27, '+': 28, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20, 'ID': 10},
+    110: {'RETURN': -14, 'PRINT': -14, 'CONTINUE': -14, 'BREAK': -14, 'FOR': -14, 'WHILE': -14, 'IF': -14, '{': -14, 'ID': -14, 'STRING': -14, 'FLOATNUM': -14, 'INTNUM': -14, 'EYE': -14, 'ONES': -14, 'ZEROS': -14, '$end': -14, '}': -14, 'ELSE': -14},
+    111: {'RETURN': -15, 'PRINT': -15, 'CONTINUE': -15, 'BREAK': -15, 'FOR': -15, 'WHILE': -15, 'IF': -15, '{': -15, 'ID': -15, 'STRING': -15, 'FLOATNUM': -15, 'INTNUM': -15, 'EYE': -15, 'ONES': -15, 'ZEROS': -15, '$end': -15, '}': -15, 'ELSE': 115},
+    112: {']': -49, ',': -49},
+    113: {']': -51, ',': -51, 'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59},
+    114: {'NEQ': 48, 'EQU': 49, 'GEQ': 50, 'LEQ': 51, '>': 52, '<': 53, 'TRANSPOSE': 54, '@': 55, '/': 56, '*': 57, '-': 58, '+': 59, 'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    115: {'RETURN': 4, 'PRINT': 5, 'CONTINUE': 6, 'BREAK': 7, 'FOR': 9, 'WHILE': 11, 'IF': 12, '{': 13, 'ID': 10, 'STRING': 15, 'FLOATNUM': 16, 'INTNUM': 17, 'EYE': 18, 'ONES': 19, 'ZEROS': 20},
+    116: {'RETURN': -13, 'PRINT': -13, 'CONTINUE': -13, 'BREAK': -13, 'FOR': -13, 'WHILE': -13, 'IF': -13, '{': -13, 'ID': -13, 'STRING': -13, 'FLOATNUM': -13, 'INTNUM': -13, 'EYE': -13, 'ONES': -13, 'ZEROS': -13, '$end': -13, '}': -13, 'ELSE': -13},
+    117: {'RETURN': -16, 'PRINT': -16, 'CONTINUE': -16, 'BREAK': -16, 'FOR': -16, 'WHILE': -16, 'IF': -16, '{': -16, 'ID': -16, 'STRING': -16, 'FLOATNUM': -16, 'INTNUM': -16, 'EYE': -16, 'ONES': -16, 'ZEROS': -16, '$end': -16, '}': -16, 'ELSE': -16},
+}
+
+GOTO = {
+    0: {'program': 1, 'stmt_set': 2, 'stmt': 3, 'lvalue': 8, 'term': 14},
+    1: {},
+    2: {'stmt': 21, 'lvalue': 8, 'term': 14},
+    3: {},
+    4: {'vector': 22, 'expr': 23, 'term': 25, 'lvalue': 29},
+    5: {'vector': 30, 'expr': 23, 'term': 25, 'lvalue': 29},
+    6: {},
+    7: {},
+    8: {},
+    9: {},
+    10: {},
+    11: {},
+    12: {},
+    13: {'stmt_set': 41, 'stmt': 3, 'lvalue': 8, 'term': 14},
+    14: {},
+    15: {},
+    16: {},
+    17: {},
+    18: {},
+    19: {},
+    20: {},
+    21: {},
+    22: {},
+    23: {},
+    24: {'vector': 60, 'expr': 23, 'term': 25, 'lvalue': 29},
+    25: {},
+    26: {'expr': 61, 'term': 25, 'lvalue': 29},
+    27: {'expr': 62, 'term': 25, 'lvalue': 29},
+    28: {'expr': 63, 'term': 25, 'lvalue': 29},
+    29: {},
+    30: {},
+    31: {},
+    32: {},
+    33: {'lvalue': 29, 'expr': 65, 'term': 25},
+    34: {'lvalue': 29, 'expr': 66, 'term': 25},
+    35: {'lvalue': 29, 'expr': 67, 'term': 25},
+    36: {'lvalue': 29, 'expr': 68, 'term': 25},
+    37: {'lvalue': 29, 'expr': 69, 'term': 25},
+    38: {},
+    39: {'expr': 71, 'term': 25, 'lvalue': 29},
+    40: {'expr': 72, 'term': 25, 'lvalue': 29},
+    41: {'stmt': 21, 'lvalue': 8, 'term': 14},
+    42: {'term': 25, 'indices': 74, 'subscript': 75, 'expr': 77, 'lvalue': 29},
+    43: {'expr': 78, 'term': 25, 'lvalue': 29},
+    44: {'vector': 79, 'expr': 23, 'term': 25, 'lvalue': 29},
+    45: {'vector': 80, 'expr': 23, 'term': 25, 'lvalue': 29},
+    46: {},
+    47: {'expr': 81, 'term': 25, 'lvalue': 29},
+    48: {'expr': 82, 'term': 25, 'lvalue': 29},
+    49: {'expr': 83, 'term': 25, 'lvalue': 29},
+    50: {'expr': 84, 'term': 25, 'lvalue': 29},
+    51: {'expr': 85, 'term': 25, 'lvalue': 29},
+    52: {'expr': 86, 'term': 25, 'lvalue': 29},
+    53: {'expr': 87, 'term': 25, 'lvalue': 29},
+    54: {},
+    55: {'expr': 88, 'term': 25, 'lvalue': 29},
+    56: {'expr': 89, 'term': 25, 'lvalue': 29},
+    57: {'expr': 90, 'term': 25, 'lvalue': 29},
+    58: {'expr': 91, 'term': 25, 'lvalue': 29},
+    59: {'expr': 92, 'term': 25, 'lvalue': 29},
+    60: {},
+    61: {},
+    62: {},
+    63: {},
+    64: {},
+    65: {},
+    66: {},
+    67: {},
+    68: {},
+    69: {},
+    70: {'expr': 100, 'term': 25, 'lvalue': 29},
+    71: {},
+    72: {},
+    73: {},
+    74: {},
+    75: {},
+    76: {},
+    77: {},
+    78: {},
+    79: {},
+    80: {},
+    81: {},
+    82: {},
+    83: {},
+    84: {},
+    85: {},
+    86: {},
+    87: {},
+    88: {},
+    89: {},
+    90: {},
+    91: {},
+    92: {},
+    93: {},
+    94: {},
+    95: {},
+    96: {},
+    97: {},
+    98: {},
+    99: {},
+    100: {},
+    101: {'stmt': 110, 'lvalue': 8, 'term': 14},
+    102: {'stmt': 111, 'lvalue': 8, 'term': 14},
+    103: {},
+    104: {'subscript': 112, 'expr': 77, 'term': 25, 'lvalue': 29},
+    105: {'expr': 113, 'term': 25, 'lvalue': 29},
+    106: {},
+    107: {},
+    108: {},
+    109: {'expr': 114, 'term': 25, 'lvalue': 29},
+    110: {},
+    111: {},
+    112: {},
+    113: {},
+    114: {'stmt': 116, 'lvalue': 8, 'term': 14},
+    115: {'stmt': 117, 'lvalue': 8, 'term': 14},
+    116: {},
+    117: {},
+}
+
+DEFAULTED_STATES = {
+}
@@ -0,0 +1,307 @@
+import gc
+from typing import Iterable, List, Optional
+from sly.lex import Token
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.stream_scanner import TYPES, TokenArray
+
+
+# (level, associativity) of every operator, from the table of the Parser
+PRECEDENCE = {
+    type: (level, assoc)
+    for level, (assoc, *types) in enumerate(Parser.precedence)
+    for type in types
+}
+
+BINARY = {
+    '+': AST.BinExpr, '-': AST.BinExpr, '*': AST.BinExpr, '/': AST.BinExpr,
+    '@': AST.MatMulBinExpr,
+    '<': AST.RelationExpr, '>': AST.RelationExpr, 'LEQ': AST.RelationExpr,
+    'GEQ': AST.RelationExpr, 'EQU': AST.RelationExpr, 'NEQ': AST.RelationExpr,
+}
+
+# operators following an operand: (level, associativity, node), where the
+# node of the postfix TRANSPOSE is None
+OPERATORS = {
+    **{type: (*PRECEDENCE[type], node) for type, node in BINARY.items()},
+    'TRANSPOSE': (*PRECEDENCE['TRANSPOSE'], None),
+}
+UNARY_LEVEL = PRECEDENCE['UMINUS'][0]
+
+ASSIGN = {'=', 'ADDASSIGN', 'SUBASSIGN', 'MULASSIGN', 'DIVASSIGN'}
+EXPR_START = {'+', '-', '(', '[', 'MATRIX', 'ID', 'INTNUM', 'FLOATNUM', 'STRING', 'ZEROS', 'ONES', 'EYE'}
+INDEX_START = EXPR_START | {':'}
+SPECIAL = {'ZEROS': AST.Zeros, 'ONES': AST.Ones}
+END = '$end'
+
+
+class ParseError(Exception):
+    def __init__(self, index: int):
+        self.index = index
+
+
+class PrattParser:
+    """Hand-written parser of the grammar of the Parser.
+
+    Statements are parsed by recursive descent on their first token and
+    expressions by precedence climbing over the ``precedence`` table of the
+    Parser, building the same AST nodes with the same line numbers.  It
+    reads the parallel arrays of a TokenArray directly, or any iterable of
+    tokens.  The MATRIX tokens of dense literals become Matrix nodes where
+    the Parser would build a Vector of numbers.
+
+    After a syntax error the statement is skipped up to the next ``;``
+    and parsing goes on to report further errors, but the program is
+    rejected and ``parse`` returns None.  Programs nested deeper than the
+    Python stack allows are handed over to the LALR Parser.
+    """
+
+    def parse(self, tokens: Iterable[Token]) -> Optional[AST.AST]:
+        if isinstance(tokens, TokenArray):
+            self.types = list(map(TYPES.__getitem__, tokens.types))
+            self.values = tokens.values
+            self.lines = tokens.lines
+        else:
+            tokens = list(tokens)
+            self.types = [tok.type for tok in tokens]
+            self.values = [tok.value for tok in tokens]
+            self.lines = [tok.lineno for tok in tokens]
+        self.types.append(END)
+        self.pos = 0
+        self.errors = 0
+        self.reported = None
+        # the tree has no reference cycles, but the collections triggered
+        # by allocating its nodes would scan it over and over while it grows
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            stmt_set = self.stmt_set(END)
+        except ParseError as e:
+            self.error(e.index)
+            return None
+        except RecursionError:
+            return Parser().parse(iter(self.tokens()))
+        finally:
+            if enabled:
+                gc.enable()
+        return AST.AST(stmt_set) if stmt_set and not self.errors else None
+
+    def tokens(self) -> List[Token]:
+        # the grammar of the Parser has no MATRIX, dense literals are spelled
+        # out again as the tokens of their numbers
+        tokens = []
+        for index, (type, value, lineno) in enumerate(zip(self.types, self.values, self.lines)):
+            if type == 'MATRIX':
+                number = 'INTNUM' if value.dtype.kind == 'i' else 'FLOATNUM'
+                self.literal_tokens(tokens, value.tolist(), number, lineno, index)
+            else:
+                tokens.append(self.token(type, value, lineno, index))
+        return tokens
+
+    def literal_tokens(self, tokens: List[Token], value, number: str, lineno: int, index: int):
+        if not isinstance(value, list):
+            tokens.append(self.token(number, value, lineno, index))
+            return
+        tokens.append(self.token('[', '[', lineno, index))
+        for i, item in enumerate(value):
+            if i:
+                tokens.append(self.token(',', ',', lineno, index))
+            self.literal_tokens(tokens, item, number, lineno, index)
+        tokens.append(self.token(']', ']', lineno, index))
+
+    @staticmethod
+    def token(type: str, value, lineno: int, index: int) -> Token:
+        token = Token()
+        token.type, token.value, token.lineno, token.index = type, value, lineno, index
+        return token
+
+    def error(self, index: int):
+        if index == self.reported:
+            # an unclosed block fails again at the end of the input
+            return
+        self.reported = index
+        if self.types[index] == END:
+            lineno = self.lines[-1] if self.lines else 1
+            print(f'Line {lineno:3}: Parser: Syntax error: unexpected end of input')
+        else:
+            print(f'Line {self.lines[index]:3}: Parser: Syntax error: "{self.types[index]}": {self.values[index]}')
+        self.errors += 1
+
+    def expect(self, type: str) -> int:
+        index = self.pos
+        if self.types[index] != type:
+            raise ParseError(index)
+        self.pos = index + 1
+        return index
+
+    def stmt_set(self, end: str) -> List[AST.Stmt]:
+        stmt_set = []
+        types = self.types
+        errors = self.errors
+        while types[self.pos] != end:
+            try:
+                stmt_set.append(self.stmt())
+            except ParseError as e:
+                self.error(e.index)
+                if types[e.index] == END:
+                    self.pos = e.index
+                    break
+                # skip the rest of the statement
+                pos = e.index
+                while types[pos] != ';' and types[pos] != END:
+                    pos += 1
+                self.pos = pos + (types[pos] == ';')
+        if not stmt_set and self.errors == errors:
+            # a program or a block needs at least one statement
+            raise ParseError(self.pos)
+        return stmt_set
+
+    def stmt(self) -> AST.Stmt:
+        pos = self.pos
+        type = self.types[pos]
+        if type == '{':
+            self.pos = pos + 1
+            stmt_set = self.stmt_set('}')
+            self.expect('}')
+            return AST.Block(stmt_set)
+        if type == 'IF':
+            self.pos = pos + 1
+            self.expect('(')
+            cond = self.expr(0)
+            self.expect(')')
+            stmt = self.stmt()
+            if self.types[self.pos] == 'ELSE':
+                self.pos += 1
+                return AST.IfElseStmt(cond, stmt, self.stmt())
+            return AST.IfStmt(cond, stmt)
+        if type == 'WHILE':
+            self.pos = pos + 1
+            self.expect('(')
+            cond = self.expr(0)
+            self.expect(')')
+            return AST.WhileLoop(cond, self.stmt())
+        if type == 'FOR':
+            self.pos = pos + 1
+            index = self.expect('ID')
+            self.expect('=')
+            beg = self.expr(0)
+            self.expect(':')
+            end = self.expr(0)
+            return AST.ForLoop(AST.Id(self.values[index], self.lines[pos]), beg, end, self.stmt())
+        if type == 'BREAK' or type == 'CONTINUE':
+            self.pos = pos + 1
+            self.expect(';')
+            return (AST.Break if type == 'BREAK' else AST.Continue)(self.lines[pos])
+        if type == 'PRINT' or type == 'RETURN':
+            self.pos = pos + 1
+            vector = self.vector()
+            self.expect(';')
+            return (AST.Print if type == 'PRINT' else AST.Return)(vector.expr_set)
+
+        lvalue = self.term()
+        op = self.pos
+        if not isinstance(lvalue, AST.LValue) or self.types[op] not in ASSIGN:
+            raise ParseError(op)
+        self.pos = op + 1
+        expr = self.expr(0)
+        self.expect(';')
+        if self.types[op] == '=':
+            return AST.AssignStmt(lvalue, expr)
+        return AST.AssignStmt(lvalue, AST.BinExpr(self.values[op][0], lvalue, expr))
+
+    def expr(self, min_level: int) -> AST.Expr:
+        types = self.types
+        pos = self.pos
+        type = types[pos]
+        if type == '-' or type == '+':
+            self.pos = pos + 1
+            left = AST.UnExpr(self.values[pos], self.expr(UNARY_LEVEL))
+        elif type == '(':
+            self.pos = pos + 1
+            left = self.expr(0)
+            self.expect(')')
+        elif type == '[':
+            self.pos = pos + 1
+            left = self.vector()
+            self.expect(']')
+        elif type == 'MATRIX':
+            self.pos = pos + 1
+            left = AST.Matrix(self.values[pos], self.lines[pos])
+        else:
+            left = self.term()
+
+        nonassoc = None
+        while True:
+            pos = self.pos
+            operator = OPERATORS.get(types[pos])
+            if operator is None:
+                return left
+            level, assoc, node = operator
+            if level < min_level:
+                return left
+            if level == nonassoc:
+                raise ParseError(pos)
+            self.pos = pos + 1
+            if node is None:
+                left = AST.MatTransExpr(left)
+                continue
+            right = self.expr(level if assoc == 'right' else level + 1)
+            left = node(self.values[pos], left, right)
+            nonassoc = level if assoc == 'nonassoc' else None
+
+    def vector(self) -> AST.Vector:
+        types = self.types
+        vector = AST.Vector([self.expr(0)] if types[self.pos] in EXPR_START else [])
+        while types[self.pos] == ',':
+            self.pos += 1
+            vector.expr_set.append(self.expr(0))
+        return vector
+
+    def indices(self) -> AST.Vector:
+        types = self.types
+        indices = AST.Vector([self.subscript()] if types[self.pos] in INDEX_START else [])
+        while types[self.pos] == ',':
+            self.pos += 1
+            indices.expr_set.append(self.subscript())
+        return indices
+
+    def subscript(self) -> AST.Expr:
+        pos = self.pos
+        if self.types[pos] == ':':
+            self.pos = pos + 1
+            return AST.Slice(lineno=self.lines[pos])
+        beg = self.expr(0)
+        if self.types[self.pos] != ':':
+            return beg
+        self.pos += 1
+        return AST.Slice(beg, self.expr(0))
+
+    def term(self) -> AST.Term:
+        pos = self.pos
+        type = self.types[pos]
+        self.pos = pos + 1
+        if type == 'ID':
+            term = AST.Id(self.values[pos], self.lines[pos])
+        elif type == 'INTNUM':
+            term = AST.IntNum(self.values[pos], self.lines[pos])
+        elif type == 'FLOATNUM':
+            term = AST.FloatNum(self.values[pos], self.lines[pos])
+        elif type == 'STRING':
+            term = AST.String(self.values[pos], self.lines[pos])
+        elif type in SPECIAL:
+            self.expect('(')
+            term = SPECIAL[type](self.vector())
+            self.expect(')')
+        elif type == 'EYE':
+            self.expect('(')
+            term = AST.Eye(self.expr(0))
+            self.expect(')')
+        else:
+            raise ParseError(pos)
+
+        while self.types[self.pos] == '[':
+            self.pos += 1
+            idxs = self.indices()
+            self.expect(']')
+            term = AST.Ref(term, idxs)
+        return term
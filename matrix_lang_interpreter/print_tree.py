@@ -1,5 +1,6 @@
 from matrix_lang_interpreter import AST
 from matrix_lang_interpreter.add_to_class import addToClass
+from matrix_lang_interpreter.ast_utils import deep_recursion
 
 
 class TreePrinter:
@@ -8,6 +9,7 @@ class TreePrinter:
         print(' | ' * indent, end='')
 
     @addToClass(AST.AST)
+    @deep_recursion()
     def printTree(self, indent=0):
         for stmt in self.stmt_set:
             stmt.printTree(indent)
@@ -70,6 +72,19 @@ class TreePrinter:
 
         self.stmt.printTree(indent+1)
 
+    @addToClass(AST.LoopNest)
+    def printTree(self, indent):
+        TreePrinter.printIndent(indent)
+        print('NEST')
+
+        TreePrinter.printIndent(indent+1)
+        print(self.program)
+
+        for expr in self.args:
+            expr.printTree(indent+1)
+
+        self.loop.printTree(indent+1)
+
     @addToClass(AST.Break)
     def printTree(self, indent):
         TreePrinter.printIndent(indent)
@@ -104,6 +119,25 @@ class TreePrinter:
         self.left.printTree(indent+1)
         self.right.printTree(indent+1)
 
+    @addToClass(AST.MatMulChain)
+    def printTree(self, indent):
+        TreePrinter.printIndent(indent)
+        print('@ CHAIN')
+
+        for expr in self.expr_set:
+            expr.printTree(indent+1)
+
+    @addToClass(AST.RangeReduce)
+    def printTree(self, indent):
+        TreePrinter.printIndent(indent)
+        print(f'REDUCE {self.op}')
+
+        TreePrinter.printIndent(indent+1)
+        print(self.program)
+
+        for expr in self.args:
+            expr.printTree(indent+1)
+
     @addToClass(AST.MatTransExpr)
     def printTree(self, indent):
         TreePrinter.printIndent(indent)
@@ -134,6 +168,24 @@ class TreePrinter:
         for expr in self.expr_set:
             expr.printTree(indent+1)
 
+    @addToClass(AST.Matrix)
+    def printTree(self, indent):
+        # the Vector of numbers the Parser builds for the literal
+        def printValue(value, indent):
+            TreePrinter.printIndent(indent)
+            if value.ndim:
+                print('VECTOR')
+                for row in value:
+                    printValue(row, indent+1)
+            elif value < 0:
+                print('-')
+                TreePrinter.printIndent(indent+1)
+                print(-value.item())
+            else:
+                print(value.item())
+
+        printValue(self.value, indent)
+
     @addToClass(AST.SpecialMatrix)
     def printTree(self, indent):
         TreePrinter.printIndent(indent)
@@ -149,6 +201,15 @@ class TreePrinter:
         self.term.printTree(indent+1)
         self.idxs.printTree(indent+1)
 
+    @addToClass(AST.Slice)
+    def printTree(self, indent):
+        TreePrinter.printIndent(indent)
+        print(':')
+
+        for bound in (self.beg, self.end):
+            if bound is not None:
+                bound.printTree(indent+1)
+
     @addToClass(AST.Id)
     def printTree(self, indent):
         TreePrinter.printIndent(indent)
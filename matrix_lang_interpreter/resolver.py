@@ -0,0 +1,158 @@
+from typing import List, Dict, Tuple, Optional
+from matrix_lang_interpreter import AST
+
+
+Slot = Tuple[int, int]
+
+
+class Scope:
+    def __init__(self, parent: Optional['Scope']):
+        self.parent = parent
+        self.names: Dict[str, int] = {}
+        self._depth: Optional[int] = None
+
+    def declare(self, name: str) -> Tuple['Scope', int]:
+        self.names[name] = len(self.names)
+        return (self, self.names[name])
+
+    @property
+    def depth(self) -> int:
+        """Index of the scope's frame; scopes without variables get no frame.
+
+        Only asked for once all scopes are complete, so it is cached.
+        """
+        chain, scope = [], self
+        while scope is not None and scope._depth is None:
+            chain.append(scope)
+            scope = scope.parent
+        for scope in reversed(chain):
+            parent = scope.parent
+            scope._depth = 0 if parent is None else (
+                parent._depth + bool(parent.names or parent.parent is None)
+            )
+        return self._depth
+
+
+class Resolver:
+    """Assigns every variable a (scope depth, slot index) pair ahead of time.
+
+    Scopes follow the interpreter's frames: the program, every Block, If,
+    IfElse (one scope for both branches), While and For statement.  After
+    resolution:
+
+    - every scope node has ``frame_size``, the number of slots its frame needs.
+      A scope declaring no variable has size 0 and gets no frame at all, it
+      does not count in the depth of the scopes nested in it,
+    - every ``AST.Id`` has ``slot``, the innermost declaration of the name,
+    - every assigned ``AST.Id``, and the ``AST.Id`` indexed by an element
+      assignment, also has ``aliases``, the outer declarations of the same
+      name.  Assignment writes all of them, which only matters for a for
+      loop variable shadowing an outer variable.
+    """
+
+    def __init__(self):
+        self.scopes: List[Scope] = []
+        self.ids: Dict[int, AST.Id] = {}
+
+    def resolve(self, node: AST.AST) -> AST.AST:
+        self.scopes = []
+        self.ids = {}
+        self.visit(node)
+
+        # depths are known once every scope has declared its variables
+        for name in self.ids.values():
+            scope, index = name.slot
+            name.slot = (scope.depth, index)
+            if hasattr(name, 'aliases'):
+                name.aliases = tuple((scope.depth, index) for scope, index in name.aliases)
+        return node
+
+    def visit(self, node):
+        # visitors are generators yielding the children to visit next, so
+        # that deeply nested programs do not exhaust the Python stack
+        stack = []
+        while True:
+            method = 'visit_' + node.__class__.__name__
+            visitor = getattr(self, method, self.generic_visit)(node)
+            if visitor is not None:
+                stack.append(visitor)
+            while stack:
+                try:
+                    node = next(stack[-1])
+                    break
+                except StopIteration:
+                    stack.pop()
+            else:
+                return
+
+    def generic_visit(self, node):
+        for value in vars(node).values():
+            if isinstance(value, list):
+                for child in value:
+                    if isinstance(child, AST.Node):
+                        yield child
+            elif isinstance(value, AST.Node):
+                yield value
+
+    def scoped(self, node: AST.Node, *children: AST.Node):
+        scope = Scope(self.scopes[-1] if self.scopes else None)
+        self.scopes.append(scope)
+        yield from children
+        self.scopes.pop()
+        node.frame_size = len(scope.names)
+
+    def lookup(self, name: str) -> List[Tuple[Scope, int]]:
+        return [
+            (scope, scope.names[name])
+            for scope in reversed(self.scopes)
+            if name in scope.names
+        ]
+
+    def visit_AST(self, node: AST.AST):
+        return self.scoped(node, *node.stmt_set)
+
+    def visit_Block(self, node: AST.Block):
+        return self.scoped(node, *node.stmt_set)
+
+    def visit_IfStmt(self, node: AST.IfStmt):
+        return self.scoped(node, node.cond, node.stmt)
+
+    def visit_IfElseStmt(self, node: AST.IfElseStmt):
+        return self.scoped(node, node.cond, node.stmt, node.elseStmt)
+
+    def visit_WhileLoop(self, node: AST.WhileLoop):
+        return self.scoped(node, node.cond, node.stmt)
+
+    def visit_ForLoop(self, node: AST.ForLoop):
+        yield node.beg
+        yield node.end
+
+        aliases = self.lookup(node.id.id)
+        scope = Scope(self.scopes[-1])
+        self.scopes.append(scope)
+        node.id.slot = scope.declare(node.id.id)
+        node.id.aliases = tuple(aliases)
+        self.ids[id(node.id)] = node.id
+        yield node.stmt
+        self.scopes.pop()
+        node.frame_size = len(scope.names)
+
+    def visit_AssignStmt(self, node: AST.AssignStmt):
+        yield node.expr
+        if isinstance(node.lvalue, AST.Id):
+            slots = self.lookup(node.lvalue.id) or [self.scopes[-1].declare(node.lvalue.id)]
+            node.lvalue.slot, *aliases = slots
+            node.lvalue.aliases = tuple(aliases)
+            self.ids[id(node.lvalue)] = node.lvalue
+        else:
+            yield node.lvalue
+            term = node.lvalue.term
+            if isinstance(term, AST.Id):
+                # a shared array is copied into the variable before the
+                # element assignment
+                term.aliases = tuple(self.lookup(term.id)[1:])
+
+    def visit_Id(self, node: AST.Id):
+        slots = self.lookup(node.id) or [self.scopes[-1].declare(node.id)]
+        node.slot = slots[0]
+        self.ids[id(node)] = node
@@ -0,0 +1,4 @@
+# Statements evaluate to None when they complete normally, or to one of
+# these signals when a break or continue unwinds to the enclosing loop.
+BREAK = 1
+CONTINUE = 2
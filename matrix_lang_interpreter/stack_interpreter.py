@@ -0,0 +1,365 @@
+import operator
+from functools import partial
+from typing import List
+import numpy as np
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes
+from matrix_lang_interpreter.lowering import constant_vector, may_alias, vector_shape
+from matrix_lang_interpreter.memory import Frame, allocate_frames
+from matrix_lang_interpreter.resolver import Resolver
+from matrix_lang_interpreter.exceptions import *
+from matrix_lang_interpreter.dispatcher import *
+from matrix_lang_interpreter.operations import *
+
+
+class StackInterpreter:
+    """Runs the AST with an explicit work stack and value stack.
+
+    Nothing is evaluated recursively, so how deeply a program nests is
+    limited by memory and not by the Python stack.  A work item is a
+    ``(function, node, argument)`` triple.  ``eval`` of a node pushes the
+    continuation finishing it and then its children, which leave their
+    values on ``values`` for the continuation to pop.
+
+    Loops leave a back edge item (``while_loop``, ``for_next``) below
+    their body; break and continue unwind the work stack to it, running
+    the ``leave`` items of the scopes they exit on the way.
+    """
+
+    def __init__(self):
+        self.frames: List[Frame] = []
+        self.work: List[tuple] = []
+        self.values: List[object] = []
+
+    def load(self, node: AST.Id):
+        depth, slot = node.slot
+        return self.frames[depth].values[slot]
+
+    def store(self, node: AST.Id, value):
+        depth, slot = node.slot
+        self.frames[depth].values[slot] = value
+        for depth, slot in node.aliases:
+            self.frames[depth].values[slot] = value
+
+    def run(self, node: AST.AST):
+        Resolver().resolve(node)
+        # inner vectors first, so that nested literals are not folded
+        # recursively
+        for child in reversed(list(iter_nodes(node))):
+            if isinstance(child, AST.Vector):
+                constant_vector(child)
+        allocate_frames(node)
+        self.frames = [Frame(node.frame_size)]
+        self.work = []
+        self.values = []
+        self.push_all(node.stmt_set)
+        try:
+            work = self.work
+            while work:
+                function, node, argument = work.pop()
+                function(self, node, argument)
+        except ReturnValueException as e:
+            list(map(print, e.values))
+
+    def push(self, node: AST.Node):
+        self.work.append((EVAL[node.__class__], node, None))
+
+    def push_all(self, nodes: List[AST.Node]):
+        for node in reversed(nodes):
+            self.push(node)
+
+    def then(self, function, node: AST.Node, argument=None):
+        self.work.append((function, node, argument))
+
+    def pop(self, n: int) -> list:
+        values = self.values[len(self.values) - n:]
+        del self.values[len(self.values) - n:]
+        return values
+
+    def enter(self, node: AST.Node):
+        if node.frame_size:
+            self.frames.append(node.frame)
+            self.then(StackInterpreter.leave, node)
+
+    # continuations
+
+    def leave(self, node: AST.Node, _):
+        self.frames.pop().clear()
+
+    def unwind(self, continuing: bool):
+        work = self.work
+        while True:
+            item = work.pop()
+            if item[0] is StackInterpreter.leave:
+                self.leave(item[1], None)
+            elif item[0] in BACK_EDGES:
+                if continuing:
+                    work.append(item)
+                return
+
+    def unary(self, node: AST.Node, function):
+        self.values.append(function(self.values.pop()))
+
+    def binary(self, node: AST.Node, function):
+        right = self.values.pop()
+        left = self.values.pop()
+        self.values.append(function(left, right))
+
+    def collect(self, node: AST.Node, function):
+        n = len(node.args if isinstance(node, AST.RangeReduce) else node.expr_set)
+        self.values.append(function(self.pop(n)))
+
+    def fill(self, node: AST.Vector, shape: tuple):
+        self.values.append(fill_vector(self.pop(len(node.expr_set)), shape))
+
+    def ref(self, node: AST.Ref, _):
+        term, *idxs = self.pop(len(node.idxs.expr_set) + 1)
+        self.values.append(term[tuple(idxs)])
+
+    def assign(self, node: AST.AssignStmt, _):
+        value = self.values.pop()
+        self.store(node.lvalue, share(value) if may_alias(node.expr) else value)
+
+    def assign_ref(self, node: AST.AssignStmt, _):
+        value, *idxs = self.pop(len(node.lvalue.idxs.expr_set) + 1)
+        vec = self.load(node.lvalue.term)
+        if shared(vec):
+            vec = vec.copy()
+            self.store(node.lvalue.term, vec)
+        vec[tuple(idxs)] = value
+
+    def print_value(self, node: AST.Expr, _):
+        print(self.values.pop())
+
+    def return_values(self, node: AST.Return, _):
+        raise ReturnValueException(self.pop(len(node.expr_set)))
+
+    def branch(self, node: AST.IfStmt, _):
+        if self.values.pop():
+            self.push(node.stmt)
+        elif isinstance(node, AST.IfElseStmt):
+            self.push(node.elseStmt)
+
+    def while_loop(self, node: AST.WhileLoop, _):
+        self.then(StackInterpreter.while_test, node)
+        self.push(node.cond)
+
+    def while_test(self, node: AST.WhileLoop, _):
+        if self.values.pop():
+            self.then(StackInterpreter.while_loop, node)
+            self.push(node.stmt)
+
+    def for_begin(self, node: AST.ForLoop, _):
+        beg, end = self.pop(2)
+        node.frame.values[node.id.slot[1]] = beg
+        self.frames.append(node.frame)
+        self.then(StackInterpreter.leave, node)
+        self.for_test(node, end)
+
+    def for_test(self, node: AST.ForLoop, end):
+        # the increment uses the value read at the top of the iteration, so
+        # assignments to the variable in the body never change the sequence
+        i = node.frame.values[node.id.slot[1]]
+        if i < end:
+            self.then(StackInterpreter.for_next, node, (i, end))
+            self.push(node.stmt)
+
+    def for_next(self, node: AST.ForLoop, argument):
+        i, end = argument
+        self.store(node.id, i + 1)
+        self.for_test(node, end)
+
+    def loop_nest(self, node: AST.LoopNest, _):
+        if not assign_nest(node.program, self.pop(len(node.args))):
+            self.push(node.loop)
+
+    # starting nodes
+
+    @on('node')
+    def eval(self, node, _):
+        pass
+
+    @when(AST.Block)
+    def eval(self, node: AST.Block, _):
+        self.enter(node)
+        self.push_all(node.stmt_set)
+
+    @when(AST.AssignStmt)
+    def eval(self, node: AST.AssignStmt, _):
+        if isinstance(node.lvalue, AST.Id):
+            self.then(StackInterpreter.assign, node)
+        else:
+            self.then(StackInterpreter.assign_ref, node)
+            self.push_all(node.lvalue.idxs.expr_set)
+        self.push(node.expr)
+
+    @when(AST.IfStmt)
+    def eval(self, node: AST.IfStmt, _):
+        self.enter(node)
+        self.then(StackInterpreter.branch, node)
+        self.push(node.cond)
+
+    @when(AST.WhileLoop)
+    def eval(self, node: AST.WhileLoop, _):
+        self.enter(node)
+        self.while_loop(node, None)
+
+    @when(AST.ForLoop)
+    def eval(self, node: AST.ForLoop, _):
+        self.then(StackInterpreter.for_begin, node)
+        self.push(node.end)
+        self.push(node.beg)
+
+    @when(AST.LoopNest)
+    def eval(self, node: AST.LoopNest, _):
+        self.then(StackInterpreter.loop_nest, node)
+        self.push_all(node.args)
+
+    @when(AST.Break)
+    def eval(self, node: AST.Break, _):
+        self.unwind(continuing=False)
+
+    @when(AST.Continue)
+    def eval(self, node: AST.Continue, _):
+        self.unwind(continuing=True)
+
+    @when(AST.Print)
+    def eval(self, node: AST.Print, _):
+        for expr in reversed(node.expr_set):
+            self.then(StackInterpreter.print_value, expr)
+            self.push(expr)
+
+    @when(AST.Return)
+    def eval(self, node: AST.Return, _):
+        self.then(StackInterpreter.return_values, node)
+        self.push_all(node.expr_set)
+
+    @when(AST.BinExpr)
+    def eval(self, node: AST.BinExpr, _):
+        self.then(StackInterpreter.binary, node, BINARY_OPERATIONS[node.op])
+        self.push(node.right)
+        self.push(node.left)
+
+    @when(AST.BoundBinExpr)
+    def eval(self, node: AST.BoundBinExpr, _):
+        self.then(StackInterpreter.binary, node, node.fn)
+        self.push(node.right)
+        self.push(node.left)
+
+    @when(AST.IntDivExpr)
+    def eval(self, node: AST.IntDivExpr, _):
+        self.then(StackInterpreter.binary, node, operator.floordiv)
+        self.push(node.right)
+        self.push(node.left)
+
+    @when(AST.TrueDivExpr)
+    def eval(self, node: AST.TrueDivExpr, _):
+        self.then(StackInterpreter.binary, node, operator.truediv)
+        self.push(node.right)
+        self.push(node.left)
+
+    @when(AST.MatMulBinExpr)
+    def eval(self, node: AST.MatMulBinExpr, _):
+        self.then(StackInterpreter.binary, node, np.matmul)
+        self.push(node.right)
+        self.push(node.left)
+
+    @when(AST.RelationExpr)
+    def eval(self, node: AST.RelationExpr, _):
+        self.then(StackInterpreter.binary, node, RELATION_OPERATIONS[node.op])
+        self.push(node.right)
+        self.push(node.left)
+
+    @when(AST.BoundRelationExpr)
+    def eval(self, node: AST.BoundRelationExpr, _):
+        self.then(StackInterpreter.binary, node, node.fn)
+        self.push(node.right)
+        self.push(node.left)
+
+    @when(AST.MatMulChain)
+    def eval(self, node: AST.MatMulChain, _):
+        self.then(StackInterpreter.collect, node, matmul_chain)
+        self.push_all(node.expr_set)
+
+    @when(AST.RangeReduce)
+    def eval(self, node: AST.RangeReduce, _):
+        function = partial(reduce_range, node.op, node.program, node.exact)
+        self.then(StackInterpreter.collect, node, function)
+        self.push_all(node.args)
+
+    @when(AST.UnExpr)
+    def eval(self, node: AST.UnExpr, _):
+        self.then(StackInterpreter.unary, node, UNARY_OPERATIONS[node.op])
+        self.push(node.child)
+
+    @when(AST.MatTransExpr)
+    def eval(self, node: AST.MatTransExpr, _):
+        self.then(StackInterpreter.unary, node, operator.attrgetter('T'))
+        self.push(node.child)
+
+    @when(AST.Vector)
+    def eval(self, node: AST.Vector, _):
+        value = constant_vector(node)
+        if value is not None:
+            self.values.append(value)
+            return
+        shape = vector_shape(node)
+        if shape is not None:
+            self.then(StackInterpreter.fill, node, shape)
+        else:
+            self.then(StackInterpreter.collect, node, build_vector)
+        self.push_all(node.expr_set)
+
+    @when(AST.Zeros)
+    def eval(self, node: AST.Zeros, _):
+        self.then(StackInterpreter.unary, node, np.zeros)
+        self.push(node.size)
+
+    @when(AST.Ones)
+    def eval(self, node: AST.Ones, _):
+        self.then(StackInterpreter.unary, node, np.ones)
+        self.push(node.size)
+
+    @when(AST.Eye)
+    def eval(self, node: AST.Eye, _):
+        self.then(StackInterpreter.unary, node, partial(np.eye, dtype=int))
+        self.push(node.size)
+
+    @when(AST.Ref)
+    def eval(self, node: AST.Ref, _):
+        self.then(StackInterpreter.ref, node)
+        self.push_all(node.idxs.expr_set)
+        self.push(node.term)
+
+    @when(AST.Slice)
+    def eval(self, node: AST.Slice, _):
+        if node.beg is None and node.end is None:
+            self.values.append(slice(None))
+            return
+        self.then(StackInterpreter.binary, node, slice)
+        self.push(node.end)
+        self.push(node.beg)
+
+    @when(AST.Id)
+    def eval(self, node: AST.Id, _):
+        self.values.append(self.load(node))
+
+    @when(AST.IntNum)
+    def eval(self, node: AST.IntNum, _):
+        self.values.append(node.n)
+
+    @when(AST.FloatNum)
+    def eval(self, node: AST.FloatNum, _):
+        self.values.append(node.n)
+
+    @when(AST.String)
+    def eval(self, node: AST.String, _):
+        self.values.append(node.s)
+
+    @when(AST.Matrix)
+    def eval(self, node: AST.Matrix, _):
+        self.values.append(node.value)
+
+
+EVAL = StackInterpreter.eval.dispatcher.freeze()
+BACK_EDGES = (StackInterpreter.while_loop, StackInterpreter.for_next)
@@ -0,0 +1,197 @@
+import re
+import json
+from array import array
+import numpy as np
+from typing import Iterator, List, TextIO
+from sly.lex import Token
+from matrix_lang_interpreter.scanner import Scanner
+
+
+# token types by code, the tokens of the Scanner followed by its literals
+# and the MATRIX of dense literals
+TYPES = (*sorted(Scanner.tokens), *sorted(Scanner.literals), 'MATRIX')
+CODES = {type: code for code, type in enumerate(TYPES)}
+KEYWORDS = Scanner._remapping['ID']
+
+# a '[' after these indexes the term before it instead of opening a literal
+TERM_ENDS = {CODES[type] for type in ('ID', 'INTNUM', 'FLOATNUM', 'STRING', ')', ']', 'MATRIX')}
+MATRIX = CODES['MATRIX']
+
+# the Scanner's own master regex after the characters it ignores, then the
+# literals and bad characters it handles when the regex fails to match
+PATTERN = re.compile(f'[{re.escape(Scanner.ignore)}]*(?:' + '|'.join([
+    Scanner._master_re.pattern,
+    f'(?P<literal>[{"".join(map(re.escape, sorted(Scanner.literals)))}])',
+    '(?P<error>.)',
+]) + ')')
+
+# dense literals are JSON arrays of numbers, which the Scanner reads alike
+# unless they hold one of these (true, false, NaN, Infinity or a carriage
+# return); an integer among floats is a type error the TypeChecker has to
+# report, so such literals are scanned token by token
+DENSE_DECODER = json.JSONDecoder()
+NOT_DENSE = 'tfNI\r'
+DENSE_INT = re.compile(r'(?<![\d.eE+\-])-?\d+(?![\d.eE])')
+FIRST_NUMBER = re.compile(r'[\d\-]')
+
+CHUNK_SIZE = 1 << 20
+
+
+class TokenArray:
+    """Tokens stored in parallel arrays of type codes, values and lines.
+
+    Iterating creates the ``Token`` objects the SLY parser expects one at
+    a time; their ``index`` is the position in the array.
+    """
+
+    __slots__ = ('types', 'values', 'lines')
+
+    def __init__(self):
+        self.types = array('B')
+        self.values: List[object] = []
+        self.lines = array('L')
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __iter__(self) -> Iterator[Token]:
+        for index, (code, value, lineno) in enumerate(zip(self.types, self.values, self.lines)):
+            token = Token()
+            token.type = TYPES[code]
+            token.value = value
+            token.lineno = lineno
+            token.index = index
+            yield token
+
+    def type(self, index: int) -> str:
+        return TYPES[self.types[index]]
+
+
+class StreamScanner:
+    """Scanner reading the source in chunks into a TokenArray.
+
+    It accepts the same tokens as the Scanner, with one combined regex
+    match per lexeme.  Chunks are cut after a newline, which no token
+    spans, so tokens never straddle two chunks.  Bad characters are
+    reported while scanning, before the parser reports anything.
+
+    With ``dense_literals`` a bracketed literal of numbers only, all
+    integers or all floats and rectangular, becomes a single MATRIX token
+    holding its NumPy array, decoded in one pass instead of a token per
+    number.  Only the PrattParser knows this token.
+    """
+
+    def __init__(self, dense_literals: bool = False):
+        self.lineno = 1
+        self.dense_literals = dense_literals
+
+    def scan(self, text: str) -> TokenArray:
+        self.lineno = 1
+        tokens = TokenArray()
+        self.scan_chunk(text, tokens)
+        return tokens
+
+    def scan_file(self, file: TextIO, chunk_size: int = CHUNK_SIZE) -> TokenArray:
+        self.lineno = 1
+        tokens = TokenArray()
+        rest = ''
+        size = chunk_size
+        while chunk := file.read(size):
+            chunk = rest + chunk
+            end = chunk.rfind('\n') + 1
+            end = self.scan_chunk(chunk[:end], tokens, final=False)
+            rest = chunk[end:]
+            # a dense literal running to the end of the chunk is scanned
+            # again with the next one, which grows with it so that a long
+            # literal is decoded only a few times
+            size = max(chunk_size, len(rest))
+        self.scan_chunk(rest, tokens)
+        return tokens
+
+    def tokenize(self, text: str) -> Iterator[Token]:
+        return iter(self.scan(text))
+
+    def scan_chunk(self, text: str, tokens: TokenArray, final: bool = True) -> int:
+        """Appends the tokens of the text, returns where scanning stopped."""
+        types, values, lines = tokens.types, tokens.values, tokens.lines
+        lineno = self.lineno
+        pos = 0
+        while pos < len(text):
+            resume = len(text)
+            for match in PATTERN.finditer(text, pos):
+                kind = match.lastgroup
+                value = match.group(kind)
+                if kind == 'INTNUM':
+                    value = int(value)
+                elif kind == 'FLOATNUM':
+                    value = float(value)
+                elif kind == 'literal':
+                    if value == '[' and self.dense_literals and (not types or types[-1] not in TERM_ENDS):
+                        start = match.end() - 1
+                        dense = self.dense_literal(text, start, final)
+                        if dense is not None:
+                            if dense is False:
+                                self.lineno = lineno
+                                return start
+                            matrix, end = dense
+                            number = FIRST_NUMBER.search(text, start).start()
+                            types.append(MATRIX)
+                            values.append(matrix)
+                            lines.append(lineno + text.count('\n', start, number))
+                            lineno += text.count('\n', start, end)
+                            resume = end
+                            break
+                    kind = value
+                elif kind == 'ID':
+                    kind = KEYWORDS.get(value, kind)
+                elif kind == 'STRING':
+                    value = value[1:-1]
+                elif kind == 'newline':
+                    lineno += len(value)
+                    continue
+                elif kind == 'error':
+                    print(f"Line {lineno:3}: Scanner: Bad character: {value}")
+                    continue
+                elif kind == 'comment':
+                    continue
+                types.append(CODES[kind])
+                values.append(value)
+                lines.append(lineno)
+            pos = resume
+        self.lineno = lineno
+        return len(text)
+
+    @staticmethod
+    def dense_literal(text: str, start: int, final: bool):
+        """(array, end) of the dense literal at start, None if there is none.
+
+        False when it may go on in the text after this chunk.
+        """
+        try:
+            value, end = DENSE_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            return False if e.pos == len(text) and not final else None
+        try:
+            matrix = np.array(value)
+        except ValueError:
+            # ragged
+            return None
+        # strings, null and nested objects leave no numeric dtype
+        if matrix.size == 0 or matrix.dtype.kind not in 'if':
+            return None
+        # the engines stack deeper literals into two dims, as build_vector
+        # does
+        if matrix.ndim > 2:
+            return None
+        if any(text.find(char, start, end) >= 0 for char in NOT_DENSE):
+            return None
+        # every float has at most one '.', so when they match the numbers
+        # there is no integer
+        if (
+            matrix.dtype.kind == 'f' and text.count('.', start, end) != matrix.size
+            and DENSE_INT.search(text, start, end)
+        ):
+            return None
+        # the engines share it, like the value of any constant literal
+        matrix.flags.writeable = False
+        return matrix, end
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 
 @dataclass
@@ -13,17 +13,28 @@ class VariableSymbol(Symbol):
     name: str = ''
 
 class SymbolTable:
-    def __init__(self, parent: Optional['SymbolTable'] = None):
+    """Nested scopes of symbols, used through the root table.
+
+    The root keeps a pointer to the current scope and, for every name, a
+    stack of its bindings from the outermost to the innermost scope, so
+    ``get``, ``put``, ``pushScope`` and ``popScope`` take constant time
+    whatever the depth.  A popped scope is dropped unless the table was
+    created with ``keep_scopes``, which records every scope in its
+    parent's ``children`` for ``printScopeRecursive``.
+    """
+
+    def __init__(self, parent: Optional['SymbolTable'] = None, keep_scopes: bool = False):
         self.parent: SymbolTable = parent
         self.table = {}
         self.children = []
         self.child: SymbolTable = None
+        self.current: SymbolTable = self
+        # scopes share the bindings of the root
+        self.bindings: Dict[str, List[VariableSymbol]] = {} if parent is None else parent.bindings
+        self.keep_scopes = keep_scopes
 
     def getCurrentScope(self) -> 'SymbolTable':
-        ptr = self
-        while ptr.child is not None:
-            ptr = ptr.child
-        return ptr
+        return self.current
 
     def printScopeRecursive(self, indent: int = 0):
         print(indent * '    ', end='')
@@ -39,26 +50,31 @@ class SymbolTable:
         print('}')
 
     def put(self, name: str, symbol: VariableSymbol):
-        ptr = self.getCurrentScope()
+        ptr = self.current
+        if name in ptr.table:
+            self.bindings[name][-1] = symbol
+        else:
+            self.bindings.setdefault(name, []).append(symbol)
         ptr.table[name] = symbol
 
     def get(self, name: str) -> Optional[VariableSymbol]:
-        ptr = self.getCurrentScope()
-        symbol = ptr.table.get(name, None)
-        ptr = ptr.parent
-
-        while ptr is not None and symbol is None:
-            symbol = ptr.table.get(name, None)
-            ptr = ptr.parent
-
-        return symbol
+        symbols = self.bindings.get(name)
+        return symbols[-1] if symbols else None
 
     def pushScope(self):
-        ptr = self.getCurrentScope()
+        ptr = self.current
         ptr.child = SymbolTable(ptr)
-        ptr.children.append(ptr.child)
+        if self.keep_scopes:
+            ptr.children.append(ptr.child)
+        self.current = ptr.child
 
     def popScope(self):
-        ptr = self.getCurrentScope()
+        ptr = self.current
         if ptr.parent is not None:
+            for name in ptr.table:
+                symbols = self.bindings[name]
+                symbols.pop()
+                if not symbols:
+                    del self.bindings[name]
             ptr.parent.child = None
+            self.current = ptr.parent
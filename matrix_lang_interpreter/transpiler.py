@@ -0,0 +1,420 @@
+import os
+import sys
+import math
+import marshal
+import hashlib
+import importlib.util
+from types import CodeType
+from typing import List, Dict, Optional, Tuple, Union
+import numpy as np
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import first_lineno, deep_recursion
+from matrix_lang_interpreter.compiler import Compiler
+from matrix_lang_interpreter.exceptions import SourceRuntimeError
+from matrix_lang_interpreter.lowering import constant_vector, may_alias, vector_shape
+from matrix_lang_interpreter.operations import (
+    divide, build_vector, fill_vector, shared, share, matmul_chain, reduce_range, assign_nest
+)
+
+
+FILENAME = '<matrix-lang>'
+PROGRAM = '__program__'
+CONSTANTS = '_constants'
+
+# precedence levels of the Python operators arithmetic is emitted with
+LEVELS = {'+': 1, '-': 1, '*': 2, '//': 2, '/': 2}
+
+
+def for_range(beg, end):
+    if type(beg) is int and type(end) is int:
+        return range(beg, end)
+    return count(beg, end)
+
+def count(i, end):
+    while i < end:
+        yield i
+        i = i + 1
+
+def print_all(values):
+    for value in values:
+        print(value)
+
+
+RUNTIME = {
+    'np': np,
+    '_divide': divide,
+    '_vector': build_vector,
+    '_fill_vector': fill_vector,
+    '_shared': shared,
+    '_share': share,
+    '_matmul_chain': matmul_chain,
+    '_reduce_range': reduce_range,
+    '_assign_nest': assign_nest,
+    '_range': for_range,
+    '_print_all': print_all,
+}
+
+
+class Transpiler:
+    """Translates a checked AST into the source of a single Python function.
+
+    Variables become locals of that function, so scopes are flattened.
+    The type checker guarantees a variable is never read outside of the
+    scope which declared it, the only runtime-visible difference is a for
+    loop whose variable shadows an outer one: an assignment writes every
+    scope holding the name, so such loop variables get their own local
+    and every write to the name is applied to all of its aliases.
+
+    The arrays of Matrix literals and of constant vectors are not written
+    into the source but collected in ``constants``, which the program
+    shares with every evaluation of them.  An array assigned from another
+    variable is shared too, an element assignment copies a shared array
+    first.
+    """
+
+    def __init__(self):
+        self.lines: List[Tuple[int, str, int]] = []
+        self.scopes: List[Dict[str, List[str]]] = []
+        self.constants: List[np.ndarray] = []
+        self.indent = 0
+        self.counter = 0
+
+    def transpile(self, node: AST.AST) -> Tuple[str, List[int]]:
+        """Returns Python source and the source line of every Python line."""
+        self.lines = []
+        self.scopes = []
+        self.constants = []
+        self.indent = 0
+        self.emit(f'def {PROGRAM}():', 0)
+        self.suite(node)
+
+        source = '\n'.join('    ' * indent + code for indent, code, _ in self.lines) + '\n'
+        linenos = [0] + [lineno for _, _, lineno in self.lines]
+        return source, linenos
+
+    def emit(self, code: str, lineno: int):
+        self.lines.append((self.indent, code, lineno))
+
+    def suite(self, node: AST.Node):
+        self.indent += 1
+        start = len(self.lines)
+        self.scopes.append({})
+        self.visit(node)
+        self.scopes.pop()
+        if len(self.lines) == start:
+            self.emit('pass', 0)
+        self.indent -= 1
+
+    def fresh(self, prefix: str) -> str:
+        self.counter += 1
+        return f'_{prefix}{self.counter}'
+
+    @staticmethod
+    def local(name: str) -> str:
+        return 'v_' + name.replace('$', '_S')
+
+    def lookup(self, name: str) -> Optional[List[str]]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def declare(self, name: str) -> List[str]:
+        names = self.lookup(name)
+        if names is None:
+            names = self.scopes[-1][name] = [self.local(name)]
+        return names
+
+    def visit(self, node):
+        method = 'visit_' + node.__class__.__name__
+        return getattr(self, method)(node)
+
+    def visit_AST(self, node: AST.AST):
+        for stmt in node.stmt_set:
+            self.visit(stmt)
+
+    def visit_Block(self, node: AST.Block):
+        self.scopes.append({})
+        for stmt in node.stmt_set:
+            self.visit(stmt)
+        self.scopes.pop()
+
+    def visit_AssignStmt(self, node: AST.AssignStmt):
+        expr = self.visit(node.expr)
+        lineno = first_lineno(node)
+        if isinstance(node.lvalue, AST.Id):
+            if may_alias(node.expr):
+                expr = f'_share({expr})'
+            names = self.declare(node.lvalue.id)
+            self.emit(' = '.join(names) + f' = {expr}', lineno)
+        else:
+            term = node.lvalue.term
+            if isinstance(term, AST.Id):
+                names = self.lookup(term.id) or [self.local(term.id)]
+                self.emit(f'if _shared({names[0]}): ' + ' = '.join(names) + f' = {names[0]}.copy()', lineno)
+            self.emit(f'{self.visit(node.lvalue)} = {expr}', lineno)
+
+    def visit_IfStmt(self, node: AST.IfStmt):
+        self.emit(f'if {self.visit(node.cond)}:', first_lineno(node.cond))
+        self.suite(node.stmt)
+
+    def visit_IfElseStmt(self, node: AST.IfElseStmt):
+        self.emit(f'if {self.visit(node.cond)}:', first_lineno(node.cond))
+        self.suite(node.stmt)
+        self.emit('else:', first_lineno(node.cond))
+        self.suite(node.elseStmt)
+
+    def visit_WhileLoop(self, node: AST.WhileLoop):
+        self.emit(f'while {self.visit(node.cond)}:', first_lineno(node.cond))
+        self.suite(node.stmt)
+
+    def visit_ForLoop(self, node: AST.ForLoop):
+        lineno = node.id.lineno or first_lineno(node.beg)
+        beg = self.visit(node.beg)
+        end = self.visit(node.end)
+        outer = self.lookup(node.id.id)
+
+        if outer is None:
+            var = self.local(node.id.id)
+            self.emit(f'for {var} in _range({beg}, {end}):', lineno)
+            self.scopes.append({node.id.id: [var]})
+            self.suite(node.stmt)
+            self.scopes.pop()
+            return
+
+        var, top = self.fresh('loop'), self.fresh('top')
+        b, e = self.fresh('beg'), self.fresh('end')
+        self.emit(f'{b} = {beg}', lineno)
+        self.emit(f'{e} = {end}', lineno)
+        self.emit(f'for {top} in _range({b}, {e}):', lineno)
+        self.indent += 1
+        self.emit(f'if {top} != {b}:', lineno)
+        self.emit('    ' + ' = '.join(outer) + f' = {top}', lineno)
+        self.emit(f'{var} = {top}', lineno)
+        self.indent -= 1
+        self.scopes.append({node.id.id: [var, *outer]})
+        self.suite(node.stmt)
+        self.scopes.pop()
+        self.emit('else:', lineno)
+        self.indent += 1
+        self.emit(f'if {b} < {e}:', lineno)
+        self.emit('    ' + ' = '.join(outer) + f' = {top} + 1', lineno)
+        self.indent -= 1
+
+    def visit_LoopNest(self, node: AST.LoopNest):
+        args = ', '.join(map(self.visit, node.args))
+        self.emit(f'if not _assign_nest({node.program!r}, [{args}]):', first_lineno(node))
+        self.suite(node.loop)
+
+    def visit_Break(self, node: AST.Break):
+        self.emit('break', node.lineno)
+
+    def visit_Continue(self, node: AST.Continue):
+        self.emit('continue', node.lineno)
+
+    def visit_Print(self, node: AST.Print):
+        for expr in node.expr_set:
+            self.emit(f'print({self.visit(expr)})', first_lineno(expr))
+
+    def visit_Return(self, node: AST.Return):
+        exprs = ''.join(f'{self.visit(expr)}, ' for expr in node.expr_set)
+        self.emit(f'_print_all(({exprs}))', first_lineno(node))
+        self.emit('return', first_lineno(node))
+
+    @staticmethod
+    def operator(node: AST.Expr) -> Optional[str]:
+        """The Python operator the node is emitted with, if it is one."""
+        if isinstance(node, AST.IntDivExpr):
+            return '//'
+        if isinstance(node, AST.TrueDivExpr):
+            return '/'
+        if type(node) in (AST.BinExpr, AST.BoundBinExpr) and node.op in LEVELS and node.op != '/':
+            return node.op
+        return None
+
+    def chain(self, node: AST.BinExpr) -> str:
+        # left operands of the same or a higher level need no parentheses,
+        # which would otherwise nest as deep as a long sum is long
+        op = self.operator(node)
+        rights = []
+        while True:
+            rights.append((op, node.right))
+            node = node.left
+            left = self.operator(node)
+            if left is None or LEVELS[left] < LEVELS[op]:
+                break
+            op = left
+        code = self.visit(node)
+        for op, right in reversed(rights):
+            code += f' {op} {self.visit(right)}'
+        return f'({code})'
+
+    def visit_BinExpr(self, node: AST.BinExpr) -> str:
+        if node.op == '/':
+            return f'_divide({self.visit(node.left)}, {self.visit(node.right)})'
+        return self.chain(node)
+
+    visit_IntDivExpr = chain
+    visit_TrueDivExpr = chain
+
+    visit_BoundBinExpr = visit_BinExpr
+
+    def visit_MatMulBinExpr(self, node: AST.MatMulBinExpr) -> str:
+        return f'np.matmul({self.visit(node.left)}, {self.visit(node.right)})'
+
+    def visit_MatMulChain(self, node: AST.MatMulChain) -> str:
+        return f'_matmul_chain([{", ".join(map(self.visit, node.expr_set))}])'
+
+    def visit_RangeReduce(self, node: AST.RangeReduce) -> str:
+        args = ', '.join(map(self.visit, node.args))
+        return f'_reduce_range({node.op!r}, {node.program!r}, {node.exact!r}, [{args}])'
+
+    def visit_UnExpr(self, node: AST.UnExpr) -> str:
+        child = self.visit(node.child)
+        if node.op == '+':
+            return child
+        return f'({node.op}{child})'
+
+    visit_NegExpr = visit_UnExpr
+
+    def visit_MatTransExpr(self, node: AST.MatTransExpr) -> str:
+        return f'({self.visit(node.child)}).T'
+
+    def visit_RelationExpr(self, node: AST.RelationExpr) -> str:
+        return f'({self.visit(node.left)} {node.op} {self.visit(node.right)})'
+
+    visit_BoundRelationExpr = visit_RelationExpr
+
+    def visit_Vector(self, node: AST.Vector) -> str:
+        value = constant_vector(node)
+        if value is not None:
+            return self.constant(value)
+        elements = ", ".join(map(self.visit, node.expr_set))
+        shape = vector_shape(node)
+        if shape is not None:
+            return f'_fill_vector([{elements}], {shape!r})'
+        return f'_vector([{elements}])'
+
+    def visit_Matrix(self, node: AST.Matrix) -> str:
+        return self.constant(node.value)
+
+    def constant(self, value: np.ndarray) -> str:
+        self.constants.append(value)
+        return f'{CONSTANTS}[{len(self.constants) - 1}]'
+
+    def visit_Zeros(self, node: AST.Zeros) -> str:
+        return f'np.zeros({self.visit(node.size)})'
+
+    def visit_Ones(self, node: AST.Ones) -> str:
+        return f'np.ones({self.visit(node.size)})'
+
+    def visit_Eye(self, node: AST.Eye) -> str:
+        return f'np.eye({self.visit(node.size)}, dtype=int)'
+
+    def visit_Ref(self, node: AST.Ref) -> str:
+        idxs = ''.join(f'{self.visit(expr)}, ' for expr in node.idxs.expr_set)
+        return f'{self.visit(node.term)}[{idxs}]'
+
+    def visit_Slice(self, node: AST.Slice) -> str:
+        if node.beg is None and node.end is None:
+            return ':'
+        return f'{self.visit(node.beg)}:{self.visit(node.end)}'
+
+    def visit_Id(self, node: AST.Id) -> str:
+        names = self.lookup(node.id)
+        return names[0] if names is not None else self.local(node.id)
+
+    def visit_IntNum(self, node: AST.IntNum) -> str:
+        return repr(node.n)
+
+    def visit_FloatNum(self, node: AST.FloatNum) -> str:
+        if math.isfinite(node.n):
+            return repr(node.n)
+        return f'float({str(node.n)!r})'
+
+    def visit_String(self, node: AST.String) -> str:
+        return repr(node.s)
+
+
+class CodeCache:
+    """Marshalled code objects on disk, keyed by a hash of the generated source."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.environ.get(
+            'MATRIX_LANG_CACHE',
+            os.path.join(os.path.expanduser('~'), '.cache', 'matrix_lang_interpreter')
+        )
+
+    def path(self, source: str) -> str:
+        key = hashlib.sha256(importlib.util.MAGIC_NUMBER + source.encode()).hexdigest()
+        return os.path.join(self.directory, f'{key}.{sys.implementation.cache_tag}.marshal')
+
+    def load(self, source: str) -> Optional[CodeType]:
+        try:
+            with open(self.path(source), 'rb') as file:
+                return marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def store(self, source: str, code: CodeType):
+        path = self.path(source)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'wb') as file:
+                marshal.dump(code, file)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+
+
+class Program:
+    def __init__(self, code: CodeType, linenos: List[int], constants: List[np.ndarray] = ()):
+        self.code = code
+        self.linenos = linenos
+        self.constants = constants
+
+    def run(self):
+        namespace = dict(RUNTIME, **{CONSTANTS: self.constants})
+        exec(self.code, namespace)
+        try:
+            namespace[PROGRAM]()
+        except Exception as e:
+            lineno = self.source_lineno(e)
+            if not lineno:
+                raise
+            raise SourceRuntimeError(lineno, e) from e
+
+    def source_lineno(self, error: Exception) -> int:
+        lineno = 0
+        tb = error.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == FILENAME:
+                lineno = self.linenos[tb.tb_lineno]
+            tb = tb.tb_next
+        return lineno
+
+
+class ClosureProgram:
+    """A program Python does not compile, run by the closure Compiler."""
+
+    def __init__(self, node: AST.AST):
+        self.node = node
+
+    def run(self):
+        Compiler().run(self.node)
+
+
+@deep_recursion()
+def compile_program(node: AST.AST, cache: Optional[CodeCache] = None) -> Union[Program, ClosureProgram]:
+    transpiler = Transpiler()
+    source, linenos = transpiler.transpile(node)
+    code = cache.load(source) if cache is not None else None
+    if code is None:
+        try:
+            code = compile(source, FILENAME, 'exec')
+        except (SyntaxError, RecursionError):
+            # blocks nested deeper than Python allows
+            return ClosureProgram(node)
+        if cache is not None:
+            cache.store(source, code)
+    return Program(code, linenos, transpiler.constants)
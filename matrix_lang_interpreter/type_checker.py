@@ -2,6 +2,7 @@ from collections import defaultdict
 from functools import partial
 from matrix_lang_interpreter.writer_maybe import *
 from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import deep_recursion
 from matrix_lang_interpreter.symbol_table import *
 
 
@@ -9,7 +10,10 @@ class NodeVisitor:
     def visit(self, node) -> WriterMaybe[Symbol]:
         method = 'visit_' + node.__class__.__name__
         visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        result = visitor(node)
+        if isinstance(node, AST.Expr) and result.is_just():
+            node.type, node.shape = result.value.type, result.value.size
+        return result
 
     def generic_visit(self, node):
         return WriterNothing(f'TypeChecker: Encountered problem(s)')
@@ -36,6 +40,42 @@ class Types:
         ttype[op]['bool']['bool'] = 'bool'
         ttype[op]['string']['string'] = 'bool'
 
+    # a dim of None is the unknown length of a slice with computed bounds,
+    # which any length matches
+
+    @staticmethod
+    def same_dim(dim1, dim2) -> bool:
+        return dim1 is None or dim2 is None or dim1 == dim2
+
+    @staticmethod
+    def same_size(size1, size2) -> bool:
+        if size1 is None or size2 is None or len(size1) != len(size2):
+            return size1 == size2
+        return all(map(Types.same_dim, size1, size2))
+
+    @staticmethod
+    def join(size1, size2):
+        """The size of sizes which match, with the dims either one knows."""
+        if size1 is None or size2 is None:
+            return size1
+        return tuple(dim2 if dim1 is None else dim1 for dim1, dim2 in zip(size1, size2))
+
+    @staticmethod
+    def slice_length(node: AST.Slice, dim):
+        if node.beg is None and node.end is None:
+            return dim
+        if dim is not None and isinstance(node.beg, AST.IntNum) and isinstance(node.end, AST.IntNum):
+            return len(range(dim)[node.beg.n:node.end.n])
+        return None
+
+    @staticmethod
+    def ref_size(idxs: list, size: tuple) -> tuple:
+        """The size of a Ref, where a slice keeps its dim and an index drops it."""
+        return (
+            *(Types.slice_length(idx, dim) for idx, dim in zip(idxs, size) if isinstance(idx, AST.Slice)),
+            *size[len(idxs):],
+        )
+
 
 class TypeChecker(NodeVisitor):
     def __init__(self, debug=False):
@@ -44,6 +84,7 @@ class TypeChecker(NodeVisitor):
         self.assignmentState = False
         self.loopState = False
 
+    @deep_recursion()
     def visit_AST(self, node: AST.AST) -> WriterMaybe[Symbol]:
         return concat(
             [self.visit(stmt) for stmt in node.stmt_set],
@@ -68,6 +109,8 @@ class TypeChecker(NodeVisitor):
                 )
             lvalue.type = expr.type
             lvalue.size = expr.size
+            if isinstance(node.lvalue, AST.Id):
+                node.lvalue.type, node.lvalue.shape = expr.type, expr.size
             return WriterJust(
                 Symbol(None, None, lineno),
                 f'Line {lineno:3}: TypeChecker: check_assignment({lvalue}, {expr})' if self.debug else ''
@@ -161,6 +204,7 @@ class TypeChecker(NodeVisitor):
                 )
             id.type = 'int'
             id.size = ()
+            node.id.type, node.id.shape = 'int', ()
             return WriterJust(
                 id,
                 f'Line {lineno:3}: TypeChecker: check_forLoopId({id})' if self.debug else ''
@@ -252,13 +296,13 @@ class TypeChecker(NodeVisitor):
                     f'Line {lineno:3}: TypeChecker: BinExpr: wrong operator {op} for ' +
                     f'{s1.type} and {s2.type}'
                 )
-            if s1.size != s2.size:
+            if not Types.same_size(s1.size, s2.size):
                 return WriterNothing(
                     f'Line {lineno:3}: TypeChecker: BinExpr: incompatible sizes: ' +
                     f'{s1.size} and {s2.size}'
                 )
             return WriterJust(
-                Symbol(Types.ttype[op][s1.type][s2.type], s1.size, lineno),
+                Symbol(Types.ttype[op][s1.type][s2.type], Types.join(s1.size, s2.size), lineno),
                 f'Line {lineno:3}: TypeChecker: check_two_symbol_op({op}, {s1}, {s2})' if self.debug else ''
             )
         op = node.op
@@ -281,7 +325,7 @@ class TypeChecker(NodeVisitor):
                     f'Line {lineno:3}: TypeChecker: MatMulBinExpr: can multiply only ' +
                     f'vectors and matrices: {s1.size} and {s2.size}'
                 )
-            if s1.size[-1] != s2.size[0]:
+            if not Types.same_dim(s1.size[-1], s2.size[0]):
                 return WriterNothing(
                     f'Line {lineno:3}: TypeChecker: MatMulBinExpr: incompatible sizes: ' +
                     f'{s1.size} and {s2.size}'
@@ -316,7 +360,7 @@ class TypeChecker(NodeVisitor):
                     f'Line {lineno:3}: TypeChecker: RelationExpr: wrong operator ' +
                     f'{op} for {s1.type} and {s2.type}'
                 )
-            if s1.size != s2.size:
+            if not Types.same_size(s1.size, s2.size):
                 return WriterNothing(
                     f'Line {lineno:3}: TypeChecker: RelationExpr: incompatible sizes: ' +
                     f'{s1.size} and {s2.size}'
@@ -388,13 +432,13 @@ class TypeChecker(NodeVisitor):
                     f'Line {lineno:3}: TypeChecker: Vector: wrong type of elems: ' +
                     f'{expr1.type}, {expr2.type}'
                 )
-            if expr1.size != expr2.size:
+            if not Types.same_size(expr1.size, expr2.size):
                 return WriterNothing(
                     f'Line {lineno:3}: TypeChecker: Vector: wrong size of elems: ' +
                     f'{expr1.size}, {expr2.size}'
                 )
             return WriterJust(
-                Symbol(expr1.type, expr1.size, lineno),
+                Symbol(expr1.type, Types.join(expr1.size, expr2.size), lineno),
                 f'Line {lineno:3}: TypeChecker: check_vectorElems({expr1}, {expr2})' if self.debug else ''
             )
 
@@ -412,6 +456,14 @@ class TypeChecker(NodeVisitor):
         )
         return bind(m_expr, partial(check_vector, len(node.expr_set)))
 
+    def visit_Matrix(self, node: AST.Matrix) -> WriterMaybe[Symbol]:
+        lineno = node.lineno
+        type = 'int' if node.value.dtype.kind == 'i' else 'float'
+        return WriterJust(
+            Symbol(type, node.value.shape, lineno),
+            f'Line {lineno:3}: TypeChecker: visit_Matrix({node.value.shape})' if self.debug else ''
+        )
+
     def visit_Zeros(self, node: AST.Zeros) -> WriterMaybe[Symbol]:
         def check_sizeType(size: Symbol) -> WriterMaybe[Symbol]:
             lineno = size.lineno
@@ -475,7 +527,8 @@ class TypeChecker(NodeVisitor):
 
         def check_ref(idxs_symbol: Symbol, term: Symbol) -> WriterMaybe[Symbol]:
             lineno = idxs_symbol.lineno or term.lineno
-            idxs = tuple([expr.n for expr in node.idxs.expr_set])
+            # only literal indices can be checked against the size
+            idxs = tuple([getattr(expr, 'n', None) for expr in node.idxs.expr_set])
             if len(idxs) == 0:
                 return WriterNothing(f'Line {lineno:3}: TypeChecker: ref: no index given')
             if len(idxs) > len(term.size):
@@ -484,13 +537,13 @@ class TypeChecker(NodeVisitor):
                     f'larger than dim {len(term.size)}'
                 )
             for i in range(len(idxs)):
-                if idxs[i] >= term.size[i]:
+                if idxs[i] is not None and term.size[i] is not None and idxs[i] >= term.size[i]:
                     return WriterNothing(
                         f'Line {lineno:3}: TypeChecker: ref: ' +
                         f'accessing element outside of the vector: {idxs[i]} >= {term.size[i]}'
                     )
             return WriterJust(
-                VariableSymbol(term.type, (*term.size[len(idxs):],), lineno),
+                VariableSymbol(term.type, Types.ref_size(node.idxs.expr_set, term.size), lineno),
                 f'Line {lineno:3}: TypeChecker: check_ref({term})' if self.debug else ''
             )
 
@@ -500,6 +553,37 @@ class TypeChecker(NodeVisitor):
         m_term = self.visit(node.term)
         return bind2(m_idxs, m_term, check_ref)
 
+    def visit_Slice(self, node: AST.Slice) -> WriterMaybe[Symbol]:
+        # a slice checks as an int index, Types.ref_size gives its length
+        def check_bound(bound: Symbol) -> WriterMaybe[Symbol]:
+            lineno = bound.lineno
+            if bound.type != 'int' or bound.size != ():
+                return WriterNothing(
+                    f'Line {lineno:3}: TypeChecker: slice: wrong type of bound: ' +
+                    f'({bound.type}, {bound.size})'
+                )
+            return WriterJust(
+                bound,
+                f'Line {lineno:3}: TypeChecker: check_bound({bound})' if self.debug else ''
+            )
+
+        def check_slice(beg: Symbol, end: Symbol) -> WriterMaybe[Symbol]:
+            lineno = beg.lineno or end.lineno
+            return WriterJust(
+                Symbol('int', (), lineno),
+                f'Line {lineno:3}: TypeChecker: check_slice({beg}, {end})' if self.debug else ''
+            )
+
+        if node.beg is None and node.end is None:
+            lineno = node.lineno
+            return WriterJust(
+                Symbol('int', (), lineno),
+                f'Line {lineno:3}: TypeChecker: visit_Slice({node})' if self.debug else ''
+            )
+        m_beg = bind(self.visit(node.beg), check_bound)
+        m_end = bind(self.visit(node.end), check_bound)
+        return bind2(m_beg, m_end, check_slice)
+
     def visit_Id(self, node: AST.Id) -> WriterMaybe[VariableSymbol]:
         lineno = node.lineno
         symbol = self.symbolTable.get(node.id)
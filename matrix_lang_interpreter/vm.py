@@ -0,0 +1,208 @@
+import sys
+import argparse
+from typing import Optional
+import numpy as np
+from matrix_lang_interpreter.bytecode import *
+from matrix_lang_interpreter.exceptions import SourceRuntimeError
+from matrix_lang_interpreter.operations import (
+    divide, build_vector, fill_vector, shared, share, matmul_chain, reduce_range, assign_nest
+)
+
+
+class VM:
+    """Runs register-based bytecode.
+
+    Every executed instruction is counted in ``executed``.  ``run`` takes an
+    optional instruction budget; when it is used up the VM stops and keeps
+    its state, so calling ``run`` again resumes the program where it paused.
+
+    Instructions standing for many are charged as many: MATMUL_CHAIN as
+    one per product and RANGE_REDUCE as one per iteration of its loop.
+    One which does not fit in what is left of the budget pauses the VM
+    before it runs, unless it is the first of the call: then it runs and
+    overdraws the budget, so every call makes progress.  Under a budget
+    ASSIGN_NEST never assigns whole arrays and the loops after it run
+    instruction by instruction.
+    """
+
+    def __init__(self, code: Code):
+        self.code = code
+        self.registers = list(code.constants) + [None] * (code.nregs - len(code.constants))
+        self.pc = 0
+        self.executed = 0
+        self.halted = False
+
+    def run(self, budget: Optional[int] = None) -> bool:
+        """Runs until the program halts or the budget is exhausted.
+
+        Returns True when the program has finished.
+        """
+        if self.halted:
+            return True
+
+        instructions = self.code.instructions
+        r = self.registers
+        pc = self.pc
+        executed = self.executed
+        start = executed
+        limit = sys.maxsize if budget is None else executed + budget
+
+        try:
+            while executed < limit:
+                ins = instructions[pc]
+                op = ins[0]
+                executed += 1
+                pc += 1
+
+                if op == MOVE:
+                    r[ins[1]] = r[ins[2]]
+                elif op == INC:
+                    r[ins[1]] = r[ins[1]] + r[ins[2]]
+                elif op == FOR_STEP:
+                    i = r[ins[1]] = r[ins[1]] + 1
+                    if i < r[ins[2]]:
+                        pc = ins[3]
+                elif op == JUMP_UNLESS_LT:
+                    if not r[ins[1]] < r[ins[2]]:
+                        pc = ins[3]
+                elif op == JUMP_UNLESS_GT:
+                    if not r[ins[1]] > r[ins[2]]:
+                        pc = ins[3]
+                elif op == JUMP_UNLESS_EQ:
+                    if not r[ins[1]] == r[ins[2]]:
+                        pc = ins[3]
+                elif op == JUMP:
+                    pc = ins[1]
+                elif op == ADD:
+                    r[ins[1]] = r[ins[2]] + r[ins[3]]
+                elif op == SUB:
+                    r[ins[1]] = r[ins[2]] - r[ins[3]]
+                elif op == MUL:
+                    r[ins[1]] = r[ins[2]] * r[ins[3]]
+                elif op == DIV:
+                    r[ins[1]] = divide(r[ins[2]], r[ins[3]])
+                elif op == DEC:
+                    r[ins[1]] = r[ins[1]] - r[ins[2]]
+                elif op == JUMP_UNLESS_LE:
+                    if not r[ins[1]] <= r[ins[2]]:
+                        pc = ins[3]
+                elif op == JUMP_UNLESS_GE:
+                    if not r[ins[1]] >= r[ins[2]]:
+                        pc = ins[3]
+                elif op == JUMP_UNLESS_NE:
+                    if not r[ins[1]] != r[ins[2]]:
+                        pc = ins[3]
+                elif op == JUMP_IF_FALSE:
+                    if not r[ins[1]]:
+                        pc = ins[2]
+                elif op == REF:
+                    first = ins[3]
+                    r[ins[1]] = r[ins[2]][tuple(r[first:first + ins[4]])]
+                elif op == SETREF:
+                    first = ins[2]
+                    vec = r[ins[1]]
+                    if shared(vec):
+                        vec = r[ins[1]] = vec.copy()
+                    vec[tuple(r[first:first + ins[3]])] = r[ins[4]]
+                elif op == SLICE:
+                    r[ins[1]] = slice(r[ins[2]], r[ins[3]])
+                elif op == PRINT:
+                    print(r[ins[1]])
+                elif op == MATMUL:
+                    r[ins[1]] = np.matmul(r[ins[2]], r[ins[3]])
+                elif op == EQ:
+                    r[ins[1]] = r[ins[2]] == r[ins[3]]
+                elif op == NE:
+                    r[ins[1]] = r[ins[2]] != r[ins[3]]
+                elif op == LT:
+                    r[ins[1]] = r[ins[2]] < r[ins[3]]
+                elif op == LE:
+                    r[ins[1]] = r[ins[2]] <= r[ins[3]]
+                elif op == GT:
+                    r[ins[1]] = r[ins[2]] > r[ins[3]]
+                elif op == GE:
+                    r[ins[1]] = r[ins[2]] >= r[ins[3]]
+                elif op == NEG:
+                    r[ins[1]] = -r[ins[2]]
+                elif op == TRANSPOSE:
+                    r[ins[1]] = r[ins[2]].T
+                elif op == VECTOR:
+                    first = ins[2]
+                    r[ins[1]] = build_vector(r[first:first + ins[3]])
+                elif op == SHARE:
+                    share(r[ins[1]])
+                elif op == FILL_VECTOR:
+                    first = ins[2]
+                    r[ins[1]] = fill_vector(r[first:first + ins[3]], r[ins[4]])
+                elif op == MATMUL_CHAIN:
+                    first = ins[2]
+                    cost = ins[3] - 2
+                    if executed + cost > limit and executed > start + 1:
+                        executed -= 1
+                        pc -= 1
+                        break
+                    executed += cost
+                    r[ins[1]] = matmul_chain(r[first:first + ins[3]])
+                elif op == RANGE_REDUCE:
+                    first = ins[3]
+                    args = r[first:first + ins[4]]
+                    cost = max(int(args[1] - args[0]), 1) - 1
+                    if executed + cost > limit and executed > start + 1:
+                        executed -= 1
+                        pc -= 1
+                        break
+                    executed += cost
+                    r[ins[1]] = reduce_range(*r[ins[2]], args)
+                elif op == ASSIGN_NEST:
+                    first = ins[2]
+                    if budget is None and assign_nest(r[ins[1]], r[first:first + ins[3]]):
+                        pc = ins[4]
+                elif op == ZEROS:
+                    r[ins[1]] = np.zeros(r[ins[2]])
+                elif op == ONES:
+                    r[ins[1]] = np.ones(r[ins[2]])
+                elif op == EYE:
+                    r[ins[1]] = np.eye(r[ins[2]], dtype=int)
+                elif op == RETURN:
+                    first = ins[1]
+                    for value in r[first:first + ins[2]]:
+                        print(value)
+                    self.halted = True
+                    break
+                elif op == HALT:
+                    self.halted = True
+                    break
+                else:
+                    raise ValueError(f'Unknown opcode: {op}')
+        except Exception as e:
+            self.halted = True
+            raise SourceRuntimeError(self.code.linenos[pc - 1], e) from e
+        finally:
+            self.pc = pc
+            self.executed = executed
+
+        return self.halted
+
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser(
+        prog="python3 -m matrix_lang_interpreter.vm",
+        description="Run compiled bytecode without the parser frontend."
+    )
+    argparser.add_argument("filename", help="bytecode filename")
+    argparser.add_argument(
+        "-b", "--budget", dest="budget", type=int, default=None,
+        help="maximum number of instructions to execute"
+    )
+    args = argparser.parse_args()
+
+    with open(args.filename, 'rb') as file:
+        vm = VM(Code.loads(file.read()))
+
+    try:
+        if not vm.run(args.budget):
+            print(f'Instruction budget of {args.budget} exhausted')
+            sys.exit(1)
+    except SourceRuntimeError as e:
+        print(e)
+        sys.exit(1)
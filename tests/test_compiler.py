@@ -0,0 +1,45 @@
+import io
+import glob
+import contextlib
+import pytest
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.compiler import Compiler
+
+
+def parse(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    assert TypeChecker().visit(ast).is_just()
+    return ast
+
+def output(run, ast):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast)
+    return buffer.getvalue()
+
+def assert_same_output(text):
+    expected = output(lambda ast: Interpreter().visit(ast), parse(text))
+    assert output(lambda ast: Compiler().run(ast), parse(text)) == expected
+    return expected
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+def test_examples(filename):
+    with open(filename) as file:
+        assert_same_output(file.read())
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('x = 7 / 2; y = 7.0 / 2; print x, y;', '3\n3.5\n'),
+    ('s = "ab" + "c"; print s * 2;', 'abcabc\n'),
+    ('x = 1; { x = 2; y = 3; } print x;', '2\n'),
+    ('i = 5; for i = 0:3 { x = i; } print i;', '3\n'),
+    ('for i = 0:10 { if (i == 2) continue; if (i == 4) break; print i; }', '0\n1\n3\n'),
+    ('n = 0; while (n < 10) { n += 3; } print n;', '12\n'),
+    ('A = [[1, 2], [3, 4]]; A[0, 1] = 5; print A[0, 1], A[1];', '5\n[3 4]\n'),
+    ('x = 1; return x, x + 1; print x;', '1\n2\n'),
+])
+def test_programs(test_input, expected):
+    assert assert_same_output(test_input) == expected
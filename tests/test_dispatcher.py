@@ -0,0 +1,67 @@
+import pytest
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.dispatcher import on, when, Dispatcher
+from matrix_lang_interpreter.interpreter import Interpreter
+
+
+class Base:
+    pass
+
+class Child(Base):
+    pass
+
+class GrandChild(Child):
+    pass
+
+class Other:
+    pass
+
+
+class Visitor:
+    @on('node')
+    def visit(self, node):
+        pass
+
+    @when(Base)
+    def visit(self, node):
+        return 'base'
+
+    @when(Child)
+    def visit(self, node):
+        return 'child'
+
+
+def test_exact_and_inherited_targets():
+    visitor = Visitor()
+    assert visitor.visit(Base()) == 'base'
+    assert visitor.visit(Child()) == 'child'
+    assert visitor.visit(GrandChild()) == 'child'
+
+def test_missing_target():
+    with pytest.raises(TypeError):
+        Visitor().visit(Other())
+
+def test_table_is_cached_per_class():
+    dispatcher = Visitor.visit.dispatcher
+    Visitor().visit(GrandChild())
+    assert dispatcher.table[GrandChild] is dispatcher.targets[Child]
+
+def test_register_invalidates_cache():
+    dispatcher = Dispatcher('node', lambda node: None)
+    dispatcher.register(Base, lambda node: 'base')
+    assert dispatcher(GrandChild()) == 'base'
+    dispatcher.register(Child, lambda node: 'child')
+    assert dispatcher(GrandChild()) == 'child'
+
+def test_freeze():
+    dispatcher = Dispatcher('node', lambda node: None)
+    dispatcher.register(Base, lambda node: 'base')
+    table = dispatcher.freeze()
+    assert table[Child](Child()) == 'base'
+    with pytest.raises(RuntimeError):
+        dispatcher.register(Child, lambda node: 'child')
+
+def test_subclass_nodes():
+    table = Interpreter.visit.dispatcher.table
+    assert table[AST.IfElseStmt] is not table[AST.IfStmt]
+    assert table[AST.MatMulBinExpr] is not table[AST.BinExpr]
@@ -0,0 +1,76 @@
+import io
+import glob
+import contextlib
+import pytest
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.interpreter import Interpreter, TIER_THRESHOLD
+
+
+def parse(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    assert TypeChecker().visit(ast).is_just()
+    return ast
+
+def output(ast, threshold):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        Interpreter(threshold).visit(ast)
+    return buffer.getvalue()
+
+def loops(ast):
+    return [node for node in iter_nodes(ast) if isinstance(node, (AST.WhileLoop, AST.ForLoop))]
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+@pytest.mark.parametrize('threshold', [0, 1, 7])
+def test_examples(filename, threshold):
+    with open(filename) as file:
+        text = file.read()
+    assert output(parse(text), threshold) == output(parse(text), None)
+
+@pytest.mark.parametrize('test_input', [
+    's = 0; for i = 0:10 { s += i; print s; }',
+    'for i = 0:10 { if (i == 2) continue; if (i == 6) break; print i; }',
+    'n = 0; while (n < 20) { n += 3; if (n == 9) continue; print n; }',
+    'i = 5; for i = 0:6 { x = i; } print i;',
+    'for i = 0:4 { i = i * 10; print i; }',
+    's = 0; for i = 0:4 { for j = 0:i { s += i * j; } print s; }',
+    'k = 0; for i = 0:4 { while (k < 3 * i) { k += 1; { y = k; print y; } } }',
+    'A = zeros(3, 3); for i = 0:3 for j = 0:3 A[i, j] = i - j; print A;',
+    'x = 0; for i = 0:10 { x += 1; if (x > 4) return x, i; }',
+])
+@pytest.mark.parametrize('threshold', [0, 1, 2, 3, 5])
+def test_same_output(test_input, threshold):
+    assert output(parse(test_input), threshold) == output(parse(test_input), None)
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('x = 1' + ' + 1' * 2000 + '; print x;', '2001\n'),
+    ('x = ' + '(' * 2000 + '1' + ')' * 2000 + '; print x;', '1\n'),
+    ('x = 0; ' + 'if (x == 0) ' * 2000 + 'print x;', '0\n'),
+], ids=['chained', 'nested', 'ifs'])
+def test_deep_programs(test_input, expected):
+    # the default engine recurses once or more per nesting level
+    assert output(parse(test_input), TIER_THRESHOLD) == expected
+
+def test_hot_loops_compiled():
+    ast = parse('s = 0; for i = 0:5 { s += i; } for i = 0:2 { s += i; } print s;')
+    assert output(ast, 3) == '11\n'
+    hot, cold = loops(ast)
+    assert (hot.iterations, cold.iterations) == (5, 2)
+    assert hot.compiled is not None and cold.compiled is None
+
+def test_iterations_of_all_runs():
+    ast = parse('for i = 0:4 { n = 0; while (n < 2) n += 1; }')
+    output(ast, 5)
+    outer, inner = loops(ast)
+    assert inner.iterations == 8 and inner.compiled is not None
+    assert outer.compiled is None
+
+def test_interpreted_only():
+    ast = parse('s = 0; for i = 0:1000 { s += i; } print s;')
+    assert output(ast, None) == '499500\n'
+    assert all(loop.compiled is None for loop in loops(ast))
@@ -0,0 +1,87 @@
+import glob
+import pytest
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.light_type_checker import LightTypeChecker, Type, Variable
+
+
+def parse(text):
+    return Parser().parse(Scanner().tokenize(text))
+
+def annotations(ast):
+    return [
+        (type(node).__name__, getattr(node, 'type', None), getattr(node, 'shape', None))
+        for node in iter_nodes(ast) if isinstance(node, AST.Expr)
+    ]
+
+def assert_same_check(text):
+    expected_ast, ast = parse(text), parse(text)
+    expected = TypeChecker(debug=False).visit(expected_ast)
+    typeChecker = LightTypeChecker()
+    result = typeChecker.visit(ast)
+    assert (result is not None) == expected.is_just()
+    assert str(typeChecker.diagnostics) == str(expected.log)
+    assert annotations(ast) == annotations(expected_ast)
+    return typeChecker
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+def test_examples(filename):
+    with open(filename) as file:
+        assert not assert_same_check(file.read()).diagnostics
+
+@pytest.mark.parametrize('test_input', [
+    'x = 1 + "a";',
+    'x = [1, "a", 2.0 + "b"];',
+    'x = [1, [1, 2], y];',
+    'x = [[1, 2], [1, 2, 3]];',
+    'x = [1, 2.5];',
+    'x = [];',
+    'if (1) print 2;',
+    'if (1 < 2) print y; else print z;',
+    'while (1 + 2) { x = 1; }',
+    'for i = 0:2.5 { print i; }',
+    'for i = "a":y { print i; }',
+    'break;',
+    'continue;',
+    'while (1 < 2) { break; continue; }',
+    'A = ones(3, 2); B = A @ A;',
+    'A = ones(3, 2); B = A.T @ A; C = B.T; D = [1,2,3] @ A;',
+    'x = 1; y = x.T;',
+    'A = zeros(2, 2, 2); B = A.T;',
+    'x = -"a";',
+    'x = -[1, 2];',
+    'A = zeros(0); B = ones(2.5); C = eye(2.0); D = eye(3); E = zeros(3, 3);',
+    'A = ones(2, 2); print A[2, 0], A[0, 0, 0], A[1.5];',
+    'x = 1 < "a"; y = [1, 2] == [1, 2, 3]; z = "a" == "b";',
+    'x = 1; { y = x + z; } print y;',
+    'x = 1; x = x + 1; x += 2; x *= "a";',
+    's = "a" * 3 + "b"; t = s - "c";',
+    'print q, w; return e;',
+    'A = [[1, 2], [3, 4]]; B = A[0]; C = B @ A; print C @ B;',
+    'x = [1, 2] + [1, 2, 3]; y = [1, 2] * [3, 4];',
+    'A = zeros(4, 3); n = 2; B = A[1:3, :] + A[n:n + 2, :]; C = A[0:n] @ A.T; print B[0, 0:2] @ C;',
+    'A = ones(3, 3); n = 1; print A[0:1.5], A["a":2, 0], A[:, 0:2] + A, A[:, 3], [A[0:n], A[:, 0]];',
+])
+def test_same_diagnostics(test_input):
+    assert_same_check(test_input)
+
+def test_diagnostics_in_order():
+    typeChecker = LightTypeChecker()
+    assert typeChecker.visit(parse('x = [1, "a", y];\nprint 1 < "b";')) is None
+    assert typeChecker.diagnostics == [
+        'Line   1: TypeChecker: Vector: wrong type of elems: int, string',
+        'Line   1: TypeChecker: no such symbol as y',
+        'Line   2: TypeChecker: RelationExpr: wrong operator < for int and string',
+    ]
+
+def test_records():
+    typeChecker = LightTypeChecker()
+    result = typeChecker.visit(parse('x = ones(2, 3); y = x.T;'))
+    assert isinstance(result, Type) and not hasattr(result, '__dict__')
+    symbol = typeChecker.symbolTable.get('y')
+    assert isinstance(symbol, Variable)
+    assert (symbol.type, symbol.size, symbol.name) == ('int', (3, 2), 'y')
@@ -0,0 +1,146 @@
+import io
+import contextlib
+import pytest
+import numpy as np
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.lowering import Lowering, python_scalars, constant_vector
+from matrix_lang_interpreter.operations import build_vector, fill_vector, share, shared
+from matrix_lang_interpreter.engines import ENGINES, run
+
+
+def parse(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    assert TypeChecker().visit(ast).is_just()
+    return ast
+
+def divisions(ast):
+    return [
+        type(node) for node in iter_nodes(ast)
+        if isinstance(node, AST.BinExpr) and node.op == '/'
+    ]
+
+def output(ast, engine='interpreter'):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast, engine)
+    return buffer.getvalue()
+
+
+def test_type_checker_annotations():
+    ast = parse('A = ones(2, 3); x = 1.5; print A @ A.T, x * 2;')
+    print_stmt = ast.stmt_set[2]
+    assert print_stmt.expr_set[0].shape == (2, 2)
+    assert (print_stmt.expr_set[1].type, print_stmt.expr_set[1].shape) == ('float', ())
+    assert (ast.stmt_set[1].lvalue.type, ast.stmt_set[1].lvalue.shape) == ('float', ())
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('x = 1; y = x * 2; for i = 0:3 { y = y + i; }', {'x': 'int', 'y': 'int', 'i': 'int'}),
+    ('x = 1.5; y = x / 2;', {'x': 'float', 'y': 'float'}),
+    ('x = 1; while (x < 2) x = 2.5;', {}),
+    ('A = [1, 2]; x = A[0]; y = x + 1;', {}),
+    ('A = [1, 2]; for i = A[0]:3 { print i; }', {}),
+])
+def test_python_scalars(test_input, expected):
+    assert python_scalars(parse(test_input)) == expected
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('x = 7; print x / 2;', [AST.IntDivExpr]),
+    ('x = 7; print x / 2.0, -x / 2.5;', [AST.TrueDivExpr, AST.TrueDivExpr]),
+    ('x = 7; while (x < 8) x = 8.5; print x / 2;', [AST.BoundBinExpr]),
+    ('A = eye(2); print A / A, A[0, 0] / 2;', [AST.BoundBinExpr, AST.BoundBinExpr]),
+])
+def test_division(test_input, expected):
+    assert divisions(Lowering().run(parse(test_input))) == expected
+
+def test_operators_are_bound():
+    ast = Lowering().run(parse('x = 1; if (x < 2) print -x + +x;'))
+    kinds = {type(node) for node in iter_nodes(ast)}
+    assert {AST.BoundBinExpr, AST.BoundRelationExpr, AST.NegExpr} <= kinds
+    assert not kinds & {AST.UnExpr, AST.RelationExpr}
+
+@pytest.mark.parametrize('test_input', [
+    'x = 7; print x / 2, -x / 2, x / 2.0;',
+    'x = 7; while (x < 8) x = 8.5; print x / 2;',
+    'A = [[4, 6], [8, 10]]; x = A[0, 1]; print A / A, x / 4;',
+    'A = zeros(2, 2); A[0, 0] = 5; print A / ones(2, 2);',
+    'x = 1; for i = 1:5 { x = x * i; } print x / 7, x - 1 == 23;',
+])
+@pytest.mark.parametrize('engine', ENGINES)
+def test_same_output(test_input, engine):
+    expected = output(parse(test_input))
+    lowered = Lowering().run(parse(test_input))
+    assert output(lowered, engine) == expected
+
+def test_constant_vectors():
+    ast = Lowering().run(parse('x = 1; A = [[1, -2], [3, 4]]; B = [x, 2]; print A[0, 1], [["a"]];'))
+    matrices = [node for node in iter_nodes(ast) if isinstance(node, AST.Matrix)]
+    assert [node.value.tolist() for node in matrices] == [[[1, -2], [3, 4]], [['a']]]
+    assert not any(node.value.flags.writeable for node in matrices)
+    # indices stay a list of operands
+    assert isinstance(ast.stmt_set[3].expr_set[0].idxs, AST.Vector)
+    assert constant_vector(ast.stmt_set[2].expr) is None
+
+@pytest.mark.parametrize('elements, shape', [
+    ([1, 2, 3], (3,)),
+    ([1.5, np.float64(2)], (2,)),
+    ([np.int64(1), 2], (2,)),
+    ([np.arange(3), np.arange(3, 6)], (2, 3)),
+    ([np.ones(2), np.arange(2)], (2, 2)),
+    ([2 ** 70, 1], (2,)),
+    ([np.arange(3), np.arange(2)], (2, 2)),
+    ([1, np.arange(2)], (2,)),
+])
+def test_fill_vector(elements, shape):
+    try:
+        expected = build_vector(elements)
+    except ValueError:
+        with pytest.raises(ValueError):
+            fill_vector(elements, shape)
+        return
+    value = fill_vector(elements, shape)
+    assert value.dtype == expected.dtype and value.shape == expected.shape
+    assert (value == expected).all()
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('for i = 0:3 { A = [1, 2]; A[0] += i; print A; }', '[1 2]\n[2 2]\n[3 2]\n'),
+    ('A = [[1, 2], [3, 4]]; B = A; B[0, 0] = 5; print A[0], B[0];', '[1 2]\n[5 2]\n'),
+    ('A = [[1, 2], [3, 4]]; x = A[1]; x[0] = 5; print A[1], x;', '[3 4]\n[5 4]\n'),
+    ('E = [1, 2]; for E = 0:1 { E = [5, 6]; E[0] = 7; print E; }', '[7 6]\n'),
+    ('x = 2; y = 1.5; print [x, x + 1], [[x, 1], [2, x]], [y, -y];', '[2 3]\n[[2 1]\n [2 2]]\n[ 1.5 -1.5]\n'),
+])
+@pytest.mark.parametrize('engine', ENGINES)
+def test_shared_constants(test_input, expected, engine):
+    assert output(parse(test_input), engine) == expected
+
+def test_share():
+    array = np.zeros((2, 3))
+    row = array[1]
+    assert not shared(array) and share(row) is row
+    assert shared(array) and shared(row)
+    assert share(5) == 5
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('A = zeros(2); B = A; B[0] = 1; print A, B;', '[0. 0.]\n[1. 0.]\n'),
+    ('A = zeros(2); B = A; A[0] = 1; print A, B;', '[1. 0.]\n[0. 0.]\n'),
+    ('A = zeros(2, 3); r = A[1]; A[1, 0] = 5; r[2] = 7; print A[1], r;', '[5. 0. 0.]\n[0. 0. 7.]\n'),
+    ('A = eye(2); T = A.T; T[0, 1] = 3; print A[0], T[0];', '[1 0]\n[1 3]\n'),
+    ('A = zeros(2); for i = 0:2 { B = A; B[i] = i + 1; print B; } print A;', '[1. 0.]\n[0. 2.]\n[0. 0.]\n'),
+    ('A = zeros(2); A[0] = 1; A[1] = 2; B = A; print A, B;', '[1. 2.]\n[1. 2.]\n'),
+])
+@pytest.mark.parametrize('engine', ENGINES)
+def test_value_semantics(test_input, expected, engine):
+    assert output(parse(test_input), engine) == expected
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('A = [[1, 2, 3], [4, 5, 6]]; n = 1; print A[:, 1:3], A[n, 0:n + 1], A[0:9, 2];', '[[2 3]\n [5 6]]\n[4 5]\n[3 6]\n'),
+    ('A = zeros(2, 3); B = A[0:1, :]; A[0, 0] = 1; B[0, 2] = 2; print A[0], B[0];', '[1. 0. 0.]\n[0. 0. 2.]\n'),
+    ('A = zeros(3, 3); A[1:3, 0:2] = ones(2, 2); A[:, 2] += [1, 2, 3]; print A;', '[[0. 0. 1.]\n [1. 1. 2.]\n [1. 1. 3.]]\n'),
+    ('A = eye(3); for i = 0:2 A[i + 1, :] = A[i, :] + A[i + 1, :]; print A[2];', '[1 1 1]\n'),
+])
+@pytest.mark.parametrize('engine', ENGINES)
+def test_slices(test_input, expected, engine):
+    assert output(parse(test_input), engine) == expected
@@ -0,0 +1,53 @@
+import importlib
+from types import SimpleNamespace
+from matrix_lang_interpreter import lr_tables, parser, parsetab
+from matrix_lang_interpreter.scanner import Scanner
+
+
+def signature(cls):
+    return lr_tables.grammar_signature(cls, lr_tables.grammar_rules(list(vars(cls).items())))
+
+
+def test_tables_loaded():
+    assert parsetab.SIGNATURE == signature(parser.Parser)
+    assert isinstance(parser.Parser._lrtable, SimpleNamespace)
+    assert lr_tables.load_tables(parsetab.SIGNATURE) is parsetab
+
+def test_tables_match_sly(monkeypatch):
+    monkeypatch.setattr(lr_tables, 'load_tables', lambda signature: None)
+    monkeypatch.setattr(lr_tables, 'write_tables', lambda cls, signature: None)
+    try:
+        built = importlib.reload(parser).Parser
+        assert not isinstance(built._lrtable, SimpleNamespace)
+        with open(parsetab.__file__) as file:
+            assert lr_tables.format_tables(built, parsetab.SIGNATURE) == file.read()
+    finally:
+        monkeypatch.undo()
+        importlib.reload(parser)
+
+def test_loaded_productions():
+    built = parser.Parser._grammar.Productions
+    assert [(p.name, tuple(p.prod)) for p in built] == parsetab.PRODUCTIONS
+    assert built[0].func is None
+    assert all(p.func.__name__ == p.name for p in built[1:])
+
+def test_signature_of_changed_grammar():
+    cls = parser.Parser
+    changed = SimpleNamespace(tokens=cls.tokens, precedence=cls.precedence[:-1], start=None)
+    rules = lr_tables.grammar_rules(list(vars(cls).items()))
+    assert lr_tables.grammar_signature(changed, rules) != parsetab.SIGNATURE
+    assert lr_tables.grammar_signature(cls, rules[:-1]) != parsetab.SIGNATURE
+    assert lr_tables.load_tables('stale') is None
+
+def test_write_tables(tmp_path):
+    filename = str(tmp_path / 'parsetab.py')
+    lr_tables.write_tables(parser.Parser, 'x', filename)
+    namespace = {}
+    with open(filename) as file:
+        exec(file.read(), namespace)
+    assert namespace['SIGNATURE'] == 'x'
+    assert namespace['ACTION'] == parsetab.ACTION and namespace['GOTO'] == parsetab.GOTO
+
+def test_parse_with_loaded_tables():
+    ast = parser.Parser().parse(Scanner().tokenize('x = 1 + 2 * 3; print x.T;'))
+    assert ast.stmt_set[0].expr.right.op == '*'
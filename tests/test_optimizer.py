@@ -0,0 +1,344 @@
+import io
+import glob
+import contextlib
+import functools
+import pytest
+import numpy as np
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.engines import ENGINES, run
+from matrix_lang_interpreter.optimizer import Optimizer
+from matrix_lang_interpreter.operations import (
+    matmul_order, matmul_chain, reduce_range, assign_nest, REDUCTION_BLOCK
+)
+
+
+def parse(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    assert TypeChecker().visit(ast).is_just()
+    return ast
+
+def optimize(text, level=2):
+    return Optimizer(level).optimize(parse(text))
+
+def constant(node):
+    return type(node), getattr(node, 'n', None)
+
+def output(ast):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        Interpreter().visit(ast)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('print 1 + 2 * 3;', AST.IntNum(7)),
+    ('print 7 / 2;', AST.IntNum(3)),
+    ('print 7.0 / 2;', AST.FloatNum(3.5)),
+    ('print -(2 - 5);', AST.IntNum(3)),
+    ('print +4.5;', AST.FloatNum(4.5)),
+])
+def test_folding(test_input, expected):
+    ast = optimize(test_input, 1)
+    assert constant(ast.stmt_set[0].expr_set[0]) == constant(expected)
+
+def test_folding_keeps_division_by_zero():
+    ast = optimize('print 1 / 0;', 1)
+    assert isinstance(ast.stmt_set[0].expr_set[0], AST.BinExpr)
+
+def test_folded_lineno():
+    ast = optimize('x = 1;\nprint 2 + x;', 2)
+    assert ast.stmt_set[-1].expr_set[0].lineno == 2
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('if (1 < 2) print "a"; else print "b";', 'a'),
+    ('if (2 < 1) print "a"; else print "b";', 'b'),
+])
+def test_known_conditions(test_input, expected):
+    ast = optimize(test_input, 1)
+    [block] = ast.stmt_set
+    assert isinstance(block, AST.Block)
+    assert block.stmt_set[0].expr_set[0].s == expected
+
+def test_while_false():
+    ast = optimize('while (1 > 2) print "a"; print "b";', 1)
+    assert len(ast.stmt_set) == 1
+    assert ast.stmt_set[0].expr_set[0].s == 'b'
+
+def test_unreachable_code():
+    ast = optimize('for i = 0:3 { print i; break; print 2; } return 1; print 3;', 1)
+    assert len(ast.stmt_set) == 2
+    assert len(ast.stmt_set[0].stmt.stmt_set) == 2
+
+def test_propagation():
+    ast = optimize('x = 2; y = x * 3; print y + 1;')
+    [stmt] = ast.stmt_set
+    assert constant(stmt.expr_set[0]) == (AST.IntNum, 7)
+
+def test_propagation_is_flow_sensitive():
+    ast = optimize('n = 10; x = 1; for i = 0:n { x = x + i; } print x, n;')
+    assert isinstance(ast.stmt_set[-1].expr_set[0], AST.Id)
+    assert constant(ast.stmt_set[-1].expr_set[1]) == (AST.IntNum, 10)
+
+def test_dead_code_keeps_failing_assignments():
+    ast = optimize('A = [1, 2]; B = A @ A; C = 3;')
+    assert len(ast.stmt_set) == 2
+
+def test_stats():
+    optimizer = Optimizer(2)
+    optimizer.optimize(parse('x = 1; print x + 1;'))
+    assert [name for name, _, _ in optimizer.stats] == [
+        'constant-propagation', 'unreachable-code', 'matrix-chain-order',
+        'loop-invariant-code-motion', 'reduction-vectorizer', 'loop-nest-vectorizer',
+        'constant-folding', 'dead-code-elimination',
+    ]
+    assert sum(removed for _, _, removed in optimizer.stats) > 0
+
+@pytest.mark.parametrize('test_input', [
+    'x = 1; if (x < 2) x = 5; print x;',
+    'x = 1; if (x > 2) x = 5; else x = 6; print x;',
+    'x = 1; y = 2; while (x < 10) { x = x + y; y = 1; } print x, y;',
+    'i = 5; for i = 0:3 { x = i; } print i;',
+    'x = 1; { x = 2; y = 3; print y; } print x;',
+    'x = 1; for i = 0:3 { if (i == 1) continue; x = x * 2; } print x;',
+    'x = 1; for i = 0:3 { x = i; if (x == 1) break; } print x;',
+    'A = zeros(2, 2); x = 1; A[1, 1] = x + 1; print A;',
+    'x = 2.5; return x * 2; print x;',
+])
+def test_same_output(test_input):
+    expected = output(parse(test_input))
+    for level in (1, 2):
+        assert output(optimize(test_input, level)) == expected
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+def test_examples(filename):
+    with open(filename) as file:
+        text = file.read()
+    assert output(Optimizer(2, exact=True).optimize(parse(text))) == output(parse(text))
+
+def hoisted(ast):
+    return [
+        node.lvalue.id for node in iter_nodes(ast)
+        if isinstance(node, AST.AssignStmt) and isinstance(node.lvalue, AST.Id)
+        and node.lvalue.id.startswith('$licm') and not isinstance(node.expr, AST.Num)
+        and not isinstance(node.expr, AST.Id)
+    ]
+
+def test_licm_hoists_invariant_expressions():
+    ast = optimize('A = eye(3); B = ones(3, 3); for i = 0:4 { C = A @ B.T; print C; }')
+    [block] = [stmt for stmt in ast.stmt_set if isinstance(stmt, AST.Block)]
+    assert isinstance(block.stmt_set[-1], AST.ForLoop)
+    assert len(hoisted(ast)) == 1
+
+def test_licm_keeps_variant_expressions():
+    ast = optimize('A = eye(3); for i = 0:4 { A = A @ A; print A.T; }')
+    assert hoisted(ast) == []
+
+def test_licm_skips_loops_mutating_arrays():
+    ast = optimize('A = eye(2); for i = 0:2 { B = A.T; A[0, 0] = i; print B; }')
+    assert hoisted(ast) == []
+
+def test_licm_does_not_share_mutable_values():
+    ast = optimize('A = eye(2); B = A; for i = 0:2 { B = A.T; print B; } B[0, 1] = 5; print A;')
+    assert hoisted(ast) == []
+
+def test_licm_nested_loops():
+    ast = optimize(
+        'A = eye(2); s = zeros(2, 2);'
+        'for i = 0:3 { for j = 0:2 { s = s + A @ A; } }'
+        'print s;'
+    )
+    outer = [stmt for stmt in ast.stmt_set if isinstance(stmt, AST.Block)][0]
+    assert any(
+        isinstance(node, AST.MatMulBinExpr)
+        for stmt in outer.stmt_set[:-1] for node in iter_nodes(stmt)
+    )
+    assert not any(isinstance(node, AST.MatMulBinExpr) for node in iter_nodes(outer.stmt_set[-1]))
+
+@pytest.mark.parametrize('test_input', [
+    'A = eye(2); B = ones(2, 2); for i = 0:3 { C = A @ B.T; print C, i; }',
+    'A = eye(2); for i = 0:0 { print A @ A; } print A;',
+    'A = eye(2); n = 0; while (n < 2) { print [1, 2], A.T; n = n + 1; }',
+    'A = eye(2); for i = 0:3 { if (i > 1) break; print A @ A; }',
+    'A = eye(2); for i = 0:3 { for j = i:2 { print A @ A, j; } }',
+    'A = eye(2); for i = 0:2 { B = A @ A; B[0, 0] = i; print B; }',
+    'A = eye(2); for i = 0:2 { i = i + 1; print i, A.T; }',
+])
+def test_licm_same_output(test_input):
+    assert output(optimize(test_input)) == output(parse(test_input))
+
+def test_matmul_order():
+    cost, split = matmul_order((10, 30, 5, 60))
+    assert cost == 4500
+    assert split[0][2] == 1
+
+@pytest.mark.parametrize('shapes', [
+    [(2, 3), (3, 4), (4, 5)],
+    [(30, 2), (2, 30), (30, 2), (2,)],
+    [(4,), (4, 40), (40, 3)],
+    [(3, 3), (3,), (3, 3)],
+])
+def test_matmul_chain(shapes):
+    rng = np.random.default_rng(0)
+    operands = [rng.integers(-5, 5, shape) for shape in shapes]
+    expected = functools.reduce(np.matmul, operands)
+    assert np.array_equal(matmul_chain(operands), expected)
+
+def test_matrix_chain_static_order():
+    ast = optimize('A = ones(50, 2); B = ones(2, 50); v = ones(50); x = A @ B @ v; print x;')
+    x = ast.stmt_set[3].expr
+    assert isinstance(x.right, AST.MatMulBinExpr)
+    assert x.left.id == 'A'
+
+def test_matrix_chain_keeps_cheapest_order():
+    ast = optimize('A = ones(2, 50); B = ones(50, 2); C = ones(2, 50); x = A @ B @ C; print x;')
+    x = ast.stmt_set[3].expr
+    assert isinstance(x.left, AST.MatMulBinExpr)
+    assert x.right.id == 'C'
+
+def test_matrix_chain_runtime_order():
+    ast = optimize('A = eye(3); { B = eye(2); } B = eye(3); x = A @ B @ A; print x;')
+    assert isinstance(ast.stmt_set[-2].expr, AST.MatMulChain)
+
+@pytest.mark.parametrize('test_input', [
+    'A = ones(20, 2); B = ones(2, 20); v = ones(20); print A @ B @ A @ B @ v;',
+    'A = [[1, 2], [3, 4]]; v = [1, 2]; print v @ A @ A.T @ v, A @ A @ v;',
+    'A = eye(3); { B = eye(2); } B = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]; print A @ B @ B;',
+])
+def test_matrix_chain_same_output(test_input):
+    assert output(optimize(test_input)) == output(parse(test_input))
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_matrix_chain_engines(engine):
+    text = 'A = ones(4, 2); { B = eye(3); } B = ones(2, 4); v = [1, 2, 3, 4]; print A @ B @ A @ B @ v;'
+    ast = optimize(text)
+    assert any(isinstance(node, AST.MatMulChain) for node in iter_nodes(ast))
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast, engine)
+    assert buffer.getvalue() == output(parse(text))
+
+PI = 'pi = 0.0; n = 1; for i = 1:100000 { pi += 4.0 / n - 4.0 / (n + 2); n += 4; } print pi;'
+
+def test_reduction_vectorized():
+    ast = optimize(PI)
+    kinds = {type(node) for node in iter_nodes(ast)}
+    assert AST.RangeReduce in kinds
+    assert AST.ForLoop not in kinds
+
+def test_reduction_within_tolerance():
+    assert float(output(optimize(PI))) == pytest.approx(float(output(parse(PI))), rel=1e-12)
+
+@pytest.mark.parametrize('test_input', [
+    PI,
+    's = 0; for i = 0:1000 { s = s + i * i - 3; } print s;',
+    's = 0; n = 7; for i = 0:50 { s -= i / 3 + n; n = n - 2; } print s, n;',
+    's = 0.0; n = 2; for i = 0:50 { n += 3; s = s + 1.0 / n; } print s, n;',
+    'p = 1.0; for i = 1:30 { p *= 1.0 + 1.0 / i; } print p;',
+    'p = 1; for i = 0:100 { p = p * 3; } print p;',
+    's = 0; for i = 5:2 { s += i; } print s;',
+    'k = 3; s = 0.5; for i = -4:4 { s = -i * k + s; } print s;',
+    's = 0; for i = 0:10 { for j = 0:i { s += j; } } print s;',
+    'x = 0.1; for i = 0:100 { x += 0.1; } print x;',
+    'n = 10; s = 0; for i = 0:200000 { s += n * i; } print s;',
+])
+def test_reduction_exact(test_input):
+    expected = output(parse(test_input))
+    assert output(Optimizer(2, exact=True).optimize(parse(test_input))) == expected
+
+@pytest.mark.parametrize('test_input', [
+    's = 0; for i = 0:10 { s += i; print s; }',
+    's = 0; for i = 0:10 { s += i; if (s > 5) break; }',
+    's = 0; i = 2; for i = 0:10 { s += i; } print i;',
+    'A = [1, 2, 3]; s = 0; for i = 0:3 { s += A[1]; } print s;',
+    's = 0; t = 0; for i = 0:10 { s += i; t += s; } print t;',
+    's = 0; for i = 0:10 { s = s + i + 1; } print s;',
+])
+def test_reduction_not_vectorized(test_input):
+    ast = optimize(test_input)
+    assert not any(isinstance(node, AST.RangeReduce) for node in iter_nodes(ast))
+    assert output(ast) == output(parse(test_input))
+
+def test_reduction_division_by_zero():
+    text = 's = 0.0; for i = 0:3 { s += 1.0 / (i - 1); } print s;'
+    with pytest.raises(ZeroDivisionError) as error:
+        output(optimize(text))
+    assert error.value.__context__ is None
+
+def test_reduce_range_blocks():
+    program = ('/', ('const', 1.0), ('affine', 3, ('const', 2), 0))
+    count = 3 * REDUCTION_BLOCK + 5
+    expected = 0.0
+    for k in range(count):
+        expected += 1.0 / (1 + 2 * k)
+    assert reduce_range('+', program, True, [0, count, 0.0, 1]) == expected
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_reduction_engines(engine):
+    text = 's = 0.0; n = 3; for i = 0:1000 { s += i / n - 0.5; n += 2; } print s, n;'
+    ast = Optimizer(2, exact=True).optimize(parse(text))
+    assert any(isinstance(node, AST.RangeReduce) for node in iter_nodes(ast))
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast, engine)
+    assert buffer.getvalue() == output(parse(text))
+
+FILL = 'n = 30; D = zeros(30, 40); for i = 0:n { for j = 0:40 { D[i, j] = i * n + j; } } print D;'
+
+@pytest.mark.parametrize('test_input', [
+    FILL,
+    'D = zeros(4, 3); n = 2; for i = 0:3 for j = 0:4 D[j, i] = i - j * n + 0.5; print D;',
+    'A = eye(4); B = zeros(4, 5); C = ones(4, 4); for i = 1:4 for j = 0:4 { B[i - 1, j + 1] = A[i, j] * 2 - C[j, 3]; A[i, j] = -A[i, j]; } print A, B;',
+    'A = zeros(3, 3); k = 1; for i = 0:3 { A[i, k + 1] = i * 2; } print A;',
+    'A = [1, 2, 3]; for i = 0:3 { A[i] = A[i] * 2.5; } print A;',
+    'A = zeros(3, 3); B = A; for i = 0:3 for j = 0:3 A[i, j] = B[j, i] + i; print A;',
+    'A = zeros(3); for i = 0:2 { A[i - 1] = i + 1; } print A;',
+    'A = zeros(2, 2); for i = 0:2 for j = 3:1 A[i, j] = 1; print A;',
+    'A = zeros(3, 3); for i = 0:3 for j = 0:i A[i, j] = i + j; print A;',
+    'A = zeros(3, 3); for i = 0:3 { for j = 0:3 A[j, i] = i; print i; } print A;',
+])
+def test_loop_nest_vectorized(test_input):
+    ast = optimize(test_input)
+    assert any(isinstance(node, AST.LoopNest) for node in iter_nodes(ast))
+    assert output(ast) == output(parse(test_input))
+
+@pytest.mark.parametrize('test_input', [
+    'A = [1, 2, 3, 4]; for i = 1:4 { A[i] = A[i - 1] + 1; } print A;',
+    'A = eye(3); for i = 0:3 for j = 0:3 A[i, j] = A[j, i] + 1; print A;',
+    'A = zeros(3, 3); for i = 0:3 { A[i, i] = 1; } print A;',
+    'A = zeros(3, 3); for i = 0:3 for j = 0:3 A[i, 0] = j; print A;',
+    'A = zeros(3); for i = 0:3 { A[i] = i / 2; } print A;',
+    'A = zeros(3); i = 1; for i = 0:3 { A[i] = 1; } print A, i;',
+])
+def test_loop_nest_not_vectorized(test_input):
+    ast = optimize(test_input)
+    assert not any(isinstance(node, AST.LoopNest) for node in iter_nodes(ast))
+    assert output(ast) == output(parse(test_input))
+
+def test_loop_nest_index_error():
+    with pytest.raises(IndexError):
+        output(optimize('A = zeros(2, 2); for i = 0:3 for j = 0:2 A[i, j] = 1;'))
+
+def test_assign_nest_int_overflow():
+    A = np.zeros(2, dtype=int)
+    program = (1, ((2, (('axis', 0, ('const', 0)),), ('*', ('arg', 3), ('axis', 0))),))
+    assert not assign_nest(program, [0, 2, A, 2 ** 62])
+    assert assign_nest(program, [0, 2, A, 2 ** 40])
+    assert list(A) == [0, 2 ** 40]
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_loop_nest_engines(engine):
+    text = (
+        'A = zeros(3, 4); B = zeros(3, 3); for i = 0:3 for j = 0:4 A[i, j] = i - j; '
+        'for i = 0:3 for j = 0:3 B[i, j] = A[j, i + 1] * 0.5; print A, B;'
+    )
+    ast = optimize(text)
+    assert sum(isinstance(node, AST.LoopNest) for node in iter_nodes(ast)) == 2
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast, engine)
+    assert buffer.getvalue() == output(parse(text))
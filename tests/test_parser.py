@@ -2,9 +2,15 @@ import pytest
 from matrix_lang_interpreter.AST import *
 from matrix_lang_interpreter.scanner import Scanner
 from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.pratt_parser import PrattParser
 from matrix_lang_interpreter.add_to_class import addToClass
 
 
+@pytest.fixture(params=[Parser, PrattParser])
+def parser(request):
+    return request.param()
+
+
 @addToClass(IntNum)
 def __eq__(self, other):
     if isinstance(other, int):
@@ -39,9 +45,8 @@ def __eq__(self, other):
     ('x = (3 + 1) * 2;', BinExpr('*', BinExpr('+', 3, 1), 2)),
     ('x = 2 * (3 + 1);', BinExpr('*', 2, BinExpr('+', 3, 1))),
 ])
-def test_BinExpr(test_input, expected):
+def test_BinExpr(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -50,9 +55,8 @@ def test_BinExpr(test_input, expected):
     ('x = A @ (B @ C);', MatMulBinExpr('@', Id('A'), MatMulBinExpr('@', Id('B'), Id('C')))),
     ('x = A @ B @ C;', MatMulBinExpr('@', MatMulBinExpr('@', Id('A'), Id('B')), Id('C'))),
 ])
-def test_MatMulBinExpr(test_input, expected):
+def test_MatMulBinExpr(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -62,18 +66,16 @@ def test_MatMulBinExpr(test_input, expected):
     ('x = A.T + B.T;', BinExpr('+', MatTransExpr(Id('A')), MatTransExpr(Id('B')))),
     ('x = (A + B).T;', MatTransExpr(BinExpr('+', Id('A'), Id('B'))))
 ])
-def test_MatTransExpr(test_input, expected):
+def test_MatTransExpr(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
     ('x = -1;', UnExpr('-', 1)),
     ('x = +(3 + -1);', UnExpr('+', BinExpr('+', 3, UnExpr('-', 1))))
 ])
-def test_UnExpr(test_input, expected):
+def test_UnExpr(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -85,9 +87,8 @@ def test_UnExpr(test_input, expected):
     ('x = -1 * 2;', BinExpr('*', UnExpr('-', 1), 2)),
     ('x = 2 * -1;', BinExpr('*', 2, UnExpr('-', 1))),
 ])
-def test_Precedence(test_input, expected):
+def test_Precedence(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -101,9 +102,8 @@ def test_Precedence(test_input, expected):
     ('x = [[[1], [2]]];', Vector([Vector([Vector([1]), Vector([2])])])),
     ('x = [[1, 2], [3, 4]];', Vector([Vector([1, 2]), Vector([3, 4])])),
 ])
-def test_Vector(test_input, expected):
+def test_Vector(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -113,9 +113,8 @@ def test_Vector(test_input, expected):
     ('x = ones(2, 3);', Ones(Vector([2, 3]))),
     ('x = eye(3);', Eye(3))
 ])
-def test_SpecialMatrix(test_input, expected):
+def test_SpecialMatrix(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -130,9 +129,8 @@ def test_SpecialMatrix(test_input, expected):
     ('A = zeros(4);', [AssignStmt(Id('A'), Zeros(Vector([4])))]),
     ('A = eye(n);', [AssignStmt(Id('A'), Eye(Id('n')))]),
 ])
-def test_AssignStmt(test_input, expected):
+def test_AssignStmt(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -146,9 +144,8 @@ def test_AssignStmt(test_input, expected):
     ('x = a == b + c;', RelationExpr('==', Id('a'), BinExpr('+', Id('b'), Id('c')))),
     ('x = a + c < b + d;', RelationExpr('<', BinExpr('+', Id('a'), Id('c')), BinExpr('+', Id('b'), Id('d'))))
 ])
-def test_RelationExpr(test_input, expected):
+def test_RelationExpr(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -196,9 +193,8 @@ def test_RelationExpr(test_input, expected):
             ])
         ])
 ])
-def test_Block(test_input, expected):
+def test_Block(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -262,9 +258,8 @@ def test_Block(test_input, expected):
             AssignStmt(Id('b'), 3))
     ]),
 ])
-def test_IfStmt(test_input, expected):
+def test_IfStmt(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -392,9 +387,8 @@ def test_IfStmt(test_input, expected):
         )
     ]),
 ])
-def test_IfElseStmt(test_input, expected):
+def test_IfElseStmt(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -471,9 +465,8 @@ def test_IfElseStmt(test_input, expected):
         )
     ]),
 ])
-def test_WhileLoop(test_input, expected):
+def test_WhileLoop(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -543,18 +536,20 @@ def test_WhileLoop(test_input, expected):
         )
     ])
 ])
-def test_ForLoop(test_input, expected):
+def test_ForLoop(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
 
 @pytest.mark.parametrize('test_input, expected', [
     ('x = a[1];', Ref(Id('a'), Vector([1]))),
-    ('x = a[i, j, k];', Ref(Id('a'), Vector([Id('i'), Id('j'), Id('k')])))
+    ('x = a[i, j, k];', Ref(Id('a'), Vector([Id('i'), Id('j'), Id('k')]))),
+    ('x = a[1:n, :];', Ref(Id('a'), Vector([Slice(1, Id('n')), Slice(lineno=1)]))),
+    ('x = a[:, i - 1:i + 1];', Ref(Id('a'), Vector([
+        Slice(lineno=1), Slice(BinExpr('-', Id('i'), 1), BinExpr('+', Id('i'), 1))
+    ])))
 ])
-def test_Ref(test_input, expected):
+def test_Ref(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set[0].expr == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -581,9 +576,8 @@ def test_Ref(test_input, expected):
         ]))
     ]),
 ])
-def test_BreakContinue(test_input, expected):
+def test_BreakContinue(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
 
 @pytest.mark.parametrize('test_input, expected', [
@@ -597,7 +591,6 @@ def test_BreakContinue(test_input, expected):
     ('return a + 2;', [Return([BinExpr('+', Id('a'), 2)])]),
     ('return a, b;', [Return([Id('a'), Id('b')])])
 ])
-def test_PrintReturn(test_input, expected):
+def test_PrintReturn(parser, test_input, expected):
     scanner = Scanner()
-    parser = Parser()
     assert parser.parse(scanner.tokenize(test_input)).stmt_set == expected
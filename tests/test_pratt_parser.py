@@ -0,0 +1,111 @@
+import io
+import sys
+import glob
+import contextlib
+import pytest
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.pratt_parser import PrattParser
+from matrix_lang_interpreter.stream_scanner import StreamScanner
+
+
+def parse(parser, tokens):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        ast = parser.parse(tokens)
+    # repr shows the line numbers the equality of the nodes ignores
+    return repr(ast), buffer.getvalue()
+
+def assert_same_ast(text):
+    expected = parse(Parser(), Scanner().tokenize(text))
+    assert parse(PrattParser(), Scanner().tokenize(text)) == expected
+    assert parse(PrattParser(), StreamScanner().scan(text)) == expected
+    return expected
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+def test_examples(filename):
+    with open(filename) as file:
+        ast, output = assert_same_ast(file.read())
+    assert ast != 'None' and not output
+
+@pytest.mark.parametrize('test_input', [
+    'x = -a.T * b + +c @ d.T.T / 2 - e;',
+    'x = a - b - c; y = a / b * c; z = a @ b @ c;',
+    'x = a + b < c * d == e - f >= g;',
+    'x = a < b == c > d; y = a != (b == c);',
+    'x = - - a; y = -a[1, 2][0] + zeros(2, 3)[1];',
+    'x = [, 1]; y = []; z = [[1, 2], [3, 4]]; print; return;',
+    'x = ones(); y = ones(2, 3).T; z = eye(n + 1);',
+    'A[i, j] += 1; A[0] -= B[1]; x *= 2; x /= "s";',
+    'zeros(3)[1] = 2; 5[0] = "a"[1];',
+    'x = A[1:n + 1, :][0]; A[:, 0] = B[i:j]; A[, :] = 1;',
+    'if (a) if (b) x = 1; else x = 2;',
+    'if (a) { if (b) x = 1; } else { while (c) { break; continue; } }',
+    'for\ni =\n1:\nn\n{\nprint\ni;\n}\nfor j = i:n for k = j:n s += k;',
+    'print\n"a",\n1.5e3\n,\nx\n;',
+])
+def test_programs(test_input):
+    ast, output = assert_same_ast(test_input)
+    assert ast != 'None' and not output
+
+@pytest.mark.parametrize('test_input', [
+    'x = 1 < 2 < 3;',
+    'x = a == b != c;',
+    'x = 1 +;\ny = 2;',
+    'x = 1;\ny = = 2;',
+    '1 = 2;',
+    'zeros(2) = 1;',
+    'x + 1;',
+    'x = (a)[1];',
+    'x = [1, ];',
+    'x = [, , 1];',
+    'x = [1:2];',
+    'x = A[1:];',
+    'x = A[:2];',
+    'x = A[1:2:3];',
+    'print 1; }',
+    '{ }',
+    'if (x) else y = 1;',
+    'for i = 1 print i;',
+])
+def test_syntax_errors(test_input):
+    expected, expected_output = parse(Parser(), Scanner().tokenize(test_input))
+    ast, output = parse(PrattParser(), StreamScanner().scan(test_input))
+    assert ast == 'None'
+    # both report the first error alike, the LALR parser may then report
+    # the rest of the statement again
+    assert output.splitlines()[0] == expected_output.splitlines()[0]
+
+def test_recovery():
+    ast, output = parse(PrattParser(), StreamScanner().scan('x = 1 +;\n{ y = = 2; z = 3; }\nprint ];'))
+    assert ast == 'None'
+    assert output.splitlines() == [
+        'Line   1: Parser: Syntax error: ";": ;',
+        'Line   2: Parser: Syntax error: "=": =',
+        'Line   3: Parser: Syntax error: "]": ]',
+    ]
+
+@pytest.mark.parametrize('test_input', ['', 'x = 1', 'if (x) {\n print x;'])
+def test_end_of_input(test_input):
+    ast, output = parse(PrattParser(), StreamScanner().scan(test_input))
+    assert ast == 'None'
+    assert output.endswith('Parser: Syntax error: unexpected end of input\n')
+
+def test_deep_nesting():
+    text = 'x = ' + '(' * 5000 + '1' + ')' * 5000 + ';'
+    assert_same_ast(text)
+
+def test_deep_nesting_with_dense_literals():
+    # the LALR Parser taking over has no MATRIX token; the limit is pinned
+    # so that the nesting is deeper than the Pratt parser gets
+    text = 'x = [1, 2]; y = [[0.5, 1.5], [2.5, 3.5]];\nz = ' + '(' * 5000 + '1' + ')' * 5000 + ';'
+    expected = parse(Parser(), Scanner().tokenize(text))
+    assert expected[0] != 'None'
+    tokens = StreamScanner(dense_literals=True).scan(text)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(1000)
+    try:
+        assert parse(PrattParser(), tokens) == expected
+    finally:
+        sys.setrecursionlimit(limit)
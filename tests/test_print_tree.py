@@ -384,3 +384,22 @@ FOR
     ast = parser.parse(scanner.tokenize(test_input))
     ast.printTree()
     assert capture_stdout['stdout'] == expected_output
+
+def test_Slices(capture_stdout):
+    scanner = Scanner()
+    parser = Parser()
+    test_input = 'B = A[1:n, :];'
+    expected_output = \
+'''=
+ | B
+ | REF
+ |  | A
+ |  | VECTOR
+ |  |  | :
+ |  |  |  | 1
+ |  |  |  | n
+ |  |  | :
+'''
+    ast = parser.parse(scanner.tokenize(test_input))
+    ast.printTree()
+    assert capture_stdout['stdout'] == expected_output
@@ -0,0 +1,91 @@
+import io
+import contextlib
+import pytest
+from matrix_lang_interpreter import AST
+from matrix_lang_interpreter.ast_utils import iter_nodes
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.resolver import Resolver
+from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.compiler import Compiler
+
+
+def resolve(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    assert TypeChecker().visit(ast).is_just()
+    return Resolver().resolve(ast)
+
+def ids(ast, name):
+    return [
+        node for node in iter_nodes(ast)
+        if isinstance(node, AST.Id) and node.id == name
+    ]
+
+def output(run, text):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(resolve(text))
+    return buffer.getvalue()
+
+
+def test_slots():
+    ast = resolve('x = 1; y = 2; { z = x; y = z; }')
+    assert ast.frame_size == 2
+    assert ast.stmt_set[2].frame_size == 1
+    assert [id.slot for id in ids(ast, 'x')] == [(0, 0), (0, 0)]
+    assert [id.slot for id in ids(ast, 'y')] == [(0, 1), (0, 1)]
+    assert [id.slot for id in ids(ast, 'z')] == [(1, 0), (1, 0)]
+
+def test_for_loop_aliases():
+    ast = resolve('i = 5; for i = 0:3 { i = i + 1; }')
+    loop = ast.stmt_set[1]
+    assert loop.frame_size == 1
+    assert loop.id.slot == (1, 0)
+    assert loop.id.aliases == ((0, 0),)
+    assign = loop.stmt.stmt_set[0]
+    assert assign.lvalue.slot == (1, 0)
+    assert assign.lvalue.aliases == ((0, 0),)
+
+def test_if_else_shares_scope():
+    ast = resolve('if (1 < 2) x = 1; else x = 2;')
+    stmt = ast.stmt_set[0]
+    assert stmt.frame_size == 1
+    assert [id.slot for id in ids(stmt, 'x')] == [(1, 0), (1, 0)]
+
+def test_scopes_without_variables_are_elided():
+    ast = resolve('x = 1; for i = 0:3 { { x = x + i; } if (i > 1) { y = i; print y; } }')
+    loop = ast.stmt_set[1]
+    block, if_stmt = loop.stmt.stmt_set
+    assert (loop.stmt.frame_size, block.frame_size, if_stmt.frame_size) == (0, 0, 0)
+    assert if_stmt.stmt.frame_size == 1
+    assert [id.slot for id in ids(ast, 'i')] == [(1, 0)] * 4
+    assert [id.slot for id in ids(ast, 'y')] == [(2, 0)] * 2
+
+def test_frames_are_cleared_on_exit():
+    ast = resolve('A = eye(2); for i = 0:3 { B = A.T; print B; }')
+    Interpreter().visit(ast)
+    loop = ast.stmt_set[1]
+    assert loop.frame.values == [None]
+    assert loop.stmt.frame.values == [None]
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('i = 5; for i = 0:3 { x = i; } print i;', '3\n'),
+    ('i = 5; for i = 0:3 { i = i + 1; } print i;', '3\n'),
+    ('i = 5; for i = 0:0 { x = i; } print i;', '5\n'),
+    ('i = 0; for i = 0:3 { for i = 0:2 { x = i; } } print i;', '3\n'),
+    ('for i = 0:3 { for j = 0:3 { if (j == 1) { break; } } print i; }', '0\n1\n2\n'),
+    ('for i = 0:2 { while (1 < 2) { { break; } } print i; }', '0\n1\n'),
+    ('x = 0; for i = 0:3 { { x = x + i; } { y = x; print y; } } print x;', '0\n1\n3\n3\n'),
+    ('for i = 0:2 { if (i > 0) { y = i; print y; } else { y = 5; print y; } }', '5\n1\n'),
+    ('i = 5; for i = 0:3 { if (i == 0) break; } print i;', '5\n'),
+    ('i = 5; for i = 0:3 { if (i == 2) break; } print i;', '2\n'),
+    ('i = 5; for i = 0:3 { if (i == 1) continue; print i; } print i;', '0\n2\n3\n'),
+    ('A = [2, 4]; for i = A[0]:A[1] { print i; }', '2\n3\n'),
+    ('for i = 0:4 { print i; i = i + 2; print i; }', '0\n2\n1\n3\n2\n4\n3\n5\n'),
+    ('i = 5; for i = 0:4 { i = i + 2; if (i > 3) break; } print i;', '4\n'),
+    ('for i = 0:3 { print i; for i = 0:2 { x = i; } }', '0\n1\n2\n'),
+])
+def test_shadowing(test_input, expected):
+    assert output(lambda ast: Interpreter().visit(ast), test_input) == expected
+    assert output(lambda ast: Compiler().run(ast), test_input) == expected
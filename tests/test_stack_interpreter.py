@@ -0,0 +1,67 @@
+import io
+import glob
+import contextlib
+import pytest
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.light_type_checker import LightTypeChecker
+from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.stack_interpreter import StackInterpreter
+
+
+def parse(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    # the checker of main.py, which does not recurse
+    assert LightTypeChecker().visit(ast) is not None
+    return ast
+
+def output(run, ast):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast)
+    return buffer.getvalue()
+
+def assert_same_output(text):
+    expected = output(lambda ast: Interpreter().visit(ast), parse(text))
+    assert output(lambda ast: StackInterpreter().run(ast), parse(text)) == expected
+    return expected
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+def test_examples(filename):
+    with open(filename) as file:
+        assert_same_output(file.read())
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('x = 7 / 2; y = 7.0 / 2; print x, y;', '3\n3.5\n'),
+    ('x = 1; { x = 2; y = 3; } print x;', '2\n'),
+    ('i = 5; for i = 0:3 { x = i; } print i;', '3\n'),
+    ('for i = 0:4 { i = i * 10; print i; }', '0\n10\n20\n30\n'),
+    ('for i = 0:10 { if (i == 2) continue; if (i == 4) break; print i; }', '0\n1\n3\n'),
+    ('for i = 0:3 { for j = 0:3 { if (j > i) break; { y = j; if (y == 1) continue; print i, y; } } }',
+     '0\n0\n1\n0\n2\n0\n2\n2\n'),
+    ('n = 0; while (n < 20) { n += 3; if (n == 9) continue; if (n > 13) break; print n; }', '3\n6\n12\n'),
+    ('A = [[1, 2], [3, 4]]; A[0, 1] = 5; print A[0, 1], A[1], A.T;', '5\n[3 4]\n[[1 3]\n [5 4]]\n'),
+    ('x = 1; for i = 0:10 { while (x > 0) { if (i == 2) return x, i; x -= 1; } x = i; }', '1\n2\n'),
+    ('A = [1, 2]; i = 5; print 1; print A[i];', None),
+])
+def test_programs(test_input, expected):
+    if expected is None:
+        with pytest.raises(IndexError):
+            assert_same_output(test_input)
+    else:
+        assert assert_same_output(test_input) == expected
+
+@pytest.mark.parametrize('test_input', [
+    'x = ' + '(1 + ' * 30000 + '1' + ')' * 30000 + '; print x;',
+    'x = 1' + ' + 1' * 30000 + '; print x;',
+    '{ ' * 10000 + 'x = 1; print x;' + ' }' * 10000,
+    'x = 1; ' + 'if (x > 0) ' * 10000 + '{ x -= 1; print x; }',
+    'for i = 0:2 ' + '{ ' * 10000 + 'if (i == 0) continue; print i; break;' + ' }' * 10000,
+], ids=['nested', 'chained', 'blocks', 'ifs', 'loop'])
+def test_deep_programs(test_input):
+    ast = parse(test_input)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        StackInterpreter().run(ast)
+    assert buffer.getvalue() in ('30001\n', '0\n', '1\n')
@@ -0,0 +1,168 @@
+import io
+import glob
+import contextlib
+import pytest
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.print_tree import TreePrinter
+from matrix_lang_interpreter.pratt_parser import PrattParser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.light_type_checker import LightTypeChecker
+from matrix_lang_interpreter.engines import ENGINES
+from matrix_lang_interpreter.stream_scanner import StreamScanner, TokenArray, TYPES
+
+
+TEXTS = [
+    'x = 1.5e3 + .5 - 3. * 2E-2; s = "a\'b" + \'c"\'; # comment\n\n\nA.T; x=T;\n',
+    'if else for while break continue return eye zeros ones print ifx _a1 __ 12abc 1.2.3',
+    '+= -= *= /= <= >= != == = + - * / @ ( ) [ ] { } : , ; < >',
+    'y ?= 2; z = é;\r\n ü = 1; "unterminated\n x !',
+    '\t  \n\n  # only a comment',
+    '',
+]
+
+def tokens(scan):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = [(token.type, token.value, token.lineno) for token in scan()]
+    return result, buffer.getvalue()
+
+def examples():
+    texts = []
+    for filename in sorted(glob.glob('examples/*.m')):
+        with open(filename) as file:
+            texts.append(file.read())
+    return texts
+
+
+@pytest.mark.parametrize('text', TEXTS + examples())
+def test_same_tokens(text):
+    expected = tokens(lambda: Scanner().tokenize(text))
+    assert tokens(lambda: StreamScanner().tokenize(text)) == expected
+
+@pytest.mark.parametrize('text', TEXTS)
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 64])
+def test_chunks(text, chunk_size):
+    expected = tokens(lambda: Scanner().tokenize(text))
+    assert tokens(lambda: StreamScanner().scan_file(io.StringIO(text), chunk_size)) == expected
+
+def test_arrays():
+    tokens = StreamScanner().scan('x = [1, 2.5];\nprint "a";')
+    assert isinstance(tokens, TokenArray) and len(tokens) == 11
+    assert tokens.types.typecode == 'B' and tokens.lines.typecode == 'L'
+    assert [tokens.type(i) for i in range(4)] == ['ID', '=', '[', 'INTNUM']
+    assert tokens.values[3:6] == [1, ',', 2.5]
+    assert list(tokens.lines) == [1] * 8 + [2] * 3
+    assert set(TYPES) == Scanner.tokens | Scanner.literals | {'MATRIX'}
+
+@pytest.mark.parametrize('text', examples())
+def test_parse(text):
+    buffers = io.StringIO(), io.StringIO()
+    for buffer, scanner in zip(buffers, [Scanner(), StreamScanner()]):
+        with contextlib.redirect_stdout(buffer):
+            Parser().parse(scanner.tokenize(text)).printTree()
+    assert buffers[0].getvalue() == buffers[1].getvalue()
+
+@pytest.mark.parametrize('text, expected', [
+    ('x = [[1, 2],\n [3, -4]];', ['ID', '=', 'MATRIX', ';']),
+    ('x = [1.5, -2e3, 1E+2];', ['ID', '=', 'MATRIX', ';']),
+    ('A[1, 2] = [1];', ['ID', '[', 'INTNUM', ',', 'INTNUM', ']', '=', 'MATRIX', ';']),
+    ('print [1][0], ([1]);', ['PRINT', 'MATRIX', '[', 'INTNUM', ']', ',', '(', 'MATRIX', ')', ';']),
+    ('x = [[1, 2], y];', ['ID', '=', '[', 'MATRIX', ',', 'ID', ']', ';']),
+    ('x = [1, 2.5];', ['ID', '=', '[', 'INTNUM', ',', 'FLOATNUM', ']', ';']),
+    ('x = [[1, 2], [3]];', ['ID', '=', '[', 'MATRIX', ',', 'MATRIX', ']', ';']),
+    ('x = [[[1, 2]], [[3, 4]]];', ['ID', '=', '[', 'MATRIX', ',', 'MATRIX', ']', ';']),
+    ('x = [];', ['ID', '=', '[', ']', ';']),
+    ('x = [, 1];', ['ID', '=', '[', ',', 'INTNUM', ']', ';']),
+    ('x = [1.];', ['ID', '=', '[', 'FLOATNUM', ']', ';']),
+    ('x = [01];', ['ID', '=', '[', 'INTNUM', ']', ';']),
+    ('x = [- 1];', ['ID', '=', '[', '-', 'INTNUM', ']', ';']),
+    ('x = [1 -1];', ['ID', '=', '[', 'INTNUM', '-', 'INTNUM', ']', ';']),
+    ('x = [true];', ['ID', '=', '[', 'ID', ']', ';']),
+    ('x = ["a"];', ['ID', '=', '[', 'STRING', ']', ';']),
+])
+def test_dense_tokens(text, expected):
+    tokens = StreamScanner(dense_literals=True).scan(text)
+    assert [tokens.type(i) for i in range(len(tokens))] == expected
+
+def test_dense_values():
+    tokens = StreamScanner(dense_literals=True).scan('x = [\n[1, 2],\n[3, 4]];\ny = [0.5];')
+    matrix, vector = tokens.values[2], tokens.values[6]
+    assert matrix.dtype.kind == 'i' and matrix.tolist() == [[1, 2], [3, 4]]
+    assert vector.dtype.kind == 'f' and vector.tolist() == [0.5]
+    assert list(tokens.lines) == [1, 1, 2, 3, 4, 4, 4, 4]
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64])
+def test_dense_chunks(chunk_size):
+    text = 'x = [[1, 2],\n[3, 4],\n[5, 6]];\ny = [1,\n2.5];\nz = [[1, 2],\n[3, x]];\n'
+    expected = StreamScanner(dense_literals=True).scan(text)
+    tokens = StreamScanner(dense_literals=True).scan_file(io.StringIO(text), chunk_size)
+    assert list(tokens.types) == list(expected.types)
+    assert list(tokens.lines) == list(expected.lines)
+    assert [getattr(value, 'tolist', lambda: value)() for value in tokens.values] == [
+        getattr(value, 'tolist', lambda: value)() for value in expected.values
+    ]
+
+DENSE_PROGRAMS = [
+    'A = [[1, 2], [3, 4]]; B = A @ [[2, 0], [0, 1]]; print A, B.T, -A, [1, -2] + [3, 4], [0.5, 1e3] * [2.0, 1.5];',
+    'for i = 0:3 { A = [[1, 2], [3, 4]]; A[0, 0] += i; print A; }',
+    'A = [[1, 2], [3, 4]]; x = [[1, 2], A[0]]; print x, A[1, 1], x[1];',
+    'x = [1.5, 2.5] + [1, 2];',
+    'x = [[1, 2], [3, 4]] @ [1, 2, 3];',
+    'x = [[1.5, 2], [3, 4]];',
+]
+
+def check(typeChecker, ast):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = typeChecker(ast)
+    return result, buffer.getvalue()
+
+@pytest.mark.parametrize('text', DENSE_PROGRAMS)
+def test_dense_check(text):
+    asts = [PrattParser().parse(StreamScanner(dense_literals=dense).scan(text)) for dense in (False, True)]
+    expected, ast = [TypeChecker(debug=False).visit(ast) for ast in asts]
+    assert ast.is_just() == expected.is_just() and str(ast.log) == str(expected.log)
+    expected, ast = [LightTypeChecker() for _ in asts]
+    assert (expected.visit(asts[0]) is None) == (ast.visit(asts[1]) is None)
+    assert str(ast.diagnostics) == str(expected.diagnostics)
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('text', DENSE_PROGRAMS[:3])
+def test_dense_engines(engine, text):
+    outputs = []
+    for dense in (False, True):
+        ast = PrattParser().parse(StreamScanner(dense_literals=dense).scan(text))
+        assert LightTypeChecker().visit(ast) is not None
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            ENGINES[engine](ast)
+        outputs.append(buffer.getvalue())
+    assert outputs[0] == outputs[1]
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('text', [
+    'x = [[[1, 2]], [[3, 4]]]; print x[1, 0], x + x;',
+    'x = [[[1.5, 2.5], [3.5, 4.5]], [[5.5, 6.5], [7.5, 8.5]]]; print x, x[1, 1];',
+])
+def test_nested_literals(engine, text):
+    # dense literals change nothing the LALR parser builds
+    outputs = []
+    for ast in (
+        Parser().parse(Scanner().tokenize(text)),
+        PrattParser().parse(StreamScanner(dense_literals=True).scan(text)),
+    ):
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            assert TypeChecker(debug=False).visit(ast).is_just()
+            ENGINES[engine](ast)
+        outputs.append(buffer.getvalue())
+    assert outputs[0] == outputs[1]
+
+def test_dense_tree():
+    text = 'x = [[1, -2], [3, 4]]; y = [0.5, -1.5];'
+    buffers = io.StringIO(), io.StringIO()
+    for buffer, dense in zip(buffers, (False, True)):
+        with contextlib.redirect_stdout(buffer):
+            PrattParser().parse(StreamScanner(dense_literals=dense).scan(text)).printTree()
+    assert buffers[0].getvalue() == buffers[1].getvalue()
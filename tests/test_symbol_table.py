@@ -6,10 +6,10 @@ def test_getCurrentScope():
     symbolTable = SymbolTable(None)
     assert symbolTable.getCurrentScope() == symbolTable
 
-    symbolTable.child = SymbolTable(symbolTable)
+    symbolTable.pushScope()
     assert symbolTable.getCurrentScope() == symbolTable.child
 
-    symbolTable.child.child = SymbolTable(symbolTable)
+    symbolTable.pushScope()
     assert symbolTable.getCurrentScope() == symbolTable.child.child
 
 def test_pushScope():
@@ -61,3 +61,36 @@ def test_get():
 
     symbolTable.popScope()
     assert symbolTable.get('y') == None
+
+def test_shadowing():
+    symbolTable = SymbolTable(None)
+    outer, inner = Symbol('int', ()), Symbol('float', ())
+    symbolTable.put('x', outer)
+    symbolTable.pushScope()
+    symbolTable.put('x', inner)
+    assert symbolTable.get('x') == inner
+    symbolTable.put('x', outer)
+    symbolTable.popScope()
+    assert symbolTable.get('x') == outer
+    assert symbolTable.table == {'x': outer}
+
+@pytest.mark.parametrize('keep_scopes, children', [(False, 0), (True, 2)])
+def test_keep_scopes(keep_scopes, children):
+    symbolTable = SymbolTable(None, keep_scopes)
+    for _ in range(2):
+        symbolTable.pushScope()
+        symbolTable.put('x', Symbol('int', ()))
+        symbolTable.popScope()
+    assert len(symbolTable.children) == children
+    assert symbolTable.get('x') is None
+
+def test_deep_scopes():
+    symbolTable = SymbolTable(None)
+    symbol = Symbol('int', ())
+    symbolTable.put('x', symbol)
+    for _ in range(100000):
+        symbolTable.pushScope()
+    assert symbolTable.get('x') == symbol
+    for _ in range(100000):
+        symbolTable.popScope()
+    assert symbolTable.getCurrentScope() == symbolTable
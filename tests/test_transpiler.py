@@ -0,0 +1,76 @@
+import io
+import glob
+import contextlib
+import pytest
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.exceptions import SourceRuntimeError
+from matrix_lang_interpreter.transpiler import CodeCache, Program, ClosureProgram, compile_program
+
+
+def parse(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    assert TypeChecker().visit(ast).is_just()
+    return ast
+
+def output(run, ast):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast)
+    return buffer.getvalue()
+
+def assert_same_output(text):
+    expected = output(lambda ast: Interpreter().visit(ast), parse(text))
+    assert output(lambda ast: compile_program(ast).run(), parse(text)) == expected
+    return expected
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+def test_examples(filename):
+    with open(filename) as file:
+        assert_same_output(file.read())
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('x = 7 / 2; y = 7.0 / 2; print x, y;', '3\n3.5\n'),
+    ('i = 5; for i = 0:3 { x = i; } print i;', '3\n'),
+    ('i = 5; for i = 0:3 { if (i == 1) break; } print i;', '1\n'),
+    ('i = 5; for i = 0:3 { i = 10; break; } print i;', '10\n'),
+    ('i = 5; j = 0; for i = 0:3 { for i = 0:2 { j += i; } } print i, j;', '3\n3\n'),
+    ('for i = 0:3 { print i; i = 10; }', '0\n1\n2\n'),
+    ('for i = 0:10 { if (i == 2) continue; if (i == 4) break; print i; }', '0\n1\n3\n'),
+    ('A = [[1, 2], [3, 4]]; A[0, 1] = 5; print A[0, 1], A[1];', '5\n[3 4]\n'),
+    ('x = 1; while (x < 100) { x *= 2; if (x > 10) return x; } print x;', '16\n'),
+    ('a = 1; n = 0; while (n < 2) { for i = 0:a print i; a = 2.5; n += 1; }', '0\n0\n1\n2\n'),
+])
+def test_programs(test_input, expected):
+    assert assert_same_output(test_input) == expected
+
+@pytest.mark.parametrize('test_input, expected, program', [
+    ('x = 1' + ' + 1' * 300 + ' - 2 * 3 * 4; print x;', '277\n', Program),
+    ('x = 0; ' + 'if (x == 0) ' * 300 + 'print x;', '0\n', ClosureProgram),
+    ('x = 0; ' + 'for i = 0:1 ' * 30 + 'x += 1; print x;', '1\n', ClosureProgram),
+], ids=['sum', 'ifs', 'loops'])
+def test_deep_programs(test_input, expected, program):
+    # Python compiles long chains, blocks nested deeper than it allows are
+    # run by the closure compiler
+    assert isinstance(compile_program(parse(test_input)), program)
+    assert assert_same_output(test_input) == expected
+
+def test_cache(tmp_path):
+    cache = CodeCache(str(tmp_path))
+    ast = parse('x = 1; print x + 1;')
+    program = compile_program(ast, cache)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    cached = compile_program(ast, cache)
+    assert cached.code == program.code
+    assert output(lambda _: cached.run(), ast) == '2\n'
+
+def test_runtime_error_lineno():
+    program = compile_program(parse('x = 0;\ny = 1;\n\nprint y / x;\n'))
+    with pytest.raises(SourceRuntimeError) as e:
+        program.run()
+    assert e.value.lineno == 4
+    assert isinstance(e.value.error, ZeroDivisionError)
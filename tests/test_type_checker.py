@@ -1107,6 +1107,102 @@ def test_visit_Eye(node, expected):
         ),
         WriterNothing()
     ),
+    (
+        AST.Ref(
+            AST.Zeros(
+                AST.Vector([
+                    AST.IntNum(2),
+                    AST.IntNum(2)
+                ])
+            ),
+            AST.Vector([
+                AST.BinExpr('+', AST.IntNum(0), AST.IntNum(1)),
+                AST.IntNum(1),
+            ])
+        ),
+        WriterJust(
+            VariableSymbol('int', ())
+        )
+    ),
+    (
+        AST.Ref(
+            AST.Zeros(
+                AST.Vector([
+                    AST.IntNum(2),
+                    AST.IntNum(2)
+                ])
+            ),
+            AST.Vector([
+                AST.BinExpr('+', AST.IntNum(0), AST.IntNum(1)),
+                AST.IntNum(2),
+            ])
+        ),
+        WriterNothing()
+    ),
+    (
+        AST.Ref(
+            AST.Zeros(
+                AST.Vector([
+                    AST.IntNum(4),
+                    AST.IntNum(3)
+                ])
+            ),
+            AST.Vector([
+                AST.Slice(AST.IntNum(1), AST.IntNum(3)),
+                AST.Slice(),
+            ])
+        ),
+        WriterJust(
+            VariableSymbol('int', (2, 3))
+        )
+    ),
+    (
+        AST.Ref(
+            AST.Zeros(
+                AST.Vector([
+                    AST.IntNum(4),
+                    AST.IntNum(3)
+                ])
+            ),
+            AST.Vector([
+                AST.Slice(AST.IntNum(2), AST.IntNum(9)),
+                AST.IntNum(0),
+            ])
+        ),
+        WriterJust(
+            VariableSymbol('int', (2,))
+        )
+    ),
+    (
+        AST.Ref(
+            AST.Zeros(
+                AST.Vector([
+                    AST.IntNum(4),
+                    AST.IntNum(3)
+                ])
+            ),
+            AST.Vector([
+                AST.Slice(AST.BinExpr('+', AST.IntNum(0), AST.IntNum(1)), AST.IntNum(3)),
+            ])
+        ),
+        WriterJust(
+            VariableSymbol('int', (None, 3))
+        )
+    ),
+    (
+        AST.Ref(
+            AST.Zeros(
+                AST.Vector([
+                    AST.IntNum(4),
+                    AST.IntNum(3)
+                ])
+            ),
+            AST.Vector([
+                AST.Slice(AST.FloatNum(1.0), AST.IntNum(3)),
+            ])
+        ),
+        WriterNothing()
+    ),
 ])
 def test_visit_Ref(node, expected):
     typeChecker = TypeChecker()
@@ -0,0 +1,154 @@
+import io
+import sys
+import glob
+import contextlib
+import subprocess
+import pytest
+from matrix_lang_interpreter.scanner import Scanner
+from matrix_lang_interpreter.parser import Parser
+from matrix_lang_interpreter.pratt_parser import PrattParser
+from matrix_lang_interpreter.stream_scanner import StreamScanner
+from matrix_lang_interpreter.type_checker import TypeChecker
+from matrix_lang_interpreter.interpreter import Interpreter
+from matrix_lang_interpreter.exceptions import SourceRuntimeError
+from matrix_lang_interpreter.optimizer import Optimizer
+from matrix_lang_interpreter.bytecode import Code, FOR_STEP, INC, JUMP_UNLESS_LT, RANGE_REDUCE, ASSIGN_NEST, MATMUL_CHAIN
+from matrix_lang_interpreter.bytecode_compiler import BytecodeCompiler
+from matrix_lang_interpreter.vm import VM
+
+
+def parse(text):
+    ast = Parser().parse(Scanner().tokenize(text))
+    assert TypeChecker().visit(ast).is_just()
+    return ast
+
+def output(run, ast):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run(ast)
+    return buffer.getvalue()
+
+def assert_same_output(text):
+    expected = output(lambda ast: Interpreter().visit(ast), parse(text))
+    assert output(lambda ast: VM(BytecodeCompiler().compile(ast)).run(), parse(text)) == expected
+    return expected
+
+
+@pytest.mark.parametrize('filename', sorted(glob.glob('examples/*.m')))
+def test_examples(filename):
+    with open(filename) as file:
+        assert_same_output(file.read())
+
+@pytest.mark.parametrize('test_input, expected', [
+    ('x = 7 / 2; y = 7.0 / 2; print x, y;', '3\n3.5\n'),
+    ('x = 1; { x = 2; y = 3; } print x;', '2\n'),
+    ('i = 5; for i = 0:3 { x = i; } print i;', '3\n'),
+    ('i = 5; for i = 0:3 { i = 10; break; } print i;', '10\n'),
+    ('i = 5; j = 0; for i = 0:3 { for i = 0:2 { j += i; } } print i, j;', '3\n3\n'),
+    ('x = 0; for i = 0:3 { for i = 0:2 { x = x + i; } x = x + 10 * i; } print x;', '63\n'),
+    ('for i = 0:3 { print i; i = 10; }', '0\n1\n2\n'),
+    ('for i = 0:10 { if (i == 2) continue; if (i == 4) break; print i; }', '0\n1\n3\n'),
+    ('n = 0; while (n < 10) { n += 3; if (n == 6) continue; print n; }', '3\n9\n12\n'),
+    ('A = [[1, 2], [3, 4]]; A[0, 1] = 5; print A[0, 1], A[1], A.T @ [1, 1];', '5\n[3 4]\n[4 9]\n'),
+    ('x = 1; while (x < 100) { x *= 2; if (x > 10) return x; } print x;', '16\n'),
+])
+def test_programs(test_input, expected):
+    assert assert_same_output(test_input) == expected
+
+def test_superinstructions():
+    code = BytecodeCompiler().compile(parse('n = 0; for i = 0:10 n += 2;'))
+    opcodes = [instruction[0] for instruction in code.instructions]
+    assert JUMP_UNLESS_LT in opcodes
+    assert INC in opcodes
+    assert FOR_STEP in opcodes
+
+def test_budget():
+    ast = parse('for i = 0:5 print i;')
+    expected = output(lambda ast: Interpreter().visit(ast), ast)
+
+    vm = VM(BytecodeCompiler().compile(ast))
+    buffer = io.StringIO()
+    pauses = 0
+    with contextlib.redirect_stdout(buffer):
+        assert not vm.run(budget=4)
+        assert vm.executed == 4
+        assert buffer.getvalue() == '0\n'
+        while not vm.run(budget=3):
+            pauses += 1
+    assert pauses > 1
+    assert buffer.getvalue() == expected
+
+@pytest.mark.parametrize('test_input, opcode', [
+    ('s = 0; for i = 0:1000 s += i; print s;', RANGE_REDUCE),
+    ('A = zeros(30, 30); for i = 0:30 for j = 0:30 A[i, j] = i + j; print A[29, 29];', ASSIGN_NEST),
+    ('A = ones(2, 2); B = ones(2, 3); B = eye(2); C = A; for i = 0:300 { A[0, 0] = i; C = A @ B @ A @ B; } print C;', MATMUL_CHAIN),
+])
+def test_budget_of_vectorized_loops(test_input, opcode):
+    # a vectorized loop costs as much of the budget as the loop
+    expected = output(lambda ast: VM(BytecodeCompiler().compile(ast)).run(), parse(test_input))
+    ast = Optimizer(2).optimize(parse(test_input))
+    code = BytecodeCompiler().compile(ast)
+    assert opcode in [instruction[0] for instruction in code.instructions]
+
+    vm = VM(code)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        assert not vm.run(budget=900)
+        assert vm.executed <= 900 and buffer.getvalue() == ''
+        while not vm.run(budget=1000):
+            pass
+    assert buffer.getvalue() == expected
+
+def test_budget_smaller_than_a_vectorized_loop():
+    # an instruction costing more than the whole budget still runs when it is
+    # the first of the call, so resuming always makes progress
+    text = 's = 0; for i = 0:5000 s += i; print s;'
+    expected = output(lambda ast: VM(BytecodeCompiler().compile(ast)).run(), parse(text))
+    code = BytecodeCompiler().compile(Optimizer(2).optimize(parse(text)))
+    assert RANGE_REDUCE in [instruction[0] for instruction in code.instructions]
+
+    vm = VM(code)
+    buffer = io.StringIO()
+    calls = 0
+    with contextlib.redirect_stdout(buffer):
+        while not vm.run(budget=1000):
+            calls += 1
+            assert calls < 100
+    assert buffer.getvalue() == expected
+
+def test_signed_zero_constants():
+    ast = Optimizer(1).optimize(parse('a = 0.0; b = -0.0; print a, b;'))
+    assert output(lambda ast: VM(BytecodeCompiler().compile(ast)).run(), ast) == '0.0\n-0.0\n'
+
+def test_serialization():
+    code = BytecodeCompiler().compile(parse('s = "ab"; x = 2.5; for i = 0:2 print s * i, x;'))
+    loaded = Code.loads(code.dumps())
+    assert loaded.instructions == code.instructions
+    assert output(lambda _: VM(loaded).run(), None) == '\n2.5\nab\n2.5\n'
+
+def test_serialization_of_matrices():
+    ast = PrattParser().parse(StreamScanner(dense_literals=True).scan('A = [[1, 2], [3, 4]]; A[0, 0] = 5; print A, [0.5];'))
+    assert TypeChecker().visit(ast).is_just()
+    code = BytecodeCompiler().compile(ast)
+    loaded = Code.loads(code.dumps())
+    assert loaded.instructions == code.instructions
+    assert output(lambda _: VM(loaded).run(), None) == '[[5 2]\n [3 4]]\n[0.5]\n'
+
+def test_runtime_error_lineno():
+    vm = VM(BytecodeCompiler().compile(parse('x = 0;\ny = 1;\n\nprint y / x;\n')))
+    with pytest.raises(SourceRuntimeError) as e:
+        vm.run()
+    assert e.value.lineno == 4
+
+def test_runs_without_frontend(tmp_path):
+    path = tmp_path / 'program.mbc'
+    path.write_bytes(BytecodeCompiler().compile(parse('print 1 + 2;')).dumps())
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import runpy, sys; sys.argv[1:] = [sys.argv[1]]; '
+         'runpy.run_module("matrix_lang_interpreter.vm", run_name="__main__"); '
+         'assert "sly" not in sys.modules', str(path)],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == '3\n'